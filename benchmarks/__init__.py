@@ -0,0 +1,12 @@
+"""Benchmark suite for the error-manager hot paths.
+
+Run all benchmarks and store the results as JSON::
+
+    python -m benchmarks --output results.json
+
+Compare a run against a stored baseline::
+
+    python -m benchmarks --compare baseline.json
+
+See ``python -m benchmarks --help`` for all options.
+"""
@@ -0,0 +1,79 @@
+"""Command line interface of the benchmark suite."""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from benchmarks.runner import (
+    compare_results,
+    format_duration,
+    load_benchmarks,
+    load_results,
+    print_result,
+    run_benchmarks,
+    save_results,
+)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Run error-manager benchmarks."
+    )
+    parser.add_argument(
+        "-k", "--filter", default="", help="only run benchmarks containing FILTER"
+    )
+    parser.add_argument("-o", "--output", help="write the results as JSON to OUTPUT")
+    parser.add_argument(
+        "-c", "--compare", metavar="BASELINE", help="compare against BASELINE results"
+    )
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="allowed relative slowdown when comparing (default: 0.10)",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="single repeat, for smoke testing"
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="list the benchmarks and exit"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    benchmarks = [
+        bench
+        for name, bench in sorted(load_benchmarks().items())
+        if args.filter in name
+    ]
+    if args.list:
+        for bench in benchmarks:
+            print(bench.name)
+        return 0
+
+    results = run_benchmarks(benchmarks, quick=args.quick, progress=print_result)
+    if args.output:
+        save_results(results, args.output)
+
+    if not args.compare:
+        return 0
+
+    comparisons = compare_results(
+        results, load_results(args.compare), tolerance=args.tolerance
+    )
+    print(f"\n{'benchmark':<55} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for comparison in comparisons:
+        flag = "  REGRESSION" if comparison.regression else ""
+        print(
+            f"{comparison.name:<55} {format_duration(comparison.baseline_ns):>10} "
+            f"{format_duration(comparison.current_ns):>10} "
+            f"{comparison.ratio:>6.2f}x{flag}"
+        )
+    return 1 if any(comparison.regression for comparison in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
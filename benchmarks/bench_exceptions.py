@@ -0,0 +1,127 @@
+"""Benchmarks for raising and catching errors as exceptions.
+
+The error is raised five frames below the handler, as in a layered call
+stack, and compared with plain exceptions and with returning the error.
+
+The dispatch benchmarks convert caught exceptions to return values with
+a chain of ``isinstance`` checks and with an ``ExceptionMap``.
+"""
+
+from typing import List, Type
+
+from benchmarks.runner import benchmark
+from errors import ErrorCode, ReturnValueWithErrorStatus, add_error_data
+from errors.exception_map import ExceptionMap, exception_error_data
+from errors.exceptions import ErrorCodeException, raise_error
+
+LOOPS = 1_000
+DEPTH = 5
+
+ERROR = ErrorCode(code="ER_BENCH_000001", description="bench error")
+
+
+def _layers(innermost):
+    """Return a callable calling *innermost* DEPTH frames deep."""
+
+    def call(depth=DEPTH):
+        if depth:
+            return call(depth - 1)
+        return innermost()
+
+    return call
+
+
+def _catch_loop(call, exception):
+    def run():
+        for _ in range(LOOPS):
+            try:
+                call()
+            except exception:
+                pass
+
+    return run
+
+
+@benchmark("exceptions.plain", number=20, inner_loops=LOOPS)
+def bench_plain():
+    def innermost():
+        raise LookupError(ERROR.code, ERROR.description)
+
+    return _catch_loop(_layers(innermost), LookupError)
+
+
+@benchmark("exceptions.plain.preallocated", number=20, inner_loops=LOOPS)
+def bench_plain_preallocated():
+    exception = LookupError(ERROR.code, ERROR.description)
+
+    def innermost():
+        raise exception.with_traceback(None)
+
+    return _catch_loop(_layers(innermost), LookupError)
+
+
+@benchmark("exceptions.raise_error", number=20, inner_loops=LOOPS)
+def bench_raise_error():
+    return _catch_loop(_layers(lambda: raise_error(ERROR)), ErrorCodeException)
+
+
+@benchmark("exceptions.raise_error.fast", number=20, inner_loops=LOOPS)
+def bench_raise_error_fast():
+    return _catch_loop(
+        _layers(lambda: raise_error(ERROR, fast=True)), ErrorCodeException
+    )
+
+
+@benchmark("exceptions.return_value", number=20, inner_loops=LOOPS)
+def bench_return_value():
+    call = _layers(lambda: ReturnValueWithErrorStatus(ERROR))
+
+    def run():
+        for _ in range(LOOPS):
+            if not call().is_valid:
+                pass
+
+    return run
+
+
+# exception types of the dispatch benchmarks, the last one is raised
+EXCEPTION_TYPES: List[Type[Exception]] = [
+    type(f"BenchError{index}", (Exception,), {}) for index in range(10)
+]
+EXCEPTIONS = [EXCEPTION_TYPES[-1]("failed")] * LOOPS
+MAPPED_ERRORS = [
+    ErrorCode(code=f"ER_BENCH_{index:06d}", description=f"bench error {index}")
+    for index in range(len(EXCEPTION_TYPES))
+]
+
+
+@benchmark("exceptions.dispatch.isinstance_chain", number=100, inner_loops=LOOPS)
+def bench_dispatch_isinstance_chain():
+    mapping = list(zip(EXCEPTION_TYPES, MAPPED_ERRORS, strict=True))
+
+    def to_return_value(exception):
+        for exception_type, error in mapping:
+            if isinstance(exception, exception_type):
+                return ReturnValueWithErrorStatus(
+                    add_error_data(error, exception_error_data(exception))
+                )
+        return None
+
+    def run():
+        for exception in EXCEPTIONS:
+            to_return_value(exception)
+
+    return run
+
+
+@benchmark("exceptions.dispatch.exception_map", number=100, inner_loops=LOOPS)
+def bench_dispatch_exception_map():
+    to_return_value = ExceptionMap(
+        dict(zip(EXCEPTION_TYPES, MAPPED_ERRORS, strict=True))
+    ).to_return_value
+
+    def run():
+        for exception in EXCEPTIONS:
+            to_return_value(exception)
+
+    return run
@@ -0,0 +1,88 @@
+"""Benchmarks for the overhead of the registry lookup instrumentation.
+
+Each benchmark runs with the instrumentation disabled and enabled, the
+disabled variant should be on par with the corresponding lookup benchmark
+in ``bench_registry``.
+"""
+
+from benchmarks.fixtures import make_enumerator, make_mixin_class, make_registry
+from benchmarks.runner import benchmark
+from errors import instrumentation
+
+LOOKUPS = 1_000
+
+
+def list_errors_lookups():
+    enumerator = make_enumerator(LOOKUPS)
+    registry = make_registry()
+    registry.register_errors(enumerator)
+    codes = [member.value.code for member in enumerator]
+    error_description = registry.error_description
+
+    def run():
+        for code in codes:
+            error_description(code)
+
+    return run
+
+
+def mixin_lookups():
+    mixin_class = make_mixin_class(LOOKUPS)
+    codes = list(mixin_class._errors)
+    error_description = mixin_class.error_description
+
+    def run():
+        for code in codes:
+            error_description(code)
+
+    return run
+
+
+def with_instrumentation(function):
+    """Return a callable running *function* with the instrumentation enabled."""
+
+    def run():
+        instrumentation.enable()
+        try:
+            function()
+        finally:
+            instrumentation.disable()
+            instrumentation.reset()
+
+    return run
+
+
+@benchmark(
+    "instrumentation.list_errors.error_description.disabled",
+    number=100,
+    inner_loops=LOOKUPS,
+)
+def bench_list_errors_disabled():
+    return list_errors_lookups()
+
+
+@benchmark(
+    "instrumentation.list_errors.error_description.enabled",
+    number=100,
+    inner_loops=LOOKUPS,
+)
+def bench_list_errors_enabled():
+    return with_instrumentation(list_errors_lookups())
+
+
+@benchmark(
+    "instrumentation.mixin.error_description.disabled",
+    number=100,
+    inner_loops=LOOKUPS,
+)
+def bench_mixin_disabled():
+    return mixin_lookups()
+
+
+@benchmark(
+    "instrumentation.mixin.error_description.enabled",
+    number=100,
+    inner_loops=LOOKUPS,
+)
+def bench_mixin_enabled():
+    return with_instrumentation(mixin_lookups())
@@ -0,0 +1,59 @@
+"""Benchmarks for the overhead of the error occurrence metrics.
+
+Each benchmark runs with the metrics disabled and enabled, the disabled
+variant should be on par with the corresponding return value benchmark.
+"""
+
+from benchmarks.runner import benchmark
+from errors import ErrorCode, ReturnValueWithStatus, add_error_data, metrics
+
+LOOPS = 1_000
+
+ERROR = ErrorCode(code="ER_BENCH_000001", description="bench error")
+
+
+def add_errors():
+    return_value: ReturnValueWithStatus[None] = ReturnValueWithStatus()
+    add_error = return_value.add_error
+    for _ in range(LOOPS):
+        add_error(ERROR)
+
+
+def add_error_data_loop():
+    error_data = {"row": 1, "field": "name"}
+    for _ in range(LOOPS):
+        add_error_data(ERROR, error_data)
+
+
+def with_metrics(function):
+    """Return a callable running *function* with the metrics enabled."""
+
+    def run():
+        metrics.enable()
+        try:
+            function()
+        finally:
+            metrics.disable()
+            metrics.reset()
+
+    return run
+
+
+@benchmark("metrics.add_error.disabled", number=100, inner_loops=LOOPS)
+def bench_add_error_disabled():
+    return add_errors
+
+
+@benchmark("metrics.add_error.enabled", number=100, inner_loops=LOOPS)
+def bench_add_error_enabled():
+    return with_metrics(add_errors)
+
+
+@benchmark("metrics.add_error_data.disabled", number=100, inner_loops=LOOPS)
+def bench_add_error_data_disabled():
+    return add_error_data_loop
+
+
+@benchmark("metrics.add_error_data.enabled", number=100, inner_loops=LOOPS)
+def bench_add_error_data_enabled():
+    return with_metrics(add_error_data_loop)
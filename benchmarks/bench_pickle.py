@@ -0,0 +1,121 @@
+"""Benchmarks for pickling return values, as done by process pools.
+
+Every benchmark compares registered errors pickled as reference to their
+registry entry (the default) with errors pickled in full, as ErrorCode did
+before. The pickle size in bytes is reported as ``bytes``.
+"""
+
+import copyreg
+import io
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from benchmarks.fixtures import make_enumerator
+from benchmarks.runner import benchmark
+from errors import ErrorCode, ListErrors, ReturnValueWithStatus, add_error_data
+
+VALUES = 10_000
+
+ENUMERATOR = make_enumerator(100, area="PICKLE")
+ListErrors.register_errors(ENUMERATOR)
+ERRORS = [member.value for member in ENUMERATOR]
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def make_return_values(number: int = VALUES) -> List[ReturnValueWithStatus]:
+    """Return *number* return values, every tenth one with two errors."""
+    return_values = []
+    for index in range(number):
+        return_value: ReturnValueWithStatus[int] = ReturnValueWithStatus(result=index)
+        if not index % 10:
+            error = ERRORS[index % len(ERRORS)]
+            return_value.add_error(add_error_data(error, {"row": index}))
+            return_value.add_error(error, keep_current_status=True)
+        return_values.append(return_value)
+    return return_values
+
+
+def _reduce_in_full(error: ErrorCode):
+    return (ErrorCode, (error.code, error.description, error.error_data))
+
+
+def dumps_in_full(value: object) -> bytes:
+    """Pickle *value* with all errors pickled in full."""
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer, pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = copyreg.dispatch_table.copy()
+    pickler.dispatch_table[ErrorCode] = _reduce_in_full
+    pickler.dump(value)
+    return buffer.getvalue()
+
+
+def make_in_full(number: int) -> bytes:
+    """Pool worker returning the pickled return values with full errors."""
+    return dumps_in_full(make_return_values(number))
+
+
+def pool() -> ProcessPoolExecutor:
+    """Return the process pool shared by the benchmarks, started on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=1)
+        _pool.submit(make_return_values, 1).result()
+    return _pool
+
+
+@benchmark("pickle.dumps.reference", number=5, inner_loops=VALUES)
+def bench_dumps_reference():
+    return_values = make_return_values()
+    size = len(pickle.dumps(return_values, pickle.HIGHEST_PROTOCOL))
+    return (
+        lambda: pickle.dumps(return_values, pickle.HIGHEST_PROTOCOL),
+        {"bytes": size},
+    )
+
+
+@benchmark("pickle.dumps.full", number=5, inner_loops=VALUES)
+def bench_dumps_full():
+    return_values = make_return_values()
+    return lambda: dumps_in_full(return_values), {
+        "bytes": len(dumps_in_full(return_values))
+    }
+
+
+@benchmark("pickle.dumps.per_value.reference", number=5, inner_loops=VALUES)
+def bench_dumps_per_value_reference():
+    return_values = make_return_values()
+    size = sum(len(pickle.dumps(value)) for value in return_values)
+    return lambda: [pickle.dumps(value) for value in return_values], {"bytes": size}
+
+
+@benchmark("pickle.dumps.per_value.full", number=5, inner_loops=VALUES)
+def bench_dumps_per_value_full():
+    return_values = make_return_values()
+    size = sum(len(dumps_in_full(value)) for value in return_values)
+    return lambda: [dumps_in_full(value) for value in return_values], {"bytes": size}
+
+
+@benchmark("pickle.loads.reference", number=5, inner_loops=VALUES)
+def bench_loads_reference():
+    pickled = pickle.dumps(make_return_values(), pickle.HIGHEST_PROTOCOL)
+    return lambda: pickle.loads(pickled)
+
+
+@benchmark("pickle.loads.full", number=5, inner_loops=VALUES)
+def bench_loads_full():
+    pickled = dumps_in_full(make_return_values())
+    return lambda: pickle.loads(pickled)
+
+
+@benchmark("pickle.process_pool.reference", number=3, inner_loops=VALUES)
+def bench_process_pool_reference():
+    executor = pool()
+    return lambda: executor.submit(make_return_values, VALUES).result()
+
+
+@benchmark("pickle.process_pool.full", number=3, inner_loops=VALUES)
+def bench_process_pool_full():
+    executor = pool()
+    return lambda: pickle.loads(executor.submit(make_in_full, VALUES).result())
@@ -0,0 +1,221 @@
+"""Benchmarks for registering and looking up error codes."""
+
+from benchmarks.fixtures import (
+    make_enumerator,
+    make_error_codes,
+    make_mixin_class,
+    make_registry,
+)
+from benchmarks.runner import benchmark
+
+LOOKUPS = 1_000
+
+
+def _bench_register_errors(number: int):
+    enumerator = make_enumerator(number)
+    registry = make_registry()
+
+    def run():
+        registry._errors = {}
+        registry._error_ids = {}
+        registry._errors_by_id = []
+        registry._sorted_codes = []
+        registry.register_errors(enumerator)
+
+    return run
+
+
+@benchmark("list_errors.register_errors[10k]", repeat=5)
+def bench_register_errors_10k():
+    return _bench_register_errors(10_000)
+
+
+@benchmark("list_errors.register_errors[100k]", repeat=3)
+def bench_register_errors_100k():
+    return _bench_register_errors(100_000)
+
+
+@benchmark("list_errors.register_error[20k].loop", repeat=3)
+def bench_register_error_loop():
+    errors = make_error_codes(20_000)
+    registry = make_registry()
+
+    def run():
+        registry._errors = {}
+        registry._error_ids = {}
+        registry._errors_by_id = []
+        registry._sorted_codes = []
+        for error in errors:
+            registry.register_error(error.code, error)
+
+    return run
+
+
+def _bench_register_sources(bulk: bool):
+    enumerators = [
+        make_enumerator(1_000, area=f"AREA{index:02d}") for index in range(50)
+    ]
+    registry = make_registry()
+
+    def run():
+        registry._errors = {}
+        registry._error_ids = {}
+        registry._errors_by_id = []
+        registry._sorted_codes = []
+        if bulk:
+            registry.register_many(enumerators)
+        else:
+            for enumerator in enumerators:
+                registry.register_errors(enumerator)
+
+    return run
+
+
+@benchmark("list_errors.register_errors[50x1k].loop", repeat=3)
+def bench_register_errors_loop():
+    return _bench_register_sources(bulk=False)
+
+
+@benchmark("list_errors.register_many[50x1k]", repeat=3)
+def bench_register_many():
+    return _bench_register_sources(bulk=True)
+
+
+@benchmark("enumerator.keys[1k]", number=1_000)
+def bench_enumerator_keys():
+    enumerator = make_enumerator(LOOKUPS)
+    return enumerator.keys
+
+
+@benchmark("enumerator.member_by_code", number=100, inner_loops=LOOKUPS)
+def bench_enumerator_member_by_code():
+    enumerator = make_enumerator(LOOKUPS)
+    codes = [member.value.code for member in enumerator]
+    member_by_code = enumerator.member_by_code
+
+    def run():
+        for code in codes:
+            member_by_code(code)
+
+    return run
+
+
+@benchmark("list_errors.error_description.hit", number=100, inner_loops=LOOKUPS)
+def bench_list_errors_hit():
+    enumerator = make_enumerator(LOOKUPS)
+    registry = make_registry()
+    registry.register_errors(enumerator)
+    codes = [member.value.code for member in enumerator]
+    error_description = registry.error_description
+
+    def run():
+        for code in codes:
+            error_description(code)
+
+    return run
+
+
+@benchmark("list_errors.get_error_by_id", number=100, inner_loops=LOOKUPS)
+def bench_list_errors_by_id():
+    registry = make_registry()
+    registry.register_errors(make_enumerator(LOOKUPS))
+    error_ids = range(LOOKUPS)
+    get_error_by_id = registry.get_error_by_id
+
+    def run():
+        for error_id in error_ids:
+            get_error_by_id(error_id)
+
+    return run
+
+
+@benchmark("list_errors.error_description.miss", number=100, inner_loops=LOOKUPS)
+def bench_list_errors_miss():
+    registry = make_registry()
+    registry.register_errors(make_enumerator(LOOKUPS))
+    codes = [f"ER_MISSING_{index:06d}" for index in range(LOOKUPS)]
+    error_description = registry.error_description
+
+    def run():
+        for code in codes:
+            try:
+                error_description(code)
+            except KeyError:
+                pass
+
+    return run
+
+
+@benchmark("mixin.error_description.hit", number=100, inner_loops=LOOKUPS)
+def bench_mixin_hit():
+    mixin_class = make_mixin_class(LOOKUPS)
+    codes = list(mixin_class._errors)
+    error_description = mixin_class.error_description
+
+    def run():
+        for code in codes:
+            error_description(code)
+
+    return run
+
+
+@benchmark("mixin.error_description.miss", number=100, inner_loops=LOOKUPS)
+def bench_mixin_miss():
+    mixin_class = make_mixin_class(LOOKUPS)
+    codes = [f"ER_MISSING_{index:06d}" for index in range(LOOKUPS)]
+    error_description = mixin_class.error_description
+
+    def run():
+        for code in codes:
+            try:
+                error_description(code)
+            except KeyError:
+                pass
+
+    return run
+
+
+@benchmark("mixin.error_description.miss.distinct[10k]", number=10, inner_loops=LOOKUPS)
+def bench_mixin_miss_distinct():
+    mixin_class = make_mixin_class(10_000)
+    runs = iter(range(1_000_000))
+    error_description = mixin_class.error_description
+
+    def run():
+        # codes never looked up before, so the negative cache does not help
+        run_index = next(runs)
+        for index in range(LOOKUPS):
+            try:
+                error_description(f"ER_MISSING_{run_index:06d}_{index:06d}")
+            except KeyError:
+                pass
+
+    return run
+
+
+def _prefix_registry():
+    """Return a registry with 100 areas of 1,000 codes each."""
+    registry = make_registry()
+    for area in range(100):
+        registry.register_errors(make_enumerator(1_000, area=f"AREA{area:03d}"))
+    return registry
+
+
+@benchmark("list_errors.errors_in_namespace[100k]", number=100)
+def bench_errors_in_namespace():
+    registry = _prefix_registry()
+    return lambda: registry.errors_in_namespace("ER_AREA042")
+
+
+@benchmark("list_errors.errors_in_namespace.scan[100k]", number=10)
+def bench_errors_in_namespace_scan():
+    registry = _prefix_registry()
+
+    def run():
+        return [
+            error
+            for code, error in registry._errors.items()
+            if code.startswith("ER_AREA042_")
+        ]
+
+    return run
@@ -0,0 +1,267 @@
+"""Benchmarks for creating error occurrences and return values."""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from benchmarks.runner import benchmark
+from errors import (
+    ErrorCode,
+    ReturnValueBatch,
+    ReturnValueWithErrorStatus,
+    ReturnValueWithStatus,
+    add_error_data,
+)
+
+LOOPS = 1_000
+
+ERROR = ErrorCode(code="ER_BENCH_000001", description="bench error")
+
+
+@dataclass(frozen=True)
+class ReferenceErrorCode:
+    """ErrorCode layout before slots, interning and the cached hash (1.4)."""
+
+    code: str
+    description: str
+    error_data: Dict = field(default_factory=dict)
+
+
+REFERENCE_ERROR = ReferenceErrorCode(code="ER_BENCH_000001", description="bench error")
+
+
+def reference_add_error_data(error: ReferenceErrorCode, error_data: dict):
+    """add_error_data as implemented for the 1.4 ErrorCode."""
+    return ReferenceErrorCode(
+        code=error.code, description=error.description, error_data=error_data
+    )
+
+
+@dataclass
+class ReferenceReturnValueWithStatus:
+    """ReturnValueWithStatus layout before slots and lazy error storage (1.4)."""
+
+    result: Optional[object] = None
+    _is_valid: bool = True
+    _errors: list = field(default_factory=list)
+
+    def add_error(self, error, keep_current_status: bool = False) -> None:
+        self._errors.append(error)
+        if not keep_current_status:
+            self._is_valid = False
+
+
+@benchmark("base.add_error_data", number=100, inner_loops=LOOPS)
+def bench_add_error_data():
+    error_data = {"row": 1, "field": "name"}
+
+    def run():
+        for _ in range(LOOPS):
+            add_error_data(ERROR, error_data)
+
+    return run
+
+
+@benchmark("base.add_error_data.reference", number=100, inner_loops=LOOPS)
+def bench_add_error_data_reference():
+    error_data = {"row": 1, "field": "name"}
+
+    def run():
+        for _ in range(LOOPS):
+            reference_add_error_data(REFERENCE_ERROR, error_data)
+
+    return run
+
+
+@benchmark("base.error_code.construct", number=100, inner_loops=LOOPS)
+def bench_construct_error_code():
+    def run():
+        for _ in range(LOOPS):
+            ErrorCode(code="ER_BENCH_000001", description="bench error")
+
+    return run
+
+
+@benchmark("base.error_code.construct.reference", number=100, inner_loops=LOOPS)
+def bench_construct_error_code_reference():
+    def run():
+        for _ in range(LOOPS):
+            ReferenceErrorCode(code="ER_BENCH_000001", description="bench error")
+
+    return run
+
+
+@benchmark("return_value.construct.success", number=100, inner_loops=LOOPS)
+def bench_construct_success():
+    def run():
+        for index in range(LOOPS):
+            ReturnValueWithStatus(result=index)
+
+    return run
+
+
+@benchmark("return_value.construct.success.reference", number=100, inner_loops=LOOPS)
+def bench_construct_success_reference():
+    def run():
+        for index in range(LOOPS):
+            ReferenceReturnValueWithStatus(result=index)
+
+    return run
+
+
+@benchmark("return_value.add_error", number=100, inner_loops=LOOPS)
+def bench_add_error():
+    def run():
+        for _ in range(LOOPS):
+            return_value: ReturnValueWithStatus[None] = ReturnValueWithStatus()
+            return_value.add_error(ERROR)
+
+    return run
+
+
+@benchmark("return_value.add_error.reference", number=100, inner_loops=LOOPS)
+def bench_add_error_reference():
+    def run():
+        for _ in range(LOOPS):
+            return_value = ReferenceReturnValueWithStatus()
+            return_value.add_error(ERROR)
+
+    return run
+
+
+@benchmark("return_value.add_error.many", number=100, inner_loops=LOOPS)
+def bench_add_many_errors():
+    def run():
+        return_value: ReturnValueWithStatus[None] = ReturnValueWithStatus()
+        add_error = return_value.add_error
+        for _ in range(LOOPS):
+            add_error(ERROR)
+
+    return run
+
+
+@benchmark("return_value.error_status", number=100, inner_loops=LOOPS)
+def bench_error_status():
+    def run():
+        for _ in range(LOOPS):
+            ReturnValueWithErrorStatus(ERROR)
+
+    return run
+
+
+@benchmark("batch.build.list_of_return_values", number=10, inner_loops=100_000)
+def bench_build_list_of_return_values():
+    def run():
+        return_values = []
+        for index in range(100_000):
+            return_value = ReturnValueWithStatus(result=index)
+            if not index % 100:
+                return_value.add_error(ERROR)
+            return_values.append(return_value)
+
+    return run
+
+
+@benchmark("batch.build.return_value_batch", number=10, inner_loops=100_000)
+def bench_build_return_value_batch():
+    def run():
+        batch: ReturnValueBatch[int] = ReturnValueBatch(range(100_000))
+        add_error = batch.add_error
+        for index in range(0, 100_000, 100):
+            add_error(index, ERROR)
+
+    return run
+
+
+CHAIN_STEPS = 10
+CHAIN_LOOPS = 1_000
+
+
+def chain_step(result: int) -> ReturnValueWithStatus[int]:
+    return ReturnValueWithStatus(result=result + 1)
+
+
+def failing_step(result: int) -> ReturnValueWithStatus[int]:
+    return ReturnValueWithErrorStatus(ERROR)
+
+
+def chain_start(with_warning: bool) -> ReturnValueWithStatus[int]:
+    return_value: ReturnValueWithStatus[int] = ReturnValueWithStatus(result=0)
+    if with_warning:
+        return_value.add_error(ERROR, keep_current_status=True)
+    return return_value
+
+
+def make_combinator_chain(with_warning: bool, fail_at: int):
+    steps = [
+        failing_step if step == fail_at else chain_step for step in range(CHAIN_STEPS)
+    ]
+
+    def run():
+        for _ in range(CHAIN_LOOPS):
+            return_value = chain_start(with_warning)
+            for step in steps:
+                return_value = return_value.and_then(step)
+
+    return run
+
+
+def make_hand_written_chain(with_warning: bool, fail_at: int):
+    steps = [
+        failing_step if step == fail_at else chain_step for step in range(CHAIN_STEPS)
+    ]
+
+    def run():
+        for _ in range(CHAIN_LOOPS):
+            return_value = chain_start(with_warning)
+            for step in steps:
+                if not return_value.is_valid:
+                    break
+                step_value = step(return_value.result)  # type: ignore[arg-type]
+                chained: ReturnValueWithStatus[int] = ReturnValueWithStatus(
+                    result=step_value.result
+                )
+                chained.errors.extend(return_value.errors)
+                chained.errors.extend(step_value.errors)
+                if not step_value.is_valid:
+                    chained._is_valid = False
+                return_value = chained
+
+    return run
+
+
+@benchmark("return_value.chain[10].success", number=20, inner_loops=CHAIN_LOOPS)
+def bench_chain_success():
+    return make_combinator_chain(with_warning=False, fail_at=-1)
+
+
+@benchmark(
+    "return_value.chain[10].success.hand_written", number=20, inner_loops=CHAIN_LOOPS
+)
+def bench_chain_success_hand_written():
+    return make_hand_written_chain(with_warning=False, fail_at=-1)
+
+
+@benchmark("return_value.chain[10].warning", number=20, inner_loops=CHAIN_LOOPS)
+def bench_chain_warning():
+    return make_combinator_chain(with_warning=True, fail_at=-1)
+
+
+@benchmark(
+    "return_value.chain[10].warning.hand_written", number=20, inner_loops=CHAIN_LOOPS
+)
+def bench_chain_warning_hand_written():
+    return make_hand_written_chain(with_warning=True, fail_at=-1)
+
+
+@benchmark("return_value.chain[10].fail_first", number=20, inner_loops=CHAIN_LOOPS)
+def bench_chain_fail_first():
+    return make_combinator_chain(with_warning=True, fail_at=0)
+
+
+@benchmark(
+    "return_value.chain[10].fail_first.hand_written",
+    number=20,
+    inner_loops=CHAIN_LOOPS,
+)
+def bench_chain_fail_first_hand_written():
+    return make_hand_written_chain(with_warning=True, fail_at=0)
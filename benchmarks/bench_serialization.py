@@ -0,0 +1,79 @@
+"""Benchmarks for encoding and decoding return values."""
+
+import json
+
+from benchmarks.fixtures import make_enumerator
+from benchmarks.runner import benchmark
+from errors import ListErrors, ReturnValueWithStatus, add_error_data
+from errors.serialization import BinaryCodec, JsonCodec
+
+VALUES = 1_000
+
+ENUMERATOR = make_enumerator(100, area="SERIAL")
+ListErrors.register_errors(ENUMERATOR)
+ERRORS = [member.value for member in ENUMERATOR]
+
+
+def make_return_values():
+    """Return VALUES return values, every tenth one with an error."""
+    return_values = []
+    for index in range(VALUES):
+        return_value: ReturnValueWithStatus[dict] = ReturnValueWithStatus(
+            result={"id": index, "name": f"record {index}"}
+        )
+        if not index % 10:
+            error = ERRORS[index % len(ERRORS)]
+            return_value.add_error(add_error_data(error, {"row": index}))
+        return_values.append(return_value)
+    return return_values
+
+
+def hand_written_encode(return_values):
+    """Encode like callers did before the codecs, with error_object() dicts."""
+    return json.dumps(
+        [
+            {
+                "result": return_value.result,
+                "is_valid": return_value.is_valid,
+                "errors": [
+                    dict(ListErrors.error_object(error), error_data=error.error_data)
+                    for error in return_value.errors
+                ],
+            }
+            for return_value in return_values
+        ]
+    )
+
+
+@benchmark("serialization.encode.hand_written_json", number=10, inner_loops=VALUES)
+def bench_encode_hand_written():
+    return_values = make_return_values()
+    return lambda: hand_written_encode(return_values)
+
+
+@benchmark("serialization.encode.json", number=10, inner_loops=VALUES)
+def bench_encode_json():
+    return_values = make_return_values()
+    codec = JsonCodec()
+    return lambda: codec.encode_many(return_values)
+
+
+@benchmark("serialization.encode.binary", number=10, inner_loops=VALUES)
+def bench_encode_binary():
+    return_values = make_return_values()
+    codec = BinaryCodec(use_ids=True)
+    return lambda: codec.encode_many(return_values)
+
+
+@benchmark("serialization.decode.json", number=10, inner_loops=VALUES)
+def bench_decode_json():
+    codec = JsonCodec()
+    payload = codec.encode_many(make_return_values())
+    return lambda: codec.decode_many(payload)
+
+
+@benchmark("serialization.decode.binary", number=10, inner_loops=VALUES)
+def bench_decode_binary():
+    codec = BinaryCodec(use_ids=True)
+    payload = codec.encode_many(make_return_values())
+    return lambda: codec.decode_many(payload)
@@ -0,0 +1,74 @@
+"""Benchmarks for the throughput of the JSON Lines error sink.
+
+``sink.emit`` times queueing only, while the writer drains the queue in the
+background. ``sink.emit_and_write`` includes writing every error to the file,
+so its ops/s is the sustained number of errors written per second.
+"""
+
+import os
+import tempfile
+
+from benchmarks.runner import benchmark
+from errors import ErrorCode, ReturnValueWithStatus, add_error_data
+from errors.sink import ErrorSink
+
+LOOPS = 10_000
+
+ERROR = add_error_data(
+    ErrorCode(code="ER_BENCH_000001", description="bench error"),
+    {"row": 1, "field": "name"},
+)
+
+
+def _sink_path():
+    """Return the path of a sink file in a directory removed at exit."""
+    directory = tempfile.TemporaryDirectory()
+    # keep the directory alive as long as the path is used
+    _directories.append(directory)
+    return os.path.join(directory.name, "errors.jsonl")
+
+
+_directories: list = []
+
+
+@benchmark("sink.emit", number=10, inner_loops=LOOPS)
+def bench_emit():
+    sink = ErrorSink(_sink_path(), queue_size=10 * LOOPS * 10)
+    emit = sink.emit
+
+    def run():
+        for _ in range(LOOPS):
+            emit(ERROR)
+
+    return run
+
+
+@benchmark("sink.add_error.installed", number=10, inner_loops=LOOPS)
+def bench_add_error_installed():
+    sink = ErrorSink(_sink_path(), queue_size=10 * LOOPS * 10)
+
+    def run():
+        sink.install()
+        try:
+            return_value: ReturnValueWithStatus[None] = ReturnValueWithStatus()
+            add_error = return_value.add_error
+            for _ in range(LOOPS):
+                add_error(ERROR)
+        finally:
+            sink.uninstall()
+
+    return run
+
+
+@benchmark("sink.emit_and_write", number=1, repeat=3, inner_loops=LOOPS)
+def bench_emit_and_write():
+    path = _sink_path()
+
+    def run():
+        with ErrorSink(path, queue_size=LOOPS) as sink:
+            emit = sink.emit
+            for _ in range(LOOPS):
+                emit(ERROR)
+        assert sink.written == LOOPS
+
+    return run
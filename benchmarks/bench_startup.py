@@ -0,0 +1,112 @@
+"""Start-up benchmarks: importing enumerators versus loading a snapshot.
+
+Both benchmarks start a fresh interpreter that looks up a single error
+description. The import path imports and registers a generated package of
+enumerator modules, the snapshot path loads a precompiled snapshot instead.
+"""
+
+import atexit
+import importlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import errors
+from benchmarks.runner import benchmark
+from errors.error import ListErrors
+from errors.snapshot import compile_snapshot
+
+NUMBER_OF_MODULES = 300
+CODES_PER_MODULE = 20
+PACKAGE = "bench_startup_errors"
+LOOKUP_CODE = f"ER_M{NUMBER_OF_MODULES - 1:03d}_{CODES_PER_MODULE - 1:05d}"
+
+IMPORT_SCRIPT = f"""
+import {PACKAGE}
+from errors import ListErrors
+ListErrors.error_description({LOOKUP_CODE!r})
+"""
+
+SNAPSHOT_SCRIPT = f"""
+from errors import ListErrors
+from errors.snapshot import load_snapshot
+assert load_snapshot({{path!r}})
+ListErrors.error_description({LOOKUP_CODE!r})
+"""
+
+_workspace = None
+
+
+def _module_source(module: int) -> str:
+    lines = [
+        "from errors import ErrorCode, FunctionalErrorsBaseClass, ListErrors",
+        "",
+        "",
+        f"class Module{module:03d}Errors(FunctionalErrorsBaseClass):",
+    ]
+    for index in range(CODES_PER_MODULE):
+        lines.append(
+            f"    ERROR_{module:03d}_{index:05d} = ErrorCode("
+            f'code="ER_M{module:03d}_{index:05d}", '
+            f'description="error {index} of module {module}")'
+        )
+    lines += ["", "", f"ListErrors.register_errors(Module{module:03d}Errors)", ""]
+    return "\n".join(lines)
+
+
+def _workspace_dir() -> str:
+    """Generate the enumerator package and its snapshot once per run."""
+    global _workspace
+    if _workspace is None:
+        _workspace = tempfile.mkdtemp(prefix="errors-bench-")
+        atexit.register(shutil.rmtree, _workspace, True)
+        package_dir = os.path.join(_workspace, PACKAGE)
+        os.mkdir(package_dir)
+        imports = []
+        for module in range(NUMBER_OF_MODULES):
+            with open(os.path.join(package_dir, f"errors_{module:03d}.py"), "w") as f:
+                f.write(_module_source(module))
+            imports.append(f"from {PACKAGE} import errors_{module:03d}  # noqa")
+        with open(os.path.join(package_dir, "__init__.py"), "w") as init_file:
+            init_file.write("\n".join(imports) + "\n")
+
+        class StartupListErrors(ListErrors):
+            _errors: dict = {}
+            _enumerators = ()
+
+        sys.path.insert(0, _workspace)
+        try:
+            for module in range(NUMBER_OF_MODULES):
+                enumerators = importlib.import_module(f"{PACKAGE}.errors_{module:03d}")
+                StartupListErrors.register_errors(
+                    getattr(enumerators, f"Module{module:03d}Errors")
+                )
+        finally:
+            sys.path.remove(_workspace)
+        compile_snapshot(os.path.join(_workspace, "errors.snapshot"), StartupListErrors)
+    return _workspace
+
+
+def _bench_script(script: str):
+    workspace = _workspace_dir()
+    source_dir = os.path.dirname(os.path.dirname(os.path.abspath(errors.__file__)))
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join([workspace, source_dir]))
+    command = [sys.executable, "-c", script]
+
+    def run():
+        subprocess.run(command, env=environment, check=True)
+
+    return run
+
+
+@benchmark("startup.import_enumerators", repeat=5)
+def bench_startup_import():
+    return _bench_script(IMPORT_SCRIPT)
+
+
+@benchmark("startup.load_snapshot", repeat=5)
+def bench_startup_snapshot():
+    path = os.path.join(_workspace_dir(), "errors.snapshot")
+    return _bench_script(SNAPSHOT_SCRIPT.format(path=path))
@@ -0,0 +1,46 @@
+"""Factories for the error codes, enumerators and registries used in benchmarks."""
+
+from typing import List, Type
+
+from errors import ErrorCode, ErrorListByMixin, FunctionalErrorsBaseClass, ListErrors
+
+
+def make_error_codes(number: int, area: str = "BENCH") -> List[ErrorCode]:
+    """Return *number* error codes named ``ER_<AREA>_<NNNNNN>``."""
+    return [
+        ErrorCode(code=f"ER_{area}_{index:06d}", description=f"{area} error {index}")
+        for index in range(number)
+    ]
+
+
+def make_enumerator(
+    number: int, area: str = "BENCH"
+) -> Type[FunctionalErrorsBaseClass]:
+    """Return a FunctionalErrorsBaseClass enumerator with *number* members."""
+    members = {
+        f"{area}_ERROR_{index:06d}": error
+        for index, error in enumerate(make_error_codes(number, area))
+    }
+    return FunctionalErrorsBaseClass(f"{area.title()}Errors", members)  # type: ignore[call-arg, return-value]
+
+
+def make_registry() -> Type[ListErrors]:
+    """Return a ListErrors subclass with its own, empty registry."""
+
+    class BenchListErrors(ListErrors):
+        _errors: dict = {}
+        _error_ids: dict = {}
+        _errors_by_id: list = []
+        _sorted_codes: list = []
+
+    return BenchListErrors
+
+
+def make_mixin_class(number: int, area: str = "BENCH") -> Type[ErrorListByMixin]:
+    """Return an ErrorListByMixin class mixing in *number* error codes."""
+    namespace = {
+        f"{area}_ERROR_{index:06d}": error
+        for index, error in enumerate(make_error_codes(number, area))
+    }
+    error_codes = type(f"{area.title()}ErrorCodes", (), namespace)
+    return type(f"{area.title()}MixinErrors", (ErrorListByMixin, error_codes), {})
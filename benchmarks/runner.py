@@ -0,0 +1,262 @@
+"""Minimal benchmark runner with JSON output and baseline comparison.
+
+Benchmarks are registered with the ``benchmark`` decorator. The decorated
+function performs all setup work and returns the callable to be timed::
+
+    @benchmark("return_value.success", inner_loops=1000)
+    def bench_success():
+        def run():
+            for _ in range(1000):
+                ReturnValueWithStatus(result=1)
+
+        return run
+
+``inner_loops`` is the number of operations performed per call of the timed
+callable, it is used to report the duration of a single operation.
+
+The setup function may also return a ``(callable, info)`` tuple, where
+*info* is a dict of additional numbers, for example sizes in bytes, that
+are stored and printed with the result.
+"""
+
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import errors
+
+SCHEMA_VERSION = 1
+
+Timed = Callable[[], object]
+Setup = Callable[[], Union[Timed, Tuple[Timed, Dict[str, float]]]]
+
+
+@dataclass
+class Benchmark:
+    """A registered benchmark.
+
+    Attributes:
+        name: Unique dotted name of the benchmark.
+        setup: Callable doing the setup work and returning the timed callable.
+        number: Number of calls of the timed callable per repeat.
+        repeat: Number of repeats, the fastest repeat is reported.
+        inner_loops: Number of operations performed per timed call.
+    """
+
+    name: str
+    setup: Setup
+    number: int = 1
+    repeat: int = 5
+    inner_loops: int = 1
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing result of a single benchmark.
+
+    Attributes:
+        min_ns: Fastest duration of one operation in nanoseconds.
+        median_ns: Median duration of one operation in nanoseconds.
+        ops_per_sec: Operations per second based on ``min_ns``.
+        number: Number of calls of the timed callable per repeat.
+        repeat: Number of repeats.
+        inner_loops: Number of operations performed per timed call.
+        info: Additional numbers returned by the setup function.
+    """
+
+    min_ns: float
+    median_ns: float
+    ops_per_sec: float
+    number: int
+    repeat: int
+    inner_loops: int
+    info: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class Comparison:
+    """Comparison of a benchmark result with its baseline.
+
+    Attributes:
+        name: Name of the benchmark.
+        baseline_ns: Baseline duration of one operation in nanoseconds.
+        current_ns: Current duration of one operation in nanoseconds.
+        ratio: ``current_ns / baseline_ns``, above 1 means slower.
+        regression: True if the ratio exceeds the allowed tolerance.
+    """
+
+    name: str
+    baseline_ns: float
+    current_ns: float
+    ratio: float
+    regression: bool
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(
+    name: str, number: int = 1, repeat: int = 5, inner_loops: int = 1
+) -> Callable[[Setup], Setup]:
+    """Register the decorated setup function as benchmark *name*."""
+
+    def register(setup: Setup):
+        if name in BENCHMARKS:
+            raise ValueError(f"benchmark {name!r} is already registered")
+        BENCHMARKS[name] = Benchmark(
+            name=name,
+            setup=setup,
+            number=number,
+            repeat=repeat,
+            inner_loops=inner_loops,
+        )
+        return setup
+
+    return register
+
+
+def load_benchmarks() -> Dict[str, Benchmark]:
+    """Import all benchmark modules and return the registered benchmarks."""
+    from benchmarks import (  # noqa: F401
+        bench_exceptions,
+        bench_instrumentation,
+        bench_metrics,
+        bench_pickle,
+        bench_registry,
+        bench_return_value,
+        bench_serialization,
+        bench_sink,
+        bench_startup,
+    )
+
+    return BENCHMARKS
+
+
+def run_benchmark(bench: Benchmark, quick: bool = False) -> BenchmarkResult:
+    """Time a single benchmark.
+
+    Args:
+        bench: The benchmark to run.
+        quick: When True only a single repeat is done, for smoke testing.
+
+    Returns:
+        The timing result of the benchmark.
+    """
+    timed = bench.setup()
+    info: Dict[str, float] = {}
+    if isinstance(timed, tuple):
+        timed, info = timed
+    repeat = 1 if quick else bench.repeat
+    timings = timeit.Timer(timed).repeat(repeat=repeat, number=bench.number)
+    operations = bench.number * bench.inner_loops
+    per_operation = [timing / operations * 1e9 for timing in timings]
+    min_ns = min(per_operation)
+    return BenchmarkResult(
+        min_ns=min_ns,
+        median_ns=statistics.median(per_operation),
+        ops_per_sec=1e9 / min_ns if min_ns else float("inf"),
+        number=bench.number,
+        repeat=repeat,
+        inner_loops=bench.inner_loops,
+        info=info,
+    )
+
+
+def run_benchmarks(
+    benchmarks: Iterable[Benchmark],
+    quick: bool = False,
+    progress: Optional[Callable[[str, BenchmarkResult], None]] = None,
+) -> dict:
+    """Run *benchmarks* and return the results as a JSON serializable dict."""
+    results = {}
+    for bench in benchmarks:
+        result = run_benchmark(bench, quick=quick)
+        results[bench.name] = asdict(result)
+        if progress:
+            progress(bench.name, result)
+    return {
+        "schema": SCHEMA_VERSION,
+        "meta": {
+            "errors_version": errors.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "quick": quick,
+        },
+        "benchmarks": results,
+    }
+
+
+def save_results(results: dict, path: str) -> None:
+    """Write *results* as JSON to *path*."""
+    with open(path, "w", encoding="utf-8") as results_file:
+        json.dump(results, results_file, indent=2, sort_keys=True)
+        results_file.write("\n")
+
+
+def load_results(path: str) -> dict:
+    """Read results previously written with ``save_results``."""
+    with open(path, encoding="utf-8") as results_file:
+        results = json.load(results_file)
+    if results.get("schema") != SCHEMA_VERSION:
+        raise ValueError(f"{path} has an unsupported benchmark schema version")
+    return results
+
+
+def compare_results(
+    current: dict, baseline: dict, tolerance: float = 0.10
+) -> List[Comparison]:
+    """Compare *current* results against *baseline* results.
+
+    Only benchmarks present in both result sets are compared.
+
+    Args:
+        current: Results of the current run.
+        baseline: Stored baseline results.
+        tolerance: Allowed relative slowdown before a benchmark counts as a
+            regression, 0.10 allows benchmarks to be 10% slower.
+
+    Returns:
+        A comparison per benchmark, sorted by name.
+    """
+    comparisons = []
+    baseline_benchmarks = baseline["benchmarks"]
+    for name, result in sorted(current["benchmarks"].items()):
+        if name not in baseline_benchmarks:
+            continue
+        baseline_ns = baseline_benchmarks[name]["min_ns"]
+        ratio = result["min_ns"] / baseline_ns if baseline_ns else 1.0
+        comparisons.append(
+            Comparison(
+                name=name,
+                baseline_ns=baseline_ns,
+                current_ns=result["min_ns"],
+                ratio=ratio,
+                regression=ratio > 1 + tolerance,
+            )
+        )
+    return comparisons
+
+
+def format_duration(nanoseconds: float) -> str:
+    """Format a duration in nanoseconds with a readable unit."""
+    for unit, factor in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if nanoseconds >= factor:
+            return f"{nanoseconds / factor:.2f}{unit}"
+    return f"{nanoseconds:.1f}ns"
+
+
+def print_result(name: str, result: BenchmarkResult) -> None:
+    """Print a single benchmark result line."""
+    info = "".join(f"  {key}={value:,}" for key, value in result.info.items())
+    print(
+        f"{name:<55} {format_duration(result.min_ns):>10}/op "
+        f"{result.ops_per_sec:>14,.0f} ops/s{info}",
+        file=sys.stderr,
+    )
@@ -2,22 +2,63 @@
 
 This package provides ErrorCode, error registries (ListErrors, ErrorListByMixin),
 and ReturnValueWithStatus for propagating results with error information.
+
+The public names are imported lazily on first attribute access, so importing
+the package itself is cheap and workers only pay for what they use.
 """
 
 __version__ = "1.4.4"
 
-from errors.base import FunctionalErrorsBaseClass, add_error_data, is_error
-from errors.data_classes import ReturnValueWithErrorStatus, ReturnValueWithStatus
-from errors.error import ErrorCode, ListErrors
-from errors.mixin import ErrorListByMixin
+# avoids importing typing, which costs more than the rest of this module
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # pragma: no cover
+    from errors.base import (
+        ErrorCode,
+        FunctionalErrorsBaseClass,
+        add_error_data,
+        is_error,
+    )
+    from errors.batch import ReturnValueBatch
+    from errors.data_classes import ReturnValueWithErrorStatus, ReturnValueWithStatus
+    from errors.error import ListErrors
+    from errors.mixin import ErrorListByMixin
+
+# public name -> module defining it
+_LAZY_ATTRIBUTES = {
+    "add_error_data": "errors.base",
+    "is_error": "errors.base",
+    "ErrorCode": "errors.base",
+    "FunctionalErrorsBaseClass": "errors.base",
+    "ReturnValueWithErrorStatus": "errors.data_classes",
+    "ReturnValueWithStatus": "errors.data_classes",
+    "ReturnValueBatch": "errors.batch",
+    "ListErrors": "errors.error",
+    "ErrorListByMixin": "errors.mixin",
+}
 
 __all__ = [
     "add_error_data",
     "is_error",
     "ReturnValueWithErrorStatus",
     "ReturnValueWithStatus",
+    "ReturnValueBatch",
     "ErrorCode",
     "ListErrors",
     "ErrorListByMixin",
     "FunctionalErrorsBaseClass",
 ]
+
+
+def __getattr__(name: str):
+    """Import public names on first access (PEP 562)."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(__import__(module_name, fromlist=[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Include the lazily imported public names."""
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,144 @@
+"""Per thread shards of the recorders in errors.metrics and errors.instrumentation.
+
+A recorder keeps a fixed number of tables, dicts mapping a key to an int or
+to a list of numbers. Every thread records in its own shard, so recording
+never takes a lock, and only the owning thread adds to its shard. The
+shards are merged by name when a snapshot is taken:
+
+- Resetting records the values at the time of the reset instead of
+  changing them, so no update is ever lost.
+- The values of threads that have finished are added to retired totals and
+  their shards are dropped, so short-lived threads do not accumulate shards.
+- Keys are names, or weak references whose names are kept in the shard.
+  The values of keys whose referent was collected are retired the same way.
+"""
+
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class Shard:
+    """Tables of a single thread."""
+
+    __slots__ = ("tables", "tables_at_reset", "names", "thread")
+
+    def __init__(self, number_of_tables: int) -> None:
+        # plain dicts, updating a Counter costs about twice as much
+        self.tables: Tuple[Dict[Any, Any], ...] = tuple(
+            {} for _ in range(number_of_tables)
+        )
+        self.tables_at_reset: Tuple[Dict[Any, Any], ...] = tuple(
+            {} for _ in range(number_of_tables)
+        )
+        # names of the weakly referenced keys, set before the key is added
+        self.names: Dict[weakref.ref, str] = {}
+        self.thread = weakref.ref(threading.current_thread())
+
+    def is_retired(self) -> bool:
+        """Return whether the owning thread has finished."""
+        thread = self.thread()
+        return thread is None or not thread.is_alive()
+
+
+class ShardedTables:
+    """Tables recorded by every thread in its own shard.
+
+    Recorders keep the tables of the current thread on ``local``, created
+    with ``thread_shard()`` on the first record of a thread.
+    """
+
+    def __init__(self, number_of_tables: int) -> None:
+        self.number_of_tables = number_of_tables
+        self.local = threading.local()
+        # shards of the threads that recorded, changed when a thread records
+        # for the first time and when the shards of finished threads are
+        # retired
+        self.shards: List[Shard] = []
+        self._lock = threading.Lock()
+        # values since the last reset of finished threads and collected
+        # keys, by name
+        self._retired: Tuple[Dict[str, Any], ...] = self._new_totals()
+
+    def thread_shard(self) -> Shard:
+        """Create the shard of the current thread and store it on ``local``."""
+        shard = Shard(self.number_of_tables)
+        self.local.shard = shard
+        with self._lock:
+            self.shards.append(shard)
+        return shard
+
+    def snapshot(self, reset: bool = False) -> Tuple[Dict[str, Any], ...]:
+        """Return the values of all threads since the last reset, by name.
+
+        Args:
+            reset: When True, the values are reset after taking the snapshot.
+                Values recorded by other threads while the snapshot is taken
+                are either included or recorded towards the next snapshot.
+        """
+        totals = self._new_totals()
+        with self._lock:
+            active_shards = []
+            for shard in self.shards:
+                # checked before copying, a finished thread no longer records
+                retired = shard.is_retired()
+                # dict() and list() copy in one step, the owning thread may
+                # be recording, the names are copied after the tables
+                tables = [
+                    {
+                        key: list(value) if value.__class__ is list else value
+                        for key, value in dict(table).items()
+                    }
+                    for table in shard.tables
+                ]
+                names = dict(shard.names)
+                for index, table in enumerate(tables):
+                    table_at_reset = shard.tables_at_reset[index]
+                    table_totals = self._retired[index] if retired else totals[index]
+                    for key, value in list(table.items()):
+                        name = key
+                        collected = False
+                        if key.__class__ is weakref.ref:
+                            name = names[key]
+                            collected = key() is None
+                        _add(
+                            self._retired[index] if collected else table_totals,
+                            name,
+                            value,
+                            table_at_reset.get(key),
+                        )
+                        if collected and not retired:
+                            # the owning thread cannot record for a
+                            # collected key
+                            del shard.tables[index][key], table[key]
+                            table_at_reset.pop(key, None)
+                            shard.names.pop(key, None)
+                if retired:
+                    continue
+                active_shards.append(shard)
+                if reset:
+                    shard.tables_at_reset = tuple(tables)
+            self.shards[:] = active_shards
+            for retired_totals, table_totals in zip(self._retired, totals, strict=True):
+                for name, value in retired_totals.items():
+                    _add(table_totals, name, value, None)
+                if reset:
+                    retired_totals.clear()
+        return totals
+
+    def _new_totals(self) -> Tuple[Dict[str, Any], ...]:
+        return tuple({} for _ in range(self.number_of_tables))
+
+
+def _add(
+    totals: Dict[str, Any], name: str, value: Any, at_reset: Optional[Any]
+) -> None:
+    """Add *value* less the value at the last reset to the totals of *name*."""
+    if value.__class__ is not list:
+        totals[name] = totals.get(name, 0) + value - (at_reset or 0)
+        return
+    total = totals.get(name)
+    if total is None:
+        total = totals[name] = [0] * len(value)
+    for index, item in enumerate(value):
+        total[index] += item if at_reset is None else item - at_reset[index]
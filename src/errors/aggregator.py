@@ -0,0 +1,256 @@
+"""Bounded collector for large numbers of error occurrences.
+
+A return value collecting one ``ErrorCode`` per failing record keeps every
+occurrence, each with its own ``error_data``. ``ErrorAggregator`` instead
+keeps per error code:
+
+- the first occurrence, used as the distinct error of that code,
+- the number of occurrences,
+- a fixed-size reservoir sample of the ``error_data`` of the occurrences.
+
+At most ``max_codes`` distinct codes are kept. Occurrences of further codes
+are only counted as overflow, so memory use is bounded by
+``max_codes * sample_size`` samples whatever the number of occurrences.
+
+The aggregator can be used in place of the error list of a return value::
+
+    return_value = ReturnValueWithStatus()
+    aggregator = return_value.aggregate_errors()
+    for record in records:
+        if not is_complete(record):
+            return_value.add_error(add_error_data(INCOMPLETE, {"id": record.id}))
+
+    return_value.is_valid          # False
+    list(return_value.errors)      # [ErrorCode(code='ER_DATA_00001', ...)]
+    aggregator.count("ER_DATA_00001")
+    aggregator.samples("ER_DATA_00001")
+"""
+
+import random
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import errors.settings as st
+from errors.base import ErrorCode
+
+
+class _Entry:
+    """Aggregated occurrences of a single error code."""
+
+    __slots__ = ("error", "count", "with_data", "samples")
+
+    def __init__(self, error: ErrorCode) -> None:
+        self.error = error
+        self.count = 0
+        # number of occurrences with error_data, the population of the sample
+        self.with_data = 0
+        self.samples: List[dict] = []
+
+
+class ErrorAggregator:
+    """Collects error occurrences as counts and samples per error code.
+
+    Supports ``append``, ``extend``, ``len``, truth testing and iteration like
+    the error list of ``ReturnValueWithStatus``, iteration yields the
+    distinct errors (first occurrence per code) in order of first appearance.
+    """
+
+    __slots__ = (
+        "max_codes",
+        "sample_size",
+        "_entries",
+        "_overflow",
+        "_is_valid",
+        "_random",
+    )
+
+    def __init__(
+        self,
+        max_codes: int = st.AGGREGATOR_MAX_CODES,
+        sample_size: int = st.AGGREGATOR_SAMPLE_SIZE,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Create an empty aggregator.
+
+        Args:
+            max_codes: Maximum number of distinct error codes kept.
+            sample_size: Maximum number of ``error_data`` samples kept per code.
+            seed: Seed for the reservoir sampling, for reproducible samples.
+
+        Raises:
+            ValueError: If *max_codes* or *sample_size* is negative.
+        """
+        if max_codes < 0 or sample_size < 0:
+            raise ValueError("max_codes and sample_size must not be negative")
+        self.max_codes = max_codes
+        self.sample_size = sample_size
+        self._entries: Dict[str, _Entry] = {}
+        self._overflow = 0
+        self._is_valid = True
+        self._random = random.Random(seed)
+
+    def __len__(self) -> int:
+        """Return the number of distinct errors kept."""
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        return bool(self._entries) or bool(self._overflow)
+
+    def __iter__(self) -> Iterator[ErrorCode]:
+        """Iterate over the distinct errors in order of first appearance."""
+        for entry in self._entries.values():
+            yield entry.error
+
+    def __contains__(self, error_code: object) -> bool:
+        """Return whether an ErrorCode or code string is kept."""
+        if isinstance(error_code, ErrorCode):
+            error_code = error_code.code
+        return error_code in self._entries
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(codes={len(self._entries)}, "
+            f"total={self.total}, overflow={self.overflow})"
+        )
+
+    @property
+    def is_valid(self) -> bool:
+        """Return whether no error was added with ``add_error`` that invalidates."""
+        return self._is_valid
+
+    @property
+    def total(self) -> int:
+        """Return the number of occurrences, including overflow."""
+        return sum(entry.count for entry in self._entries.values()) + self._overflow
+
+    @property
+    def overflow(self) -> int:
+        """Return the number of occurrences of codes beyond ``max_codes``.
+
+        Overflowing occurrences are only counted, not per code, as that
+        would again take memory per distinct code.
+        """
+        return self._overflow
+
+    def add_error(self, error: ErrorCode, keep_current_status: bool = False) -> None:
+        """Add an occurrence of *error*.
+
+        Args:
+            error: The ErrorCode occurrence to add.
+            keep_current_status: When True, ``is_valid`` is left unchanged.
+                When False (default), ``is_valid`` is set to False.
+        """
+        entry = self._entries.get(error.code)
+        if entry is None:
+            if len(self._entries) >= self.max_codes:
+                self._overflow += 1
+                if not keep_current_status:
+                    self._is_valid = False
+                return
+            entry = self._entries[error.code] = _Entry(error)
+
+        entry.count += 1
+        if error.error_data:
+            self._sample(entry, error.error_data)
+
+        if not keep_current_status:
+            self._is_valid = False
+
+    def append(self, error: ErrorCode) -> None:
+        """Add an occurrence of *error* without changing ``is_valid``.
+
+        Used by ``ReturnValueWithStatus.add_error``, which keeps track of the
+        validity of the return value itself.
+        """
+        self.add_error(error, keep_current_status=True)
+
+    def extend(self, errors: Iterable[ErrorCode]) -> None:
+        """Add an occurrence of each of *errors* without changing ``is_valid``."""
+        for error in errors:
+            self.add_error(error, keep_current_status=True)
+
+    def merge(self, other: "ErrorAggregator") -> None:
+        """Add the occurrences aggregated by *other* without changing ``is_valid``.
+
+        Counts are added, the samples of both are combined into a sample of
+        at most ``sample_size`` drawn in proportion to the occurrences each
+        represents. Codes beyond ``max_codes`` are counted as overflow.
+        """
+        entries = self._entries
+        for code, other_entry in other._entries.items():
+            entry = entries.get(code)
+            if entry is None:
+                if len(entries) >= self.max_codes:
+                    self._overflow += other_entry.count
+                    continue
+                entry = entries[code] = _Entry(other_entry.error)
+            entry.count += other_entry.count
+            self._merge_samples(entry, other_entry)
+        self._overflow += other._overflow
+
+    def copy(self) -> "ErrorAggregator":
+        """Return an independent aggregator with the same counts and samples."""
+        aggregator = self.__class__(self.max_codes, self.sample_size)
+        for code, entry in self._entries.items():
+            copied = aggregator._entries[code] = _Entry(entry.error)
+            copied.count = entry.count
+            copied.with_data = entry.with_data
+            copied.samples = list(entry.samples)
+        aggregator._overflow = self._overflow
+        aggregator._is_valid = self._is_valid
+        aggregator._random.setstate(self._random.getstate())
+        return aggregator
+
+    def count(self, error_code: str) -> int:
+        """Return the number of occurrences of *error_code*."""
+        entry = self._entries.get(error_code)
+        return 0 if entry is None else entry.count
+
+    def counts(self) -> Counter:
+        """Return the number of occurrences per kept error code."""
+        return Counter({code: entry.count for code, entry in self._entries.items()})
+
+    def samples(self, error_code: str) -> List[dict]:
+        """Return the sampled ``error_data`` of the occurrences of *error_code*.
+
+        Occurrences without error data are not sampled. The samples are a
+        uniform random selection of at most ``sample_size`` occurrences.
+        """
+        entry = self._entries.get(error_code)
+        return [] if entry is None else list(entry.samples)
+
+    def _sample(self, entry: _Entry, error_data: dict) -> None:
+        """Add *error_data* to the reservoir of *entry* (algorithm R)."""
+        entry.with_data += 1
+        samples = entry.samples
+        if len(samples) < self.sample_size:
+            samples.append(error_data)
+            return
+        index = self._random.randrange(entry.with_data)
+        if index < self.sample_size:
+            samples[index] = error_data
+
+    def _merge_samples(self, entry: _Entry, other: _Entry) -> None:
+        """Combine the reservoir of *other* into the reservoir of *entry*."""
+        samples, other_samples = entry.samples, list(other.samples)
+        population, other_population = entry.with_data, other.with_data
+        entry.with_data += other.with_data
+        if len(samples) + len(other_samples) <= self.sample_size:
+            samples.extend(other_samples)
+            return
+        own_samples = list(samples)
+        merged: List[dict] = []
+        randrange = self._random.randrange
+        while len(merged) < self.sample_size:
+            # every sample stands for an equal share of the occurrences of
+            # its reservoir, pick the reservoir by the occurrences left
+            if other_samples and (
+                not own_samples
+                or randrange(population + other_population) >= population
+            ):
+                other_population -= other_population // len(other_samples)
+                merged.append(other_samples.pop(randrange(len(other_samples))))
+            else:
+                population -= population // len(own_samples)
+                merged.append(own_samples.pop(randrange(len(own_samples))))
+        entry.samples = merged
@@ -0,0 +1,226 @@
+"""Asyncio support for coroutines returning ReturnValueWithStatus instances.
+
+- ``returns_status`` -- decorator turning exceptions raised by a coroutine
+  into an invalid ReturnValueWithStatus.
+- ``gather_with_status`` -- run awaitables concurrently with an optional
+  concurrency limit and per task timeout, results in input order.
+- ``as_completed_with_status`` -- like ``gather_with_status`` but yields the
+  results as the tasks complete.
+
+Example::
+
+    @returns_status(error=MyErrors.API_CALL_FAILED.value)
+    async def fetch(url: str) -> dict:
+        ...
+
+    results = await gather_with_status(
+        *(fetch(url) for url in urls), limit=100, timeout=5.0
+    )
+"""
+
+import asyncio
+import functools
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from errors.base import ErrorCode, ErrorsClassErrors, add_error_data
+from errors.data_classes import ReturnValueWithErrorStatus, ReturnValueWithStatus
+from errors.exception_map import _as_return_value, exception_error_data
+
+T = TypeVar("T")
+
+TIMEOUT_ERROR = ErrorsClassErrors.TASK_TIMED_OUT.value
+EXCEPTION_ERROR = ErrorsClassErrors.UNEXPECTED_EXCEPTION.value
+
+
+class _TimeoutExpired(Exception):
+    """Raised by ``_await`` when the timeout of the awaitable expired."""
+
+
+class _AwaitableTimeoutError(Exception):
+    """Carries a TimeoutError raised by the awaitable itself past wait_for()."""
+
+    def __init__(self, exception: BaseException) -> None:
+        super().__init__(exception)
+        self.exception = exception
+
+
+async def _reraise_timeouts(awaitable: Awaitable) -> Any:
+    try:
+        return await awaitable
+    except asyncio.TimeoutError as exception:
+        raise _AwaitableTimeoutError(exception) from None
+
+
+async def _await(awaitable: Awaitable, timeout: Optional[float]) -> Any:
+    """Await *awaitable*, raising _TimeoutExpired when *timeout* expires.
+
+    A TimeoutError raised by *awaitable* itself is raised as is, it is not
+    reported as an expired timeout.
+    """
+    if timeout is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(_reraise_timeouts(awaitable), timeout)
+    except asyncio.TimeoutError:
+        raise _TimeoutExpired from None
+    except _AwaitableTimeoutError as wrapper:
+        raise wrapper.exception from None
+
+
+async def _run(
+    awaitable: Awaitable,
+    semaphore: Optional[asyncio.Semaphore],
+    timeout: Optional[float],
+    error: ErrorCode,
+    timeout_error: ErrorCode,
+) -> ReturnValueWithStatus:
+    """Await *awaitable* and convert its outcome to a ReturnValueWithStatus."""
+    try:
+        if semaphore is None:
+            result = await _await(awaitable, timeout)
+        else:
+            async with semaphore:
+                result = await _await(awaitable, timeout)
+    except _TimeoutExpired:
+        return ReturnValueWithErrorStatus(
+            add_error_data(timeout_error, {"timeout": timeout})
+        )
+    except Exception as exception:
+        return ReturnValueWithErrorStatus(
+            add_error_data(error, exception_error_data(exception))
+        )
+    return _as_return_value(result)
+
+
+def returns_status(
+    function: Optional[Callable[..., Awaitable]] = None,
+    *,
+    error: ErrorCode = EXCEPTION_ERROR,
+) -> Any:
+    """Decorate a coroutine function so it returns a ReturnValueWithStatus.
+
+    The result of the coroutine is wrapped in a ReturnValueWithStatus, unless
+    it already is one. Exceptions are returned as an invalid return value
+    holding *error* with the exception type and message as error data.
+    Cancellation is never converted.
+
+    Can be used with or without arguments::
+
+        @returns_status
+        async def fetch(): ...
+
+        @returns_status(error=MY_ERROR)
+        async def fetch(): ...
+
+    Args:
+        function: The coroutine function to decorate.
+        error: ErrorCode used for exceptions raised by the coroutine.
+    """
+
+    def decorate(function: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+        @functools.wraps(function)
+        async def wrapper(*args: Any, **kwargs: Any) -> ReturnValueWithStatus:
+            try:
+                result = await function(*args, **kwargs)
+            except Exception as exception:
+                return ReturnValueWithErrorStatus(
+                    add_error_data(error, exception_error_data(exception))
+                )
+            return _as_return_value(result)
+
+        return wrapper
+
+    if function is None:
+        return decorate
+    return decorate(function)
+
+
+async def gather_with_status(
+    *awaitables: Awaitable,
+    limit: Optional[int] = None,
+    timeout: Optional[float] = None,
+    error: ErrorCode = EXCEPTION_ERROR,
+    timeout_error: ErrorCode = TIMEOUT_ERROR,
+) -> List[ReturnValueWithStatus]:
+    """Run *awaitables* concurrently and return their results in input order.
+
+    Every outcome is returned as a ReturnValueWithStatus: results are
+    wrapped (unless they already are a ReturnValueWithStatus), exceptions
+    and timeouts become invalid return values. A single failing awaitable
+    therefore never cancels the others.
+
+    Args:
+        awaitables: Coroutines, tasks or futures to run.
+        limit: Maximum number of awaitables running at the same time,
+            unlimited when None.
+        timeout: Timeout in seconds per awaitable, measured from the moment
+            it starts running. No timeout when None.
+        error: ErrorCode used for exceptions raised by an awaitable.
+        timeout_error: ErrorCode used for awaitables that timed out. A
+            TimeoutError raised by an awaitable itself gets *error*.
+
+    Returns:
+        List with a ReturnValueWithStatus per awaitable, in input order.
+    """
+    semaphore = asyncio.Semaphore(limit) if limit else None
+    return list(
+        await asyncio.gather(
+            *(
+                _run(awaitable, semaphore, timeout, error, timeout_error)
+                for awaitable in awaitables
+            )
+        )
+    )
+
+
+async def as_completed_with_status(
+    awaitables: Iterable[Awaitable],
+    limit: Optional[int] = None,
+    timeout: Optional[float] = None,
+    error: ErrorCode = EXCEPTION_ERROR,
+    timeout_error: ErrorCode = TIMEOUT_ERROR,
+) -> AsyncGenerator[Tuple[int, ReturnValueWithStatus], None]:
+    """Run *awaitables* concurrently and yield their results as they complete.
+
+    Takes the same arguments as ``gather_with_status``. Yields tuples of
+    the index of the awaitable in *awaitables* and its ReturnValueWithStatus.
+    Tasks still running when the iteration is stopped early are cancelled.
+
+    Like ``gather_with_status``, cancellation is not converted: when an
+    awaitable is cancelled, or raises an exception that is not an
+    ``Exception`` subclass, that exception is raised once it is reached and
+    the remaining tasks are cancelled.
+    """
+    semaphore = asyncio.Semaphore(limit) if limit else None
+    # every task is put in the queue when done, also when cancelled, so
+    # the number of items always equals the number of tasks
+    completed: asyncio.Queue = asyncio.Queue()
+
+    def on_done(index: int, task: asyncio.Task) -> None:
+        completed.put_nowait((index, task))
+
+    tasks = []
+    for index, awaitable in enumerate(awaitables):
+        task = asyncio.ensure_future(
+            _run(awaitable, semaphore, timeout, error, timeout_error)
+        )
+        task.add_done_callback(functools.partial(on_done, index))
+        tasks.append(task)
+
+    try:
+        for _ in range(len(tasks)):
+            index, task = await completed.get()
+            yield index, task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -2,33 +2,260 @@
 
 Provides the core building blocks for the error-manager package:
 
-- ``ErrorCode`` -- immutable dataclass representing a single error.
+- ``ErrorCode`` -- immutable, hashable dataclass representing a single error.
+- ``ErrorData`` -- immutable dict holding the context data of an ErrorCode.
 - ``is_error`` -- check whether an object is an ErrorCode instance.
 - ``add_error_data`` -- create a new ErrorCode with additional context data.
-- ``BaseEnumerator`` -- enum base class with ``keys()`` and ``values()`` helpers.
+- ``BaseEnumerator`` -- enum base class with ``keys()``, ``values()`` and
+  ``member_by_code()`` helpers backed by tables built at class creation.
 - ``FunctionalErrorsBaseClass`` -- base enumerator for grouping related errors.
 - ``ErrorsClassErrors`` -- built-in errors used by the errors package itself.
 """
 
+import sys
+from bisect import bisect_left
 from dataclasses import dataclass, field
-from enum import Enum
-from typing import Any, Dict, Union
+from enum import Enum, EnumMeta
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NoReturn,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import errors.settings as st
+
+
+class ErrorData(dict):
+    """Immutable dict holding the context data of an ErrorCode.
+
+    Behaves like a regular (read-only) dict, so it compares equal to dicts
+    with the same items and can be serialized as such. All mutating methods
+    raise TypeError.
+    """
+
+    __slots__ = ()
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError(st.EXC_ERROR_DATA_IS_IMMUTABLE)
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __ior__ = _immutable
+    clear = _immutable
+    pop = _immutable
+    popitem = _immutable
+    setdefault = _immutable
+    update = _immutable
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        """Hash on the items, or on the keys only if a value is unhashable."""
+        try:
+            return hash(frozenset(self.items()))
+        except TypeError:
+            return hash(frozenset(self))
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+    def __repr__(self) -> str:
+        return dict.__repr__(self)
+
+
+EMPTY_ERROR_DATA = ErrorData()
+
+
+class MemberTable(list):
+    """Immutable list returned by ``BaseEnumerator.keys()`` and ``values()``.
+
+    Behaves like a regular (read-only) list, so it compares equal to lists
+    with the same items. All mutating methods raise TypeError.
+    """
+
+    __slots__ = ()
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError(st.EXC_MEMBER_TABLE_IS_IMMUTABLE)
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __iadd__ = _immutable
+    __imul__ = _immutable
+    append = _immutable
+    clear = _immutable
+    extend = _immutable
+    insert = _immutable
+    pop = _immutable
+    remove = _immutable
+    reverse = _immutable
+    sort = _immutable
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+
+# called with the error code by add_error_data, set by errors.metrics.enable()
+_count_error_data: Optional[Callable[[str], None]] = None
+# the ListErrors registry, set when errors.error is imported
+_list_errors: Any = None
+
+
+class _CachedHash:
+    """Base of ErrorCode holding the cached hash outside the dataclass fields.
+
+    A slot of the dataclass itself would be a field, showing up in
+    ``dataclasses.fields()``, ``asdict()`` and ``astuple()``.
+    """
+
+    __slots__ = ("_hash",)
+
+    _hash: Optional[int]
 
 
-@dataclass(frozen=True)
-class ErrorCode:
+@dataclass(frozen=True, slots=True)
+class ErrorCode(_CachedHash):
     """Immutable dataclass representing a single error.
 
+    ErrorCode instances are hashable, so they can be used as set members and
+    dict keys. The hash is computed on first use and cached on the instance.
+
+    Instances use ``__slots__`` and the code and description strings are
+    interned, so the many occurrences created with ``add_error_data()`` only
+    hold references to the strings of the original error.
+
     Attributes:
         code: Unique error code string identifying this error.
         description: Human-readable description of the error.
         error_data: Optional dict with additional context for a specific
-            error occurrence. Defaults to an empty dict.
+            error occurrence. Stored as an immutable ErrorData dict.
+            Defaults to an empty ErrorData.
     """
 
     code: str
     description: str
-    error_data: Dict = field(default_factory=dict)
+    error_data: Dict = field(default_factory=lambda: EMPTY_ERROR_DATA)
+
+    def __post_init__(self) -> None:
+        # the slot setters skip the frozen __setattr__ of object.__setattr__
+        _set_hash(self, None)
+        code = self.code
+        if code.__class__ is str:
+            _set_code(self, sys.intern(code))
+        description = self.description
+        if description.__class__ is str:
+            _set_description(self, sys.intern(description))
+        error_data = self.error_data
+        if error_data.__class__ is not ErrorData:
+            _set_error_data(self, _error_data(error_data))
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            self.code == other.code  # type: ignore[attr-defined]
+            and self.description == other.description  # type: ignore[attr-defined]
+            and self.error_data == other.error_data  # type: ignore[attr-defined]
+        )
+
+    def __hash__(self) -> int:
+        error_hash = self._hash
+        if error_hash is None:
+            error_hash = hash((self.code, self.description, hash(self.error_data)))
+            object.__setattr__(self, "_hash", error_hash)
+        return error_hash
+
+    def __reduce__(self):
+        """Pickle registered errors as reference to their ListErrors entry.
+
+        Occurrences of a registered error carry their code, description and,
+        when it differs from the registered one, their error data. Unpickling
+        returns the registered instance of the unpickling process if it has
+        registered the same error, else a new ErrorCode. Pickle stores the
+        interned description once per pickle, further occurrences only
+        reference it. The cached hash is never pickled, as string hashes
+        differ between processes.
+        """
+        registry = _list_errors
+        registered = None
+        if registry is not None:
+            registered = registry.get_error(self.code)
+        if (
+            registered is not None
+            and registered.__class__ is self.__class__
+            and registered.description == self.description
+        ):
+            if self.error_data == registered.error_data:
+                return (_registered_error, (self.code, self.description))
+            return (
+                _registered_error,
+                (self.code, self.description, dict(self.error_data)),
+            )
+        return (self.__class__, (self.code, self.description, self.error_data))
+
+
+def _registered_error(
+    code: str, description: str, error_data: Optional[dict] = None
+) -> ErrorCode:
+    """Return the error registered for *code*, with *error_data* if given.
+
+    Used to unpickle registered errors, see ``ErrorCode.__reduce__``. When
+    this process has not registered *code* with the same description, a new
+    ErrorCode is returned.
+    """
+    if _list_errors is None:
+        import errors.error  # noqa: F401, sets _list_errors
+
+    registered = _list_errors.get_error(code)
+    if registered is None or registered.description != description:
+        return ErrorCode(
+            code=code, description=description, error_data=error_data or {}
+        )
+    if error_data is None:
+        return registered
+    if registered.__class__ is not ErrorCode:
+        return registered.__class__(
+            code=registered.code,
+            description=registered.description,
+            error_data=error_data,
+        )
+    return _error_occurrence(registered, error_data)
+
+
+def _error_occurrence(error: ErrorCode, error_data: Mapping) -> ErrorCode:
+    """Return an ErrorCode with the code and description of *error*.
+
+    The strings of *error* are interned already, setting the slots directly
+    skips ``__init__`` and ``__post_init__`` and is about three times faster.
+    """
+    occurrence = _new_error_code(ErrorCode)
+    _set_code(occurrence, error.code)
+    _set_description(occurrence, error.description)
+    _set_error_data(occurrence, _error_data(error_data))
+    _set_hash(occurrence, None)
+    return occurrence
+
+
+def _error_data(error_data: Mapping) -> ErrorData:
+    """Return *error_data* as ErrorData, the shared empty one if it is empty."""
+    if error_data.__class__ is ErrorData:
+        return error_data  # type: ignore[return-value]
+    return ErrorData(error_data) if error_data else EMPTY_ERROR_DATA
+
+
+_new_error_code = object.__new__
+_set_code = vars(ErrorCode)["code"].__set__
+_set_description = vars(ErrorCode)["description"].__set__
+_set_error_data = vars(ErrorCode)["error_data"].__set__
+_set_hash = vars(_CachedHash)["_hash"].__set__
 
 
 def is_error(error: Union[ErrorCode, Any]) -> bool:
@@ -48,7 +275,8 @@ def add_error_data(error: ErrorCode, error_data: dict) -> ErrorCode:
     """Return a new ErrorCode with *error_data* attached.
 
     Because ErrorCode is frozen, this creates a new instance with the same
-    code and description but with the provided *error_data*.
+    code and description but with the provided *error_data*. The new
+    instance shares the code and description strings of *error*.
 
     Args:
         error: Original error code to copy.
@@ -57,26 +285,126 @@ def add_error_data(error: ErrorCode, error_data: dict) -> ErrorCode:
     Returns:
         A new ErrorCode instance with the given error_data.
     """
-    return ErrorCode(
-        code=error.code, description=error.description, error_data=error_data
-    )
+    if _count_error_data is not None:
+        _count_error_data(error.code)
+    return _error_occurrence(error, error_data)
+
+
+def _merge_sorted_codes(
+    sorted_codes: Sequence[str], new_codes: Iterable[str]
+) -> List[str]:
+    """Return *sorted_codes* with *new_codes*, which it must not contain, sorted."""
+    merged = list(sorted_codes)
+    merged.extend(new_codes)
+    # sorted_codes is one sorted run, so sorting is close to linear
+    merged.sort()
+    return merged
+
+
+def _errors_with_prefix(
+    sorted_codes: Sequence[str], errors_by_code: Mapping[str, ErrorCode], prefix: str
+) -> List[ErrorCode]:
+    """Return the errors whose code starts with *prefix*, in code order.
+
+    A binary search finds the first match, the matches follow it, so the
+    time is proportional to the number of matches. Codes may be inserted
+    into *sorted_codes* meanwhile, moving the following codes to the right,
+    so codes not after the previous match are skipped.
+    """
+    errors = []
+    previous: Optional[str] = None
+    index = bisect_left(sorted_codes, prefix)
+    while index < len(sorted_codes):
+        code = sorted_codes[index]
+        index += 1
+        if code < prefix or (previous is not None and code <= previous):
+            continue
+        if not code.startswith(prefix):
+            break
+        previous = code
+        error = errors_by_code.get(code)
+        if error is not None:
+            errors.append(error)
+    return errors
+
+
+def _assign_error_ids(
+    error_ids: Mapping[str, int], error_codes: Iterable[str]
+) -> Dict[str, int]:
+    """Return *error_ids* extended with the next free IDs for new *error_codes*.
+
+    IDs are dense: the codes of the returned dict are in ID order and the ID
+    of a code equals its position.
+    """
+    assigned = dict(error_ids)
+    for error_code in error_codes:
+        if error_code not in assigned:
+            assigned[error_code] = len(assigned)
+    return assigned
 
 
-class BaseEnumerator(Enum):
+def _error_ids_from_export(error_codes: Iterable[str]) -> Dict[str, int]:
+    """Return the code -> ID dict of an ID export, a list of codes in ID order.
+
+    Raises:
+        ValueError: If a code occurs more than once.
+    """
+    error_codes = list(error_codes)
+    error_ids = {error_code: index for index, error_code in enumerate(error_codes)}
+    if len(error_ids) != len(error_codes):
+        raise ValueError("exported error IDs contain duplicate codes")
+    return error_ids
+
+
+class _EnumeratorType(EnumMeta):
+    """Metaclass building the member tables of an enumerator once."""
+
+    _member_keys: "MemberTable"
+    _member_values: "MemberTable"
+    _members_by_code: Mapping[str, Any]
+
+    def __new__(mcls, *args: Any, **kwargs: Any):
+        cls = super().__new__(mcls, *args, **kwargs)
+        members: Mapping[str, Enum] = cls.__members__
+        cls._member_keys = MemberTable(members)
+        cls._member_values = MemberTable(member.value for member in members.values())
+        cls._members_by_code = MappingProxyType(
+            {
+                member.value.code: member
+                for member in members.values()
+                if isinstance(member.value, ErrorCode)
+            }
+        )
+        return cls
+
+
+class BaseEnumerator(Enum, metaclass=_EnumeratorType):
     """Base Enum subclass providing ``keys()`` and ``values()`` class methods.
 
+    The member names, the member values and the code -> member index are
+    built once when the class is created, enumerators cannot change after.
+
     Not intended for direct use -- subclass via FunctionalErrorsBaseClass.
     """
 
     @classmethod
-    def values(cls):
-        """Return a list of all member values."""
-        return [item.value for item in list(cls.__members__.values())]
+    def values(cls) -> MemberTable:
+        """Return an immutable list of all member values."""
+        return cls._member_values
 
     @classmethod
-    def keys(cls):
-        """Return a list of all member names."""
-        return list(cls.__members__.keys())
+    def keys(cls) -> MemberTable:
+        """Return an immutable list of all member names."""
+        return cls._member_keys
+
+    @classmethod
+    def member_by_code(cls, error_code: str) -> Optional["BaseEnumerator"]:
+        """Return the member whose ErrorCode has the code *error_code*.
+
+        Returns:
+            The member, or None if no member has that code.
+        """
+        return cls._members_by_code.get(error_code)
 
 
 class FunctionalErrorsBaseClass(BaseEnumerator):
@@ -103,3 +431,9 @@ class ErrorsClassErrors(FunctionalErrorsBaseClass):
     COULD_NOT_FIND_ERROR_CODE = ErrorCode(
         code="ER_GETERROR_00001", description="Could not find requested error code"
     )
+    TASK_TIMED_OUT = ErrorCode(
+        code="ER_ASYNC_00001", description="Task did not complete within its timeout"
+    )
+    UNEXPECTED_EXCEPTION = ErrorCode(
+        code="ER_ASYNC_00002", description="Task raised an unexpected exception"
+    )
@@ -0,0 +1,219 @@
+"""Columnar container for large numbers of results with status and errors.
+
+``ReturnValueBatch`` holds the same information as a list of
+``ReturnValueWithStatus`` instances, but stores it in three columns:
+
+- ``results`` -- a list with the result of every record.
+- validity -- a bytearray with one byte (0 or 1) per record.
+- errors -- a sparse dict mapping record index to its list of errors.
+
+Records without errors therefore cost one list slot and one byte, instead
+of a ``ReturnValueWithStatus`` instance each.
+
+Example::
+
+    batch = ReturnValueBatch()
+    for record in records:
+        index = batch.append(transform(record))
+        if not is_complete(record):
+            batch.add_error(index, INCOMPLETE_RECORD)
+
+    batch.valid_results()          # results of all valid records
+    batch.invalid_indices()        # [3, 17, ...]
+    batch.count_by_error_code()    # Counter({"ER_DATA_00001": 2, ...})
+"""
+
+from collections import Counter
+from itertools import compress
+from typing import (
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+    overload,
+)
+
+from errors.base import ErrorCode
+from errors.data_classes import ReturnValueWithStatus
+
+T = TypeVar("T")
+
+
+class ReturnValueBatch(Generic[T]):
+    """Columnar batch of results with per record validity status and errors.
+
+    Records are addressed by their index in the batch. Adding errors
+    follows the semantics of ``ReturnValueWithStatus.add_error``.
+    """
+
+    __slots__ = ("_results", "_valid", "_errors")
+
+    def __init__(self, results: Iterable[T] = ()) -> None:
+        """Create a batch, optionally filled with valid *results*."""
+        self._results: List[Optional[T]] = list(results)
+        self._valid = bytearray(b"\x01") * len(self._results)
+        self._errors: Dict[int, List[ErrorCode]] = {}
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @overload
+    def __getitem__(self, index: int) -> ReturnValueWithStatus[T]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "ReturnValueBatch[T]": ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[ReturnValueWithStatus[T], "ReturnValueBatch[T]"]:
+        """Return the record at *index* as a ReturnValueWithStatus.
+
+        A slice returns a new batch holding copies of the selected records,
+        like slicing a list of ReturnValueWithStatus instances.
+        """
+        if isinstance(index, slice):
+            return self._slice(index)
+        index = range(len(self._results))[index]
+        return_value: ReturnValueWithStatus[T] = ReturnValueWithStatus(
+            result=self._results[index], _is_valid=bool(self._valid[index])
+        )
+        errors = self._errors.get(index)
+        if errors:
+            return_value._errors = list(errors)
+        return return_value
+
+    def _slice(self, index: slice) -> "ReturnValueBatch[T]":
+        indices = range(len(self._results))[index]
+        batch: ReturnValueBatch[T] = self.__class__()
+        batch._results = self._results[index]
+        batch._valid = self._valid[index]
+        batch._errors = {
+            indices.index(record): list(errors)
+            for record, errors in self._errors.items()
+            if record in indices
+        }
+        return batch
+
+    def __iter__(self) -> Iterator[ReturnValueWithStatus[T]]:
+        """Iterate over all records as ReturnValueWithStatus instances."""
+        for index in range(len(self._results)):
+            yield self[index]
+
+    @property
+    def results(self) -> List[Optional[T]]:
+        """Return the results of all records, valid or not."""
+        return self._results
+
+    @property
+    def is_valid(self) -> bool:
+        """Return whether all records in the batch are valid."""
+        return 0 not in self._valid
+
+    def append(self, result: Optional[T] = None) -> int:
+        """Append a valid record holding *result*.
+
+        Returns:
+            The index of the new record.
+        """
+        self._results.append(result)
+        self._valid.append(1)
+        return len(self._results) - 1
+
+    def extend(self, results: Iterable[T]) -> None:
+        """Append a valid record for each of *results*."""
+        number_of_records = len(self._results)
+        self._results.extend(results)
+        self._valid.extend(b"\x01" * (len(self._results) - number_of_records))
+
+    def append_return_value(self, return_value: ReturnValueWithStatus[T]) -> int:
+        """Append a record copied from *return_value*.
+
+        Returns:
+            The index of the new record.
+        """
+        index = len(self._results)
+        self._results.append(return_value.result)
+        self._valid.append(1 if return_value._is_valid else 0)
+        if return_value._errors:
+            self._errors[index] = list(return_value._errors)
+        return index
+
+    def add_error(
+        self, index: int, error: ErrorCode, keep_current_status: bool = False
+    ) -> None:
+        """Add an error to the record at *index*.
+
+        Args:
+            index: Index of the record.
+            error: The ErrorCode to append.
+            keep_current_status: When True, the validity of the record is left
+                unchanged. When False (default), the record becomes invalid.
+        """
+        index = range(len(self._results))[index]
+        errors = self._errors.get(index)
+        if errors is None:
+            self._errors[index] = [error]
+        else:
+            errors.append(error)
+
+        if not keep_current_status:
+            self._valid[index] = 0
+
+    def record_is_valid(self, index: int) -> bool:
+        """Return whether the record at *index* is valid."""
+        return bool(self._valid[index])
+
+    def record_errors(self, index: int) -> List[ErrorCode]:
+        """Return the errors of the record at *index*, empty if it has none."""
+        return self._errors.get(range(len(self._results))[index], [])
+
+    def invalid_indices(self) -> List[int]:
+        """Return the indices of all invalid records in ascending order."""
+        valid = self._valid
+        indices = []
+        index = valid.find(0)
+        while index != -1:
+            indices.append(index)
+            index = valid.find(0, index + 1)
+        return indices
+
+    def error_indices(self) -> List[int]:
+        """Return the indices of all records with errors in ascending order."""
+        return sorted(index for index, errors in self._errors.items() if errors)
+
+    def valid_results(self) -> List[Optional[T]]:
+        """Return the results of all valid records, in record order."""
+        return list(compress(self._results, self._valid))
+
+    def count_by_error_code(self) -> Counter:
+        """Return the number of occurrences per error code over all records."""
+        counts: Counter = Counter()
+        for errors in self._errors.values():
+            counts.update(error.code for error in errors)
+        return counts
+
+    @classmethod
+    def from_return_values(
+        cls, return_values: Iterable[ReturnValueWithStatus[T]]
+    ) -> "ReturnValueBatch[T]":
+        """Create a batch from ReturnValueWithStatus instances."""
+        batch: ReturnValueBatch[T] = cls()
+        append_return_value = batch.append_return_value
+        for return_value in return_values:
+            append_return_value(return_value)
+        return batch
+
+    def to_return_values(self) -> List[ReturnValueWithStatus[T]]:
+        """Return all records as a list of ReturnValueWithStatus instances."""
+        errors = self._errors
+        return_values = [
+            ReturnValueWithStatus(result=result, _is_valid=bool(valid))
+            for result, valid in zip(self._results, self._valid, strict=True)
+        ]
+        for index, record_errors in errors.items():
+            return_values[index]._errors = list(record_errors)
+        return return_values
@@ -1,33 +1,60 @@
 """Dataclasses for returning results with validity status and error information."""
 
 from dataclasses import dataclass, field
-from typing import Generic, Optional, TypeVar
+from itertools import chain
+from typing import Any, Callable, Generic, Iterable, List, Optional, TypeVar
 
 import errors.settings as st
 
+from .aggregator import ErrorAggregator
 from .base import ErrorCode
 
 T = TypeVar("T")
+U = TypeVar("U")
 
+# shared error storage of return values to which no error has been added yet,
+# other tuples are error storage shared by combinators (see _shared_errors)
+_NO_ERRORS: tuple = ()
 
-@dataclass
+# called with the code of every added error, set by errors.metrics.enable()
+_count_error: Optional[Callable[[str], None]] = None
+# called with every added error, set by errors.sink.ErrorSink.install()
+_emit_error: Optional[Callable[[ErrorCode], object]] = None
+
+
+@dataclass(slots=True)
 class ReturnValueWithStatus(Generic[T]):
     """Generic dataclass for returning a result with validity status and errors.
 
+    Instances use ``__slots__`` and share a single empty error storage until
+    the first error is added, so a successful return value only costs the
+    instance itself.
+
+    The combinators ``map()``, ``and_then()``, ``collect()`` and ``merge()``
+    chain steps without unpacking every result. They return invalid values
+    unchanged and share the error storage between the values they create
+    instead of copying it, it is copied when an error is added to one of them.
+    An ErrorAggregator set with ``aggregate_errors()`` is copied instead of
+    shared, and combining aggregated values merges their aggregators.
+
     Attributes:
         result: The return value (any type T), defaults to None.
         is_valid: Whether the result is valid (read-only property).
-        errors: List of accumulated ErrorCode instances (read-only property).
+        errors: List of accumulated ErrorCode instances (read-only property),
+            or the ErrorAggregator set with ``aggregate_errors()``.
     """
 
     result: Optional[T] = None
     _is_valid: bool = True
-    _errors: list[ErrorCode] = field(default_factory=list)
+    _errors: list[ErrorCode] = _NO_ERRORS  # type: ignore[assignment]
 
     @property
     def errors(self) -> list[ErrorCode]:
         """Return the list of accumulated errors."""
-        return self._errors
+        errors = self._errors
+        if errors.__class__ is tuple:
+            errors = self._errors = list(errors)
+        return errors
 
     @property
     def is_valid(self) -> bool:
@@ -42,11 +69,188 @@ class ReturnValueWithStatus(Generic[T]):
             keep_current_status: When True, ``is_valid`` is left unchanged.
                 When False (default), ``is_valid`` is set to False.
         """
-        self._errors.append(error)
+        errors = self._errors
+        if errors is _NO_ERRORS:
+            self._errors = [error]
+        elif errors.__class__ is tuple:
+            self._errors = [*errors, error]
+        else:
+            errors.append(error)
 
         if not keep_current_status:
             self._is_valid = False
 
+        if _count_error is not None:
+            _count_error(error.code)
+        if _emit_error is not None:
+            _emit_error(error)
+
+    def aggregate_errors(
+        self, aggregator: Optional[ErrorAggregator] = None
+    ) -> ErrorAggregator:
+        """Collect the errors of this return value in an ErrorAggregator.
+
+        Errors added so far are moved to the aggregator. Afterwards ``errors``
+        holds one error per code and the aggregator keeps the counts and a
+        sample of the error data, see ``errors.aggregator``.
+
+        Args:
+            aggregator: The aggregator to use, a new ErrorAggregator with the
+                default limits when not provided.
+
+        Returns:
+            The aggregator now holding the errors.
+        """
+        if aggregator is None:
+            aggregator = ErrorAggregator()
+        if self._errors is not aggregator:
+            aggregator.extend(self._errors)
+            self._errors = aggregator  # type: ignore[assignment]
+        return aggregator
+
+    def map(self, function: Callable[[T], U]) -> "ReturnValueWithStatus[U]":
+        """Return a valid return value with the result of *function*.
+
+        *function* is called with the result of this return value and is not
+        called at all if this return value is invalid, which is returned
+        instead. The errors of this return value are shared, not copied.
+        """
+        if not self._is_valid:
+            return self  # type: ignore[return-value]
+        return ReturnValueWithStatus(
+            function(self.result),  # type: ignore[arg-type]
+            True,
+            self._shared_errors(),
+        )
+
+    def and_then(
+        self, function: Callable[[T], "ReturnValueWithStatus[U]"]
+    ) -> "ReturnValueWithStatus[U]":
+        """Return the return value of *function* called with the result.
+
+        *function* is not called if this return value is invalid, which is
+        returned instead. The errors of this return value come before the
+        errors of the returned value. When this return value has no errors,
+        the return value of *function* is returned as is.
+        """
+        if not self._is_valid:
+            return self  # type: ignore[return-value]
+        return_value = function(self.result)  # type: ignore[arg-type]
+        if not self._errors:
+            return return_value
+        if return_value._errors:
+            errors = _concat_errors(
+                [self._shared_errors(), return_value._shared_errors()]
+            )
+        else:
+            errors = self._shared_errors()
+        return ReturnValueWithStatus(
+            return_value.result, return_value._is_valid, errors
+        )
+
+    @staticmethod
+    def collect(
+        return_values: Iterable["ReturnValueWithStatus[T]"],
+    ) -> "ReturnValueWithStatus[List[T]]":
+        """Combine *return_values* into a return value of a list of results.
+
+        Iterates until the first invalid return value, which results in an
+        invalid return value without result. The errors of the combined
+        return values are kept in order.
+        """
+        results: List[T] = []
+        error_storages = []
+        for return_value in return_values:
+            if return_value._errors:
+                error_storages.append(return_value._shared_errors())
+            if not return_value._is_valid:
+                return ReturnValueWithStatus(
+                    None, False, _concat_errors(error_storages)
+                )
+            results.append(return_value.result)  # type: ignore[arg-type]
+        return ReturnValueWithStatus(results, True, _concat_errors(error_storages))
+
+    def merge(self, *others: "ReturnValueWithStatus") -> "ReturnValueWithStatus[T]":
+        """Return the result of this return value with the errors of all.
+
+        The merged value is valid only if this one and all *others* are
+        valid. The results of *others* are ignored.
+        """
+        is_valid = self._is_valid
+        error_storages = [self._shared_errors()] if self._errors else []
+        for other in others:
+            is_valid = is_valid and other._is_valid
+            if other._errors:
+                error_storages.append(other._shared_errors())
+        return ReturnValueWithStatus(
+            self.result, is_valid, _concat_errors(error_storages)
+        )
+
+    def _shared_errors(self) -> Any:
+        """Return the error storage for sharing it with another return value.
+
+        A list is replaced by a tuple first, which ``add_error()`` and
+        ``errors`` copy before changing it, so errors added to one of the
+        return values later are not seen by the others. An ErrorAggregator
+        cannot be copied on write, a copy of it is returned.
+        """
+        errors = self._errors
+        if errors.__class__ is list:
+            errors = self._errors = tuple(errors)  # type: ignore[assignment]
+        elif isinstance(errors, ErrorAggregator):
+            return errors.copy()
+        return errors
+
+    def __reduce__(self):
+        # positional arguments instead of the dataclass state list, and
+        # without errors so unpickled successful values share _NO_ERRORS
+        if self._errors is _NO_ERRORS:
+            return (self.__class__, (self.result, self._is_valid))
+        return (self.__class__, (self.result, self._is_valid, self._errors))
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            self.result == other.result  # type: ignore[attr-defined]
+            and self._is_valid == other._is_valid  # type: ignore[attr-defined]
+            and list(self._errors) == list(other._errors)  # type: ignore[attr-defined]
+        )
+
+
+def _concat_errors(error_storages: list) -> Any:
+    """Return error storage holding the errors of all *error_storages*.
+
+    Shares the storage if there is only one, so only combining the errors of
+    several return values allocates. When one of them is an ErrorAggregator,
+    the errors are combined in an aggregator, which keeps the counts and
+    samples. The aggregators must be copies returned by ``_shared_errors()``
+    as the first one is changed.
+    """
+    if not error_storages:
+        return _NO_ERRORS
+    if len(error_storages) == 1:
+        return error_storages[0]
+    aggregators = [
+        storage for storage in error_storages if isinstance(storage, ErrorAggregator)
+    ]
+    if not aggregators:
+        return tuple(chain.from_iterable(error_storages))
+    first = error_storages[0]
+    if first is aggregators[0]:
+        aggregator = first
+    else:
+        aggregator = ErrorAggregator(
+            aggregators[0].max_codes, aggregators[0].sample_size
+        )
+        aggregator.extend(first)
+    for storage in error_storages[1:]:
+        if isinstance(storage, ErrorAggregator):
+            aggregator.merge(storage)
+        else:
+            aggregator.extend(storage)
+    return aggregator
+
 
 class ReturnValueWithErrorStatus(ReturnValueWithStatus[T]):
     """Factory for creating a ReturnValueWithStatus pre-populated with an error.
@@ -63,6 +267,50 @@ class ReturnValueWithErrorStatus(ReturnValueWithStatus[T]):
     def __new__(cls, error: ErrorCode):
         if not isinstance(error, ErrorCode):
             raise TypeError(st.EXC_ERROR_NOT_OF_ERROR_CODE_TYPE)
-        return_value = ReturnValueWithStatus[T]()
-        return_value.add_error(error)
-        return return_value
+        if _count_error is not None:
+            _count_error(error.code)
+        if _emit_error is not None:
+            _emit_error(error)
+        return ReturnValueWithStatus(_is_valid=False, _errors=[error])
+
+
+@dataclass
+class ErrorLookupResult:
+    """Result of resolving many error code strings at once.
+
+    Attributes:
+        found: Dict mapping each resolved code string to its registered ErrorCode.
+        missing: Code strings that are not registered, in order of first
+            appearance and without duplicates.
+    """
+
+    found: dict[str, ErrorCode] = field(default_factory=dict)
+    missing: list[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class RegistrationConflict:
+    """A code or attribute name claimed by two different errors.
+
+    Attributes:
+        kind: ``"code"`` if two different errors use the same code string,
+            ``"attribute"`` if an attribute name is used for two different
+            errors or would shadow another registry attribute.
+        name: The conflicting code string or attribute name.
+        error: The error that could not be registered.
+        source: The enumerator or class *error* was taken from.
+        existing: The registered or earlier error (or other attribute value)
+            that *error* conflicts with.
+    """
+
+    kind: str
+    name: str
+    error: ErrorCode
+    source: type
+    existing: object
+
+    def __str__(self) -> str:
+        return (
+            f"{self.kind} {self.name!r} of {self.source.__qualname__} "
+            f"conflicts with {self.existing!r}"
+        )
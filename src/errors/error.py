@@ -1,19 +1,113 @@
 """Module defining the ListErrors singleton registry for global error lookup."""
 
-from typing import Dict, Type
+import sys
+import threading
+from bisect import insort
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
-from errors.base import ErrorCode, ErrorsClassErrors, FunctionalErrorsBaseClass
+from errors import base
+from errors.base import (
+    ErrorCode,
+    ErrorsClassErrors,
+    FunctionalErrorsBaseClass,
+    _assign_error_ids,
+    _error_ids_from_export,
+    _errors_with_prefix,
+    _merge_sorted_codes,
+)
+from errors.data_classes import ErrorLookupResult, RegistrationConflict
 
+if TYPE_CHECKING:  # pragma: no cover
+    from errors.snapshot import RegistrySnapshot
 
-class ListErrors:
+# marks attribute names that are not defined on the registry
+_MISSING = object()
+
+# replaces the index lookup of error_description(), set by
+# errors.instrumentation.enable()
+_instrumented_lookup: Optional[Callable[[type, str], Optional[ErrorCode]]] = None
+
+
+class RegistrationConflictError(ValueError):
+    """Raised by ``ListErrors.register_many()`` when errors conflict.
+
+    Attributes:
+        conflicts: The RegistrationConflict found, in order of the sources.
+    """
+
+    def __init__(self, conflicts: List[RegistrationConflict]) -> None:
+        self.conflicts = conflicts
+        lines = "\n".join(f"  {conflict}" for conflict in conflicts)
+        super().__init__(f"{len(conflicts)} conflicting error(s):\n{lines}")
+
+
+class _ListErrorsType(type):
+    """Metaclass registering the built-in errors on the first unknown attribute."""
+
+    def __getattr__(cls, name: str) -> Any:
+        if name.startswith("__") or not _register_builtin_errors():
+            raise AttributeError(
+                f"type object {cls.__name__!r} has no attribute {name!r}"
+            )
+        return getattr(cls, name)
+
+
+class ListErrors(metaclass=_ListErrorsType):
     """Singleton registry for registering and retrieving error codes.
 
     Error enumerators register themselves here on import, enabling
     global ``error_description()`` and ``error_object()`` lookups by
     code string.
+
+    The built-in errors of this package (``ErrorsClassErrors``) are
+    registered on first use of the registry rather than on import.
+
+    Every registered code gets a dense integer ID (0, 1, 2, ...) in
+    registration order, the built-in errors first. Use
+    ``export_error_ids()`` and ``import_error_ids()`` to use the same IDs
+    in processes registering the errors in a different order.
+
+    The registry is safe to use from multiple threads. Registrations of
+    several errors build a new index and publish it in a single assignment
+    (copy-on-write), a single error is inserted into the index, which is a
+    single step as well. Lookups never take a lock and never see a partially
+    applied registration.
     """
 
-    _errors: Dict[str, str] = {}
+    # published index, replaced as a whole when several errors are registered,
+    # single errors are inserted, so copy it with dict() before iterating
+    _errors: Dict[str, ErrorCode] = {}
+    # code -> dense ID, in ID order, and the errors by ID (None if the code
+    # of an imported ID is not registered). IDs only grow, new IDs are
+    # appended, the tables are only replaced as a whole on import
+    _error_ids: Dict[str, int] = {}
+    _errors_by_id: List[Optional[ErrorCode]] = []
+    # registered codes in sorted order for prefix queries, published after
+    # _errors so every code in it can be found in the index. A single new
+    # code is inserted, several new codes publish a new list
+    _sorted_codes: List[str] = []
+    # serializes writers, readers never take it
+    _write_lock = threading.RLock()
+    _builtins_registered = False
+    # enumerators and classes the errors were registered from, in
+    # registration order
+    _enumerators: Tuple[type, ...] = ()
+    # modules that called register_error(), in registration order
+    _source_modules: Tuple[str, ...] = ()
+    # precompiled snapshot consulted for codes missing from the index
+    _snapshot: Optional["RegistrySnapshot"] = None
 
     def __new__(cls):
         """Return the class itself, enforcing singleton behaviour."""
@@ -27,13 +121,16 @@ class ListErrors:
             error_key: Attribute name under which the error is stored.
             error: The ErrorCode instance to register.
 
+        The module calling this method is recorded as source of the error,
+        so snapshots compiled with ``errors.snapshot`` become stale when it
+        changes.
+
         Raises:
             ValueError: If *error* is not an ErrorCode instance.
         """
-        if not isinstance(error, ErrorCode):
-            raise ValueError("provided error is not of type ErrorCode")
-        cls._errors.update({error.code: error.description})
-        setattr(cls, error_key, error)
+        module = sys._getframe(1).f_globals.get("__name__")
+        _register_builtin_errors()
+        cls._publish({error_key: error}, modules=(module,) if module else ())
 
     @classmethod
     def register_errors(cls, errors: Type[FunctionalErrorsBaseClass]) -> None:
@@ -48,9 +145,301 @@ class ListErrors:
         """
         if not issubclass(errors, FunctionalErrorsBaseClass):
             raise ValueError("provide errors are not of type FunctionalErrorsBaseClass")
-        for error_key in errors.keys():
-            error = errors[error_key].value
-            cls.register_error(error_key=error_key, error=error)
+        _register_builtin_errors()
+        cls._publish(
+            dict(zip(errors.keys(), errors.values(), strict=True)),
+            enumerators=(errors,),
+        )
+
+    @classmethod
+    def register_many(
+        cls, sources: Iterable[type], strict: bool = True
+    ) -> List[RegistrationConflict]:
+        """Register the errors of many enumerators or classes in one step.
+
+        *sources* may contain FunctionalErrorsBaseClass enumerators and plain
+        classes with ErrorCode class attributes, such as the classes mixed
+        into an ``ErrorListByMixin`` class (or that class itself). All
+        sources are validated in a single pass before anything is published,
+        and the registry index is rebuilt only once.
+
+        Unlike ``register_errors()``, which replaces registered errors, a
+        conflict is reported when:
+
+        - two different errors use the same code,
+        - an attribute name is used for two different errors, or would
+          shadow another attribute of the registry.
+
+        Registering the same error again, under any name, is not a conflict.
+
+        Args:
+            sources: Enumerators and classes to take the errors from.
+            strict: When True (default), raise if there are conflicts and
+                register nothing. When False, register all errors that do
+                not conflict and return the conflicts.
+
+        Returns:
+            The conflicts that were skipped, empty if there are none.
+
+        Raises:
+            RegistrationConflictError: If *strict* and errors conflict.
+            ValueError: If a source is not a class.
+        """
+        sources = tuple(sources)
+        errors_by_source = [_errors_of_source(source) for source in sources]
+        _register_builtin_errors()
+        with cls._write_lock:
+            index = cls._errors
+            errors_by_key: Dict[str, ErrorCode] = {}
+            errors_by_code: Dict[str, ErrorCode] = {}
+            conflicts: List[RegistrationConflict] = []
+            for source, source_errors in zip(sources, errors_by_source, strict=True):
+                for error_key, error in source_errors.items():
+                    conflict = cls._find_conflict(
+                        errors_by_key, errors_by_code, index, error_key, error
+                    )
+                    if conflict is not None:
+                        kind, name, existing = conflict
+                        conflicts.append(
+                            RegistrationConflict(kind, name, error, source, existing)
+                        )
+                        continue
+                    errors_by_key[error_key] = error
+                    errors_by_code[error.code] = error
+
+            if conflicts and strict:
+                raise RegistrationConflictError(conflicts)
+            cls._publish(errors_by_key, enumerators=sources)
+        return conflicts
+
+    @classmethod
+    def _find_conflict(
+        cls,
+        errors_by_key: Mapping[str, ErrorCode],
+        errors_by_code: Mapping[str, ErrorCode],
+        index: Mapping[str, ErrorCode],
+        error_key: str,
+        error: ErrorCode,
+    ) -> Optional[Tuple[str, str, object]]:
+        """Return (kind, name, existing) if *error* conflicts, else None.
+
+        Checks the errors accepted so far in this batch first and the
+        registry after, each with a constant number of dict lookups.
+        """
+        existing: object = errors_by_key.get(error_key, _MISSING)
+        if existing is _MISSING:
+            existing = _class_attribute(cls, error_key)
+        if existing is not _MISSING and existing != error:
+            return "attribute", error_key, existing
+
+        existing = errors_by_code.get(error.code) or index.get(error.code)
+        if existing is not None and existing != error:
+            return "code", error.code, existing
+        return None
+
+    @classmethod
+    def attach_snapshot(cls, snapshot: Optional["RegistrySnapshot"]) -> None:
+        """Use *snapshot* for codes that are not registered (yet).
+
+        See ``errors.snapshot`` for creating and loading snapshots. Pass
+        None to detach the current snapshot. A snapshot that is replaced or
+        detached is closed, so do not replace a snapshot while other threads
+        resolve codes with it.
+        """
+        previous = cls._snapshot
+        cls._snapshot = snapshot
+        if previous is not None and previous is not snapshot:
+            previous.close()
+
+    @classmethod
+    def _publish(
+        cls,
+        errors_by_key: Mapping[str, ErrorCode],
+        enumerators: Iterable[type] = (),
+        modules: Iterable[str] = (),
+    ) -> None:
+        """Add *errors_by_key* to the registry in a single step.
+
+        All errors are validated before anything is changed. The class
+        attributes are set before the new index is published, so an error
+        found in the index is always accessible as attribute as well. A
+        single error is inserted into the published index instead of copying
+        it, which would make registering errors one by one quadratic.
+
+        Raises:
+            ValueError: If any of the errors is not an ErrorCode instance.
+        """
+        for error in errors_by_key.values():
+            if not isinstance(error, ErrorCode):
+                raise ValueError("provided error is not of type ErrorCode")
+
+        with cls._write_lock:
+            for error_key, error in errors_by_key.items():
+                setattr(cls, error_key, error)
+            # before the index, so every code found in it has an ID
+            cls._publish_error_ids(errors_by_key.values())
+            previous_index = cls._errors
+            new_codes = [
+                error_code
+                for error_code in dict.fromkeys(
+                    error.code for error in errors_by_key.values()
+                )
+                if error_code not in previous_index
+            ]
+            if len(errors_by_key) == 1 and "_errors" in cls.__dict__:
+                # readers see a single insert as a whole as well, the index
+                # of a parent class is copied
+                index = cls._errors
+            else:
+                index = dict(cls._errors)
+            for error in errors_by_key.values():
+                index[error.code] = error
+            new_enumerators = tuple(
+                enumerator
+                for enumerator in dict.fromkeys(enumerators)
+                if enumerator not in cls._enumerators
+            )
+            if new_enumerators:
+                cls._enumerators = cls._enumerators + new_enumerators
+            new_modules = tuple(
+                module
+                for module in dict.fromkeys(modules)
+                if module not in cls._source_modules
+            )
+            if new_modules:
+                cls._source_modules = cls._source_modules + new_modules
+            cls._errors = index
+            if len(new_codes) == 1 and "_sorted_codes" in cls.__dict__:
+                insort(cls._sorted_codes, new_codes[0])
+            elif new_codes:
+                cls._sorted_codes = _merge_sorted_codes(cls._sorted_codes, new_codes)
+
+    @classmethod
+    def _publish_error_ids(cls, errors: Iterable[ErrorCode]) -> None:
+        """Assign IDs to the codes of *errors* without one and publish them.
+
+        The new IDs are appended to the ID tables, so only the new codes
+        cost time. The error is published before its ID, so an ID read from
+        ``_error_ids`` can always be looked up. Call with the write lock held.
+        """
+        if "_error_ids" not in cls.__dict__ or "_errors_by_id" not in cls.__dict__:
+            # the tables of a parent class are copied, not changed
+            cls._errors_by_id = list(cls._errors_by_id)
+            cls._error_ids = dict(cls._error_ids)
+        error_ids = cls._error_ids
+        errors_by_id = cls._errors_by_id
+        for error in errors:
+            error_id = error_ids.get(error.code)
+            if error_id is None:
+                errors_by_id.append(error)
+                error_ids[error.code] = len(errors_by_id) - 1
+            else:
+                errors_by_id[error_id] = error
+
+    @classmethod
+    def errors_with_prefix(cls, prefix: str) -> List[ErrorCode]:
+        """Return the registered errors whose code starts with *prefix*.
+
+        Uses a sorted index of the codes, so the time is proportional to the
+        number of matches rather than the number of registered errors.
+
+        Args:
+            prefix: Start of the codes, for example ``"ER_API404_"``.
+
+        Returns:
+            The matching ErrorCode instances ordered by code.
+        """
+        _register_builtin_errors()
+        sorted_codes = cls._sorted_codes
+        return _errors_with_prefix(sorted_codes, cls._errors, prefix)
+
+    @classmethod
+    def errors_in_namespace(
+        cls, namespace: str, separator: str = "_"
+    ) -> List[ErrorCode]:
+        """Return the registered errors in *namespace*, ordered by code.
+
+        ``errors_in_namespace("ER_API404")`` returns the errors with codes
+        starting with ``"ER_API404_"``, but not those of ``"ER_API4040"``.
+        """
+        return cls.errors_with_prefix(namespace + separator)
+
+    @classmethod
+    def get_error_id(cls, error: Union[str, ErrorCode]) -> Optional[int]:
+        """Return the dense integer ID of a registered error code.
+
+        Args:
+            error: The error code string or an ErrorCode with that code.
+
+        Returns:
+            The ID, or None if the code has no ID.
+        """
+        if isinstance(error, ErrorCode):
+            error = error.code
+        error_id = cls._error_ids.get(error)
+        if error_id is None and _register_builtin_errors():
+            error_id = cls._error_ids.get(error)
+        return error_id
+
+    @classmethod
+    def get_error_by_id(cls, error_id: int) -> Optional[ErrorCode]:
+        """Return the registered ErrorCode with ID *error_id*.
+
+        Returns:
+            The ErrorCode, or None if no registered error has that ID.
+        """
+        errors_by_id = cls._errors_by_id
+        if error_id >= len(errors_by_id) and _register_builtin_errors():
+            errors_by_id = cls._errors_by_id
+        if 0 <= error_id < len(errors_by_id):
+            return errors_by_id[error_id]
+        return None
+
+    @classmethod
+    def export_error_ids(cls) -> List[str]:
+        """Return all codes with an ID in ID order, the ID being the position.
+
+        The list can be stored (for example as JSON) and passed to
+        ``import_error_ids()`` in other processes.
+        """
+        _register_builtin_errors()
+        return list(cls._error_ids)
+
+    @classmethod
+    def import_error_ids(cls, error_codes: Iterable[str]) -> None:
+        """Assign the IDs of an export of ``export_error_ids()``.
+
+        The codes of the export get their exported ID, registered codes that
+        are not part of it get the next free IDs. Import the IDs at start-up,
+        before handing out IDs, as the IDs of registered codes can change.
+
+        Raises:
+            ValueError: If a code occurs more than once in *error_codes*.
+        """
+        error_ids = _error_ids_from_export(error_codes)
+        _register_builtin_errors()
+        with cls._write_lock:
+            index = cls._errors
+            error_ids = _assign_error_ids(error_ids, index)
+            # replaced as a whole, the errors by ID first
+            cls._errors_by_id = [index.get(error_code) for error_code in error_ids]
+            cls._error_ids = error_ids
+
+    @classmethod
+    def _fallback_error(cls, error_code: str) -> Optional[ErrorCode]:
+        """Resolve *error_code* after it was not found in the index.
+
+        Registers the built-in errors if that did not happen yet and
+        consults the attached snapshot, if any.
+        """
+        if _register_builtin_errors():
+            error = cls._errors.get(error_code)
+            if error is not None:
+                return error
+        snapshot = cls._snapshot
+        if snapshot is None:
+            return None
+        return snapshot.get(error_code)
 
     @classmethod
     def error_description(cls, error_code: str) -> str:
@@ -65,12 +454,53 @@ class ListErrors:
         Raises:
             KeyError: If *error_code* is not registered.
         """
-        error = cls._errors.get(error_code)
-        if not error:
+        if _instrumented_lookup is None:
+            error = cls._errors.get(error_code) or cls._fallback_error(error_code)
+        else:
+            error = _instrumented_lookup(cls, error_code)
+        if error is None:
             raise KeyError(
                 cls.error_object(ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value)
             )
-        return error
+        return error.description
+
+    @classmethod
+    def get_error(cls, error_code: str) -> Optional[ErrorCode]:
+        """Return the registered ErrorCode for an error code string.
+
+        Args:
+            error_code: The error code string to look up.
+
+        Returns:
+            The registered ErrorCode, or None if *error_code* is not registered.
+        """
+        return cls._errors.get(error_code) or cls._fallback_error(error_code)
+
+    @classmethod
+    def lookup_many(cls, error_codes: Iterable[str]) -> ErrorLookupResult:
+        """Resolve many error code strings in a single pass.
+
+        Unknown codes are reported in the result instead of raising, so a
+        batch with many misses costs no more than a batch without.
+
+        Args:
+            error_codes: Iterable of error code strings, may contain duplicates.
+
+        Returns:
+            ErrorLookupResult with the registered ErrorCode per found code and
+            the unknown codes in order of first appearance.
+        """
+        errors = cls._errors
+        fallback_error = cls._fallback_error
+        found: Dict[str, ErrorCode] = {}
+        missing: Dict[str, None] = {}
+        for error_code in error_codes:
+            error = errors.get(error_code) or fallback_error(error_code)
+            if error is None:
+                missing[error_code] = None
+            else:
+                found[error_code] = error
+        return ErrorLookupResult(found=found, missing=list(missing))
 
     @staticmethod
     def error_object(error_code: ErrorCode) -> dict:
@@ -85,4 +515,59 @@ class ListErrors:
         return {"error": error_code.code, "description": error_code.description}
 
 
-ListErrors.register_errors(ErrorsClassErrors)
+def _errors_of_source(source: type) -> Dict[str, ErrorCode]:
+    """Return the attribute name -> ErrorCode dict of an enumerator or class.
+
+    For classes, attributes of subclasses replace those of base classes with
+    the same name, as with attribute access.
+
+    Raises:
+        ValueError: If *source* is not a class.
+    """
+    if not isinstance(source, type):
+        raise ValueError(f"cannot register errors from {source!r}, not a class")
+    if issubclass(source, FunctionalErrorsBaseClass):
+        return dict(zip(source.keys(), source.values(), strict=True))
+    errors_by_key: Dict[str, ErrorCode] = {}
+    for klass in reversed(source.__mro__):
+        for error_key, value in vars(klass).items():
+            if isinstance(value, ErrorCode):
+                errors_by_key[error_key] = value
+    return errors_by_key
+
+
+def _class_attribute(cls: type, name: str) -> object:
+    """Return the class attribute *name* of *cls*, or _MISSING.
+
+    Unlike ``getattr()`` this does not call the metaclass ``__getattr__``
+    or descriptors, and needs no exception for missing attributes.
+    """
+    for klass in cls.__mro__:
+        namespace = vars(klass)
+        if name in namespace:
+            return namespace[name]
+    return _MISSING
+
+
+def _register_builtin_errors() -> bool:
+    """Register ``ErrorsClassErrors`` with ListErrors unless already done.
+
+    Returns:
+        True if the built-in errors were registered by this call.
+    """
+    if ListErrors._builtins_registered:
+        return False
+    with ListErrors._write_lock:
+        if ListErrors._builtins_registered:
+            return False
+        ListErrors._publish(
+            dict(
+                zip(ErrorsClassErrors.keys(), ErrorsClassErrors.values(), strict=True)
+            ),
+            enumerators=(ErrorsClassErrors,),
+        )
+        ListErrors._builtins_registered = True
+    return True
+
+
+base._list_errors = ListErrors
@@ -0,0 +1,226 @@
+"""Mapping of exception types to ErrorCode instances.
+
+``ExceptionMap`` resolves the ErrorCode of an exception through the MRO of
+its type, the most specific mapped class wins. The result is cached per
+concrete exception type, so after the first exception of a type the
+dispatch costs a single dict lookup, whatever the size of the mapping.
+
+``ExceptionMap.returns_status`` decorates functions, generators and
+coroutine functions so mapped exceptions are returned as invalid
+``ReturnValueWithStatus`` instances instead of being raised::
+
+    exception_map = ExceptionMap(
+        {
+            KeyError: MyErrors.NOT_FOUND.value,
+            ConnectionError: MyErrors.CONNECTIVITY_ERROR.value,
+        }
+    )
+
+    @exception_map.returns_status
+    def load(key: str) -> dict:
+        ...
+
+    load("unknown")  # ReturnValueWithStatus(is_valid=False, errors=[NOT_FOUND])
+
+Exceptions raised with ``errors.exceptions`` are returned with their own
+ErrorCode unless their class is mapped explicitly.
+"""
+
+import functools
+import inspect
+from typing import Any, Callable, Dict, Mapping, Optional, Type
+
+from errors.base import ErrorCode, add_error_data
+from errors.data_classes import ReturnValueWithErrorStatus, ReturnValueWithStatus
+from errors.exceptions import ErrorCodeException
+
+# cache entries of exception types returned with the error of the exception
+_OWN_ERROR = object()
+_MISSING = object()
+
+
+def exception_error_data(exception: BaseException) -> dict:
+    """Return error data describing *exception*."""
+    return {"exception": type(exception).__name__, "message": str(exception)}
+
+
+def _as_return_value(result: Any) -> ReturnValueWithStatus:
+    if isinstance(result, ReturnValueWithStatus):
+        return result
+    return ReturnValueWithStatus(result=result)
+
+
+class ExceptionMap:
+    """Table resolving exception types to ErrorCode instances.
+
+    Attributes:
+        default: ErrorCode for exceptions without mapped class, None to let
+            them propagate.
+        error_data: Callable returning the ``error_data`` added to the
+            ErrorCode for an exception, None to return the ErrorCode as is.
+    """
+
+    def __init__(
+        self,
+        errors: Optional[Mapping[Type[BaseException], ErrorCode]] = None,
+        default: Optional[ErrorCode] = None,
+        error_data: Optional[Callable[[BaseException], dict]] = exception_error_data,
+    ) -> None:
+        """Create a map from *errors*, a dict of exception type -> ErrorCode.
+
+        Raises:
+            ValueError: If a key is not an exception type or a value is not
+                an ErrorCode instance.
+        """
+        self.default = default
+        self.error_data = error_data
+        self._errors: Dict[type, ErrorCode] = {}
+        # concrete exception type -> ErrorCode, _OWN_ERROR or None
+        self._cache: Dict[type, Any] = {}
+        for exception_type, error in (errors or {}).items():
+            self.register(exception_type, error)
+
+    def register(self, exception_type: Type[BaseException], error: ErrorCode) -> None:
+        """Map *exception_type* and its subclasses to *error*.
+
+        Raises:
+            ValueError: If *exception_type* is not an exception type or
+                *error* is not an ErrorCode instance.
+        """
+        if not (
+            isinstance(exception_type, type)
+            and issubclass(exception_type, BaseException)
+        ):
+            raise ValueError(f"{exception_type!r} is not an exception type")
+        if not isinstance(error, ErrorCode):
+            raise ValueError("provided error is not of type ErrorCode")
+        errors = dict(self._errors)
+        errors[exception_type] = error
+        self._errors = errors
+        self._cache = {}
+
+    def error_for(self, exception_type: Type[BaseException]) -> Optional[ErrorCode]:
+        """Return the ErrorCode mapped to *exception_type* or its bases.
+
+        Returns:
+            The ErrorCode of the most specific mapped class in the MRO, the
+            ``error_code`` of an ``ErrorCodeException`` class, the default
+            error, or None.
+        """
+        error = self._cache.get(exception_type, _MISSING)
+        if error is _MISSING:
+            error = self._resolve(exception_type)
+        if error is _OWN_ERROR:
+            return exception_type.error_code  # type: ignore[attr-defined]
+        return error
+
+    def to_return_value(
+        self, exception: BaseException
+    ) -> Optional[ReturnValueWithStatus]:
+        """Return *exception* as invalid return value.
+
+        Returns:
+            ReturnValueWithStatus holding the mapped ErrorCode, with the
+            error data of the exception, or None if *exception* is not
+            mapped and there is no default error.
+        """
+        error = self._cache.get(exception.__class__, _MISSING)
+        if error is _MISSING:
+            error = self._resolve(exception.__class__)
+        if error is None:
+            return None
+        if error is _OWN_ERROR:
+            return ReturnValueWithErrorStatus(exception.error)  # type: ignore[attr-defined]
+        error_data = self.error_data
+        if error_data is not None:
+            error = add_error_data(error, error_data(exception))
+        return ReturnValueWithErrorStatus(error)
+
+    def _resolve(self, exception_type: type) -> Any:
+        """Resolve *exception_type* through its MRO and cache the result."""
+        errors = self._errors
+        error: Any = self.default
+        for klass in exception_type.__mro__:
+            if klass in errors:
+                error = errors[klass]
+                break
+            if klass is ErrorCodeException:
+                error = _OWN_ERROR
+                break
+        self._cache[exception_type] = error
+        return error
+
+    def returns_status(self, function: Callable) -> Callable:
+        """Decorate *function* to return mapped exceptions as return values.
+
+        - Functions and coroutine functions return their result wrapped in
+          a ReturnValueWithStatus, unless it already is one, or the invalid
+          return value of a mapped exception.
+        - Generator and asynchronous generator functions yield every item
+          wrapped the same way. A mapped exception is yielded as invalid
+          return value and ends the iteration. Values sent into the
+          generator are not forwarded.
+
+        Exceptions that are not mapped propagate unchanged, as do
+        exceptions that are not ``Exception`` subclasses, like
+        cancellation.
+        """
+        to_return_value = self.to_return_value
+
+        if inspect.isasyncgenfunction(function):
+
+            @functools.wraps(function)
+            async def async_generator_wrapper(*args: Any, **kwargs: Any) -> Any:
+                try:
+                    async for item in function(*args, **kwargs):
+                        yield _as_return_value(item)
+                except Exception as exception:
+                    return_value = to_return_value(exception)
+                    if return_value is None:
+                        raise
+                    yield return_value
+
+            return async_generator_wrapper
+
+        if inspect.isgeneratorfunction(function):
+
+            @functools.wraps(function)
+            def generator_wrapper(*args: Any, **kwargs: Any) -> Any:
+                try:
+                    for item in function(*args, **kwargs):
+                        yield _as_return_value(item)
+                except Exception as exception:
+                    return_value = to_return_value(exception)
+                    if return_value is None:
+                        raise
+                    yield return_value
+
+            return generator_wrapper
+
+        if inspect.iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def coroutine_wrapper(*args: Any, **kwargs: Any) -> Any:
+                try:
+                    result = await function(*args, **kwargs)
+                except Exception as exception:
+                    return_value = to_return_value(exception)
+                    if return_value is None:
+                        raise
+                    return return_value
+                return _as_return_value(result)
+
+            return coroutine_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                result = function(*args, **kwargs)
+            except Exception as exception:
+                return_value = to_return_value(exception)
+                if return_value is None:
+                    raise
+                return return_value
+            return _as_return_value(result)
+
+        return wrapper
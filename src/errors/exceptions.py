@@ -0,0 +1,192 @@
+"""Bridge between ErrorCode instances and exceptions.
+
+Layers that have to raise instead of returning a ``ReturnValueWithStatus``
+can raise an ``ErrorCode`` as exception. Every error code gets its own
+exception class, created on first use and cached, so callers can catch
+either all error code exceptions or the exception of a single code::
+
+    from errors.exceptions import ErrorCodeException, exception_class, raise_error
+
+    try:
+        raise_error(add_error_data(MyErrors.NOT_FOUND.value, {"id": 42}))
+    except exception_class(MyErrors.NOT_FOUND.value) as exc:
+        return ReturnValueWithErrorStatus(exc.error)
+    except ErrorCodeException as exc:
+        ...
+
+``error_from_exception()`` converts any exception back to its ErrorCode.
+
+Fast mode
+---------
+``raise_error(error, fast=True)`` is meant for exceptions used for control
+flow on hot paths. For errors without ``error_data`` it raises a single,
+preallocated instance of the exception class instead of creating one, and
+it clears the traceback, context and notes left by the previous raise.
+CPython always records the frames an exception passes while unwinding, so
+the traceback of a fast exception only covers the frames up to the handler
+and is discarded on the next raise.
+
+When a fast exception is raised while another exception is being handled,
+Python sets that exception as its ``__context__`` (hidden from tracebacks
+through ``__suppress_context__``). It stays referenced, together with its
+traceback and frames, until the next fast raise of the same code. Fast
+exceptions are shared between all callers, so do not store them or rely on
+their traceback, context or notes, use their ``error`` instead.
+"""
+
+import threading
+from typing import Dict, NoReturn, Optional, Type, Union
+
+from errors.base import ErrorCode
+from errors.error import ListErrors
+
+
+class ErrorCodeException(Exception):
+    """Base class of the exceptions raised for ErrorCode instances.
+
+    Use ``exception_class()`` to get the subclass for a specific code.
+
+    Attributes:
+        error_code: The ErrorCode the exception class was created for.
+        error: The ErrorCode occurrence of this exception, which may carry
+            ``error_data``.
+    """
+
+    error_code: Optional[ErrorCode] = None
+    # preallocated instance raised by raise_error(..., fast=True)
+    _fast_instance: Optional["ErrorCodeException"] = None
+
+    def __init__(self, error: Optional[ErrorCode] = None) -> None:
+        """Create the exception for *error*, by default the class error_code.
+
+        Raises:
+            ValueError: If *error* has another code than the exception class,
+                or no error is given for ``ErrorCodeException`` itself.
+        """
+        error_code = self.error_code
+        if error is None:
+            if error_code is None:
+                raise ValueError("an error is required for ErrorCodeException")
+            error = error_code
+        elif error_code is not None and error.code != error_code.code:
+            raise ValueError(
+                f"error {error.code!r} does not match exception of {error_code.code!r}"
+            )
+        super().__init__(error.code, error.description)
+        self.error = error
+
+    def __str__(self) -> str:
+        error = self.error
+        if error.error_data:
+            return f"{error.code}: {error.description} {dict(error.error_data)!r}"
+        return f"{error.code}: {error.description}"
+
+    def __reduce__(self):
+        return (_exception_for, (self.error,))
+
+
+# code -> exception class, replaced as a whole like the ListErrors index
+_exception_classes: Dict[str, Type[ErrorCodeException]] = {}
+_exception_classes_lock = threading.Lock()
+
+
+def _class_name(error_code: str) -> str:
+    """Return a valid class name for the exception of *error_code*."""
+    name = "".join(char if char.isalnum() else "_" for char in error_code)
+    if not name or name[0].isdigit():
+        name = "_" + name
+    return name + "Error"
+
+
+def exception_class(error: Union[str, ErrorCode]) -> Type[ErrorCodeException]:
+    """Return the exception class of an error code, creating it on first use.
+
+    The class is created once per code and cached, so every call for the
+    same code returns the same class. Its ``error_code`` is the error
+    registered with ``ListErrors`` for the code if there is one, else
+    *error* itself.
+
+    Args:
+        error: An ErrorCode, or the code string of a registered error.
+
+    Raises:
+        KeyError: If *error* is a code string that is not registered.
+    """
+    global _exception_classes
+
+    error_code = error.code if isinstance(error, ErrorCode) else error
+    exception = _exception_classes.get(error_code)
+    if exception is not None:
+        return exception
+
+    registered = ListErrors.get_error(error_code)
+    if registered is None:
+        if not isinstance(error, ErrorCode):
+            raise KeyError(f"error code {error_code!r} is not registered")
+        registered = error
+
+    with _exception_classes_lock:
+        exception = _exception_classes.get(error_code)
+        if exception is None:
+            name = _class_name(error_code)
+            exception = type(
+                name,
+                (ErrorCodeException,),
+                {
+                    "__module__": __name__,
+                    "__qualname__": name,
+                    "__doc__": registered.description,
+                    "error_code": registered,
+                },
+            )
+            exception._fast_instance = exception()
+            exception_classes = dict(_exception_classes)
+            exception_classes[error_code] = exception
+            _exception_classes = exception_classes
+    return exception
+
+
+def to_exception(error: ErrorCode) -> ErrorCodeException:
+    """Return an exception for *error*, an instance of its exception class."""
+    return exception_class(error)(error)
+
+
+def raise_error(error: ErrorCode, fast: bool = False) -> NoReturn:
+    """Raise *error* as instance of its exception class.
+
+    Args:
+        error: The ErrorCode to raise, it can carry ``error_data``.
+        fast: When True, raise the preallocated instance of the exception
+            class if *error* is its ``error_code`` (has no ``error_data``),
+            dropping the traceback, context and notes of earlier raises.
+            See the module documentation.
+
+    Raises:
+        ErrorCodeException: Always, the subclass for the code of *error*.
+    """
+    exception = _exception_classes.get(error.code) or exception_class(error)
+    if fast and (error is exception.error_code or error == exception.error_code):
+        instance = exception._fast_instance
+        # notes added by handlers of earlier raises, and the exception handled
+        # during the previous raise, must not accumulate on the shared instance
+        instance.__dict__.pop("__notes__", None)
+        instance.__context__ = None  # type: ignore[union-attr]
+        raise instance.with_traceback(None) from None  # type: ignore[union-attr]
+    raise exception(error)
+
+
+def error_from_exception(exception: BaseException) -> Optional[ErrorCode]:
+    """Return the ErrorCode of an exception raised for an ErrorCode.
+
+    Returns:
+        The ErrorCode occurrence of *exception*, or None if *exception* is
+        not an ``ErrorCodeException``.
+    """
+    if isinstance(exception, ErrorCodeException):
+        return exception.error
+    return None
+
+
+def _exception_for(error: ErrorCode) -> ErrorCodeException:
+    """Return the exception of *error*, used to unpickle exceptions."""
+    return to_exception(error)
@@ -0,0 +1,197 @@
+"""Opt-in instrumentation of registry lookups.
+
+When enabled, the following is recorded per registry class, that is per
+``ListErrors`` (sub)class and per ``ErrorListByMixin`` subclass:
+
+- ``error_description()`` calls -- hits found in the index of the class,
+  misses that had to fall back to the slow path (the built-in errors and
+  the attached snapshot of ``ListErrors``, the negative cache of
+  ``ErrorListByMixin``) and, of those, the codes that were not found at all.
+- A histogram of the ``error_description()`` lookup latency, with the
+  bucket bounds of ``settings.INSTRUMENTATION_LATENCY_BUCKETS``.
+- ``ErrorListByMixin._regenerate_errors_list()`` runs and their duration.
+
+Like ``errors.metrics`` every thread records in its own shard (see
+``errors._shards``), which are merged when a snapshot is taken, and the shards of finished threads are
+folded into the totals. Registry classes are referenced weakly, the stats
+of a collected class are kept by its name. When disabled (the default) the
+hooks cost a single ``is None`` check.
+
+Example::
+
+    from errors import instrumentation
+
+    instrumentation.enable()
+    ...
+    snapshot = instrumentation.snapshot(reset=True)
+    for registry, stats in snapshot.registries.items():
+        gauge("error_lookups", stats.lookups, tags=[f"registry:{registry}"])
+        gauge("error_lookup_misses", stats.misses, tags=[f"registry:{registry}"])
+"""
+
+import weakref
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Dict, Optional, Tuple
+
+import errors.settings as st
+from errors import error, mixin
+from errors._shards import ShardedTables
+from errors.base import ErrorCode
+
+LATENCY_BUCKETS: Tuple[float, ...] = tuple(st.INSTRUMENTATION_LATENCY_BUCKETS)
+
+# positions in the stats lists of the shards, followed by the buckets
+_HITS = 0
+_MISSES = 1
+_NOT_FOUND = 2
+_LOOKUP_SECONDS = 3
+_REGENERATIONS = 4
+_REGENERATION_SECONDS = 5
+_BUCKETS = 6
+
+
+@dataclass(frozen=True)
+class RegistryStats:
+    """Lookups and index rebuilds of a registry class since the last reset.
+
+    Attributes:
+        hits: ``error_description()`` calls finding the code in the index.
+        misses: ``error_description()`` calls not finding the code in the
+            index, including the calls counted in *not_found*.
+        not_found: ``error_description()`` calls raising ``KeyError``.
+        lookup_seconds: Total time spent in ``error_description()`` lookups.
+        regenerations: Number of ``_regenerate_errors_list()`` runs.
+        regeneration_seconds: Total time spent in these runs.
+        latency_buckets: Number of lookups per latency bucket, the lookups
+            of bucket *i* took at most ``LATENCY_BUCKETS[i]`` seconds (and
+            more than the previous bound), the last bucket counts slower
+            lookups.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    not_found: int = 0
+    lookup_seconds: float = 0.0
+    regenerations: int = 0
+    regeneration_seconds: float = 0.0
+    latency_buckets: Tuple[int, ...] = (0,) * (len(LATENCY_BUCKETS) + 1)
+
+    @property
+    def lookups(self) -> int:
+        """Return the number of ``error_description()`` calls."""
+        return self.hits + self.misses
+
+
+@dataclass(frozen=True)
+class InstrumentationSnapshot:
+    """Stats per registry class, by ``module.qualified_name`` of the class.
+
+    Registry classes without lookups or index rebuilds since the last reset
+    are left out.
+    """
+
+    registries: Dict[str, RegistryStats] = field(default_factory=dict)
+
+
+# the stats of the shards, by weak reference to the registry class, so
+# dynamically created ErrorListByMixin subclasses are not kept alive
+_tables = ShardedTables(1)
+_local = _tables.local
+
+
+def _registry_stats(registry: type) -> list:
+    """Return the stats list of *registry* in the shard of the thread."""
+    try:
+        shard = _local.shard
+    except AttributeError:
+        shard = _tables.thread_shard()
+    # without a callback the reference of the class is reused, not created
+    key = weakref.ref(registry)
+    stats = shard.tables[0]
+    registry_stats = stats.get(key)
+    if registry_stats is None:
+        # the name first, the snapshot copies the stats before the names
+        shard.names[key] = f"{registry.__module__}.{registry.__qualname__}"
+        registry_stats = stats[key] = [0, 0, 0, 0.0, 0, 0.0] + [0] * (
+            len(LATENCY_BUCKETS) + 1
+        )
+    return registry_stats
+
+
+def _lookup(registry: type, error_code: str) -> Optional[ErrorCode]:
+    """Resolve *error_code* like ``error_description()`` and record it."""
+    start = perf_counter()
+    found = registry._errors.get(error_code)  # type: ignore[attr-defined]
+    hit = found is not None
+    if not hit:
+        found = registry.get_error(error_code)  # type: ignore[attr-defined]
+    elapsed = perf_counter() - start
+
+    stats = _registry_stats(registry)
+    if hit:
+        stats[_HITS] += 1
+    else:
+        stats[_MISSES] += 1
+        if found is None:
+            stats[_NOT_FOUND] += 1
+    stats[_LOOKUP_SECONDS] += elapsed
+    stats[_BUCKETS + bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+    return found
+
+
+def _record_regeneration(registry: type, seconds: float) -> None:
+    stats = _registry_stats(registry)
+    stats[_REGENERATIONS] += 1
+    stats[_REGENERATION_SECONDS] += seconds
+
+
+def enable() -> None:
+    """Start recording registry lookups and index rebuilds."""
+    error._instrumented_lookup = _lookup
+    mixin._instrumented_lookup = _lookup
+    mixin._record_regeneration = _record_regeneration
+
+
+def disable() -> None:
+    """Stop recording, the stats recorded so far are kept."""
+    error._instrumented_lookup = None
+    mixin._instrumented_lookup = None
+    mixin._record_regeneration = None
+
+
+def is_enabled() -> bool:
+    """Return whether registry lookups are recorded."""
+    return error._instrumented_lookup is not None
+
+
+def snapshot(reset: bool = False) -> InstrumentationSnapshot:
+    """Return the stats of all threads merged per registry class.
+
+    Args:
+        reset: When True, the stats are reset after taking the snapshot.
+            Lookups recorded by other threads while the snapshot is taken
+            are either included or recorded towards the next snapshot.
+    """
+    (totals,) = _tables.snapshot(reset)
+    return InstrumentationSnapshot(
+        {
+            name: RegistryStats(
+                hits=total[_HITS],
+                misses=total[_MISSES],
+                not_found=total[_NOT_FOUND],
+                lookup_seconds=total[_LOOKUP_SECONDS],
+                regenerations=total[_REGENERATIONS],
+                regeneration_seconds=total[_REGENERATION_SECONDS],
+                latency_buckets=tuple(total[_BUCKETS:]),
+            )
+            for name, total in totals.items()
+            if total[_HITS] or total[_MISSES] or total[_REGENERATIONS]
+        }
+    )
+
+
+def reset() -> None:
+    """Reset the stats of all threads."""
+    snapshot(reset=True)
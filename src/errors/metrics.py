@@ -0,0 +1,117 @@
+"""Opt-in counters of error occurrences per error code.
+
+When enabled, the following calls count the code of their error:
+
+- ``ReturnValueWithStatus.add_error`` and ``ReturnValueWithErrorStatus`` --
+  counted in ``MetricsSnapshot.errors``.
+- ``add_error_data`` -- counted in ``MetricsSnapshot.error_data``.
+
+The counts are kept separately, as an error created with ``add_error_data()``
+and then added to a return value would otherwise be counted twice.
+
+Every thread counts in its own shard (see ``errors._shards``), so counting
+never takes a lock. The shards are merged when a snapshot is taken. The
+counts of threads that have finished are then kept in a single retired
+count and their shards are dropped, so short-lived threads do not
+accumulate shards. When disabled (the default) the hooks cost a single ``is not None`` check.
+
+Example::
+
+    from errors import metrics
+
+    metrics.enable()
+    ...
+    snapshot = metrics.snapshot(reset=True)
+    for code, count in snapshot.errors.items():
+        statsd.increment("errors", count, tags=[f"code:{code}"])
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+from errors import base, data_classes
+from errors._shards import Shard, ShardedTables
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """Error occurrences per error code counted since the last reset.
+
+    Attributes:
+        errors: Errors added to return values with ``add_error()`` or
+            ``ReturnValueWithErrorStatus``.
+        error_data: Errors created with ``add_error_data()``.
+    """
+
+    errors: Counter = field(default_factory=Counter)
+    error_data: Counter = field(default_factory=Counter)
+
+
+# tables of the shards, code -> count
+_ERRORS = 0
+_ERROR_DATA = 1
+
+_tables = ShardedTables(2)
+_local = _tables.local
+
+
+def _thread_shard() -> Shard:
+    """Create the shard of the current thread on its first counted error."""
+    shard = _tables.thread_shard()
+    # the counters are stored on the thread local directly, saving a lookup
+    _local.errors = shard.tables[_ERRORS]
+    _local.error_data = shard.tables[_ERROR_DATA]
+    return shard
+
+
+def _count_error(code: str) -> None:
+    try:
+        counts = _local.errors
+    except AttributeError:
+        counts = _thread_shard().tables[_ERRORS]
+    counts[code] = counts.get(code, 0) + 1
+
+
+def _count_error_data(code: str) -> None:
+    try:
+        counts = _local.error_data
+    except AttributeError:
+        counts = _thread_shard().tables[_ERROR_DATA]
+    counts[code] = counts.get(code, 0) + 1
+
+
+def enable() -> None:
+    """Start counting error occurrences."""
+    data_classes._count_error = _count_error
+    base._count_error_data = _count_error_data
+
+
+def disable() -> None:
+    """Stop counting error occurrences, the counts so far are kept."""
+    data_classes._count_error = None
+    base._count_error_data = None
+
+
+def is_enabled() -> bool:
+    """Return whether error occurrences are counted."""
+    return data_classes._count_error is not None
+
+
+def snapshot(reset: bool = False) -> MetricsSnapshot:
+    """Return the counts of all threads merged per error code.
+
+    Args:
+        reset: When True, the counts are reset after taking the snapshot.
+            Errors counted by other threads while the snapshot is taken are
+            either included or counted towards the next snapshot.
+    """
+    errors, error_data = _tables.snapshot(reset)
+    return MetricsSnapshot(
+        Counter({code: count for code, count in errors.items() if count}),
+        Counter({code: count for code, count in error_data.items() if count}),
+    )
+
+
+def reset() -> None:
+    """Reset the counts of all threads."""
+    snapshot(reset=True)
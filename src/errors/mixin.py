@@ -21,7 +21,31 @@ Example::
     MyProjectErrors.error_description("M1_001")  # lookup by code string
 """
 
-from errors import ErrorCode
+from time import perf_counter
+from typing import Any, Callable, Iterable, List, Mapping, Optional, Tuple, Union
+
+import errors.settings as st
+from errors.base import (
+    ErrorCode,
+    _assign_error_ids,
+    _error_ids_from_export,
+    _errors_with_prefix,
+)
+
+# replaces the index lookup of error_description(), set by
+# errors.instrumentation.enable()
+_instrumented_lookup: Optional[Callable[[type, str], Optional[ErrorCode]]] = None
+# called with the class and the duration in seconds of every index rebuild
+_record_regeneration: Optional[Callable[[type, float], None]] = None
+
+
+def _error_codes_in(namespace: Mapping[str, Any]) -> dict[str, ErrorCode]:
+    """Return a code -> ErrorCode dict for all ErrorCode values in *namespace*."""
+    return {
+        value.code: value
+        for value in namespace.values()
+        if isinstance(value, ErrorCode)
+    }
 
 
 class ErrorListByMixin:
@@ -30,16 +54,39 @@ class ErrorListByMixin:
     Subclass this together with one or more classes that define ErrorCode
     class attributes. The mixin provides ``error_description()`` and
     ``error_object()`` for looking up errors by their code string.
+
+    Every subclass gets its own code -> ErrorCode index, built once when the
+    class is created. Lookups of unknown codes do not rescan the class, they
+    are kept in a bounded negative cache. Call ``invalidate_errors_list()``
+    after patching error codes onto a class at runtime.
+
+    Every code of a class gets a dense integer ID, in the order the classes
+    are listed in the MRO, starting with the most generic one. IDs are kept
+    when the index is rebuilt. Use ``export_error_ids()`` and
+    ``import_error_ids()`` to use the same IDs in other processes.
     """
 
-    _errors: dict[str, str] = {}
+    _errors: dict[str, ErrorCode] = {}
+    _missing_codes: dict[str, None] = {}
+    # code -> dense ID in ID order, and the errors by ID
+    _error_ids: dict[str, int] = {}
+    _errors_by_id: Tuple[Optional[ErrorCode], ...] = ()
+    # codes of _errors in sorted order for prefix queries
+    _sorted_codes: List[str] = []
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._missing_codes = {}
+        cls._regenerate_errors_list()
 
     @classmethod
     def error_description(cls, error_code: str) -> str:
         """Look up the description for an error code string.
 
-        On a cache miss the internal errors dict is regenerated from the
-        class attributes before retrying.
+        The code is looked up in the index built when the class was
+        created, codes patched onto the class later are only found after
+        ``invalidate_errors_list()``. Unknown codes are remembered in the
+        negative cache.
 
         Args:
             error_code: The error code string to look up.
@@ -48,27 +95,162 @@ class ErrorListByMixin:
             The error description.
 
         Raises:
-            KeyError: If *error_code* is not found after regeneration.
+            KeyError: If *error_code* is not found.
         """
-        error = cls._errors.get(error_code)
-        if not error:
-            cls._regenerate_errors_list()
+        if _instrumented_lookup is None:
             error = cls._errors.get(error_code)
+            if error is None:
+                error = cls._error_code_on_miss(error_code)
+        else:
+            error = _instrumented_lookup(cls, error_code)
 
-        if not error:
+        if error is None:
             raise KeyError(
                 # cls.error_object(ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value)
             )
+        return error.description
+
+    @classmethod
+    def get_error(cls, error_code: str) -> Optional[ErrorCode]:
+        """Return the ErrorCode for an error code string.
+
+        Args:
+            error_code: The error code string to look up.
+
+        Returns:
+            The ErrorCode, or None if *error_code* is not found.
+        """
+        error = cls._errors.get(error_code)
+        if error is None:
+            error = cls._error_code_on_miss(error_code)
         return error
 
+    @classmethod
+    def errors_with_prefix(cls, prefix: str) -> List[ErrorCode]:
+        """Return the errors of this class whose code starts with *prefix*.
+
+        Uses a sorted index of the codes, so the time is proportional to the
+        number of matches rather than the number of errors of the class.
+
+        Returns:
+            The matching ErrorCode instances ordered by code.
+        """
+        sorted_codes = cls._sorted_codes
+        return _errors_with_prefix(sorted_codes, cls._errors, prefix)
+
+    @classmethod
+    def errors_in_namespace(
+        cls, namespace: str, separator: str = "_"
+    ) -> List[ErrorCode]:
+        """Return the errors of this class in *namespace*, ordered by code.
+
+        ``errors_in_namespace("ER_API404")`` returns the errors with codes
+        starting with ``"ER_API404_"``.
+        """
+        return cls.errors_with_prefix(namespace + separator)
+
+    @classmethod
+    def get_error_id(cls, error: Union[str, ErrorCode]) -> Optional[int]:
+        """Return the dense integer ID of an error code of this class.
+
+        Args:
+            error: The error code string or an ErrorCode with that code.
+
+        Returns:
+            The ID, or None if the code has no ID.
+        """
+        if isinstance(error, ErrorCode):
+            error = error.code
+        return cls._error_ids.get(error)
+
+    @classmethod
+    def get_error_by_id(cls, error_id: int) -> Optional[ErrorCode]:
+        """Return the ErrorCode with ID *error_id*, or None if there is none."""
+        errors_by_id = cls._errors_by_id
+        if 0 <= error_id < len(errors_by_id):
+            return errors_by_id[error_id]
+        return None
+
+    @classmethod
+    def export_error_ids(cls) -> List[str]:
+        """Return all codes with an ID in ID order, the ID being the position."""
+        return list(cls._error_ids)
+
+    @classmethod
+    def import_error_ids(cls, error_codes: Iterable[str]) -> None:
+        """Assign the IDs of an export of ``export_error_ids()``.
+
+        The codes of the export get their exported ID, codes of the class
+        that are not part of it get the next free IDs.
+
+        Raises:
+            ValueError: If a code occurs more than once in *error_codes*.
+        """
+        cls._error_ids = _error_ids_from_export(error_codes)
+        cls._regenerate_errors_list()
+
+    @classmethod
+    def invalidate_errors_list(cls) -> None:
+        """Rebuild the errors index and clear the negative lookup cache.
+
+        Subclasses reuse the index of their parents, so their indexes are
+        rebuilt as well.
+        """
+        cls._missing_codes = {}
+        cls._regenerate_errors_list()
+        for subclass in cls.__subclasses__():
+            subclass.invalidate_errors_list()
+
+    @classmethod
+    def _error_code_on_miss(cls, error_code: str) -> Optional[ErrorCode]:
+        """Handle an index miss for *error_code*.
+
+        The index is complete since the class was created, so the class is
+        not rescanned, unless the index is empty (cleared). Unknown codes are
+        remembered in the negative cache, which holds at most
+        ``settings.MIXIN_NEGATIVE_CACHE_SIZE`` codes.
+        """
+        missing_codes = cls._missing_codes
+        if error_code in missing_codes:
+            return None
+
+        if not cls._errors:
+            cls._regenerate_errors_list()
+            error = cls._errors.get(error_code)
+            if error is not None:
+                return error
+        if len(missing_codes) >= st.MIXIN_NEGATIVE_CACHE_SIZE:
+            missing_codes.pop(next(iter(missing_codes)))
+        missing_codes[error_code] = None
+        return None
+
     @classmethod
     def _regenerate_errors_list(cls) -> None:
-        """Rebuild ``_errors`` dict from all ErrorCode class attributes."""
-        for item in dir(cls):
-            atribute = getattr(cls, item)
-            typ = type(atribute)
-            if typ is ErrorCode:
-                cls._errors.update({atribute.code: atribute.description})
+        """Rebuild ``_errors`` index from all ErrorCode class attributes.
+
+        Classes in the MRO are visited from the most generic to the most
+        specific one. Parent classes deriving from the mixin contribute their
+        already built index, all other classes are scanned once.
+        """
+        record_regeneration = _record_regeneration
+        if record_regeneration is not None:
+            start = perf_counter()
+        errors: dict[str, ErrorCode] = {}
+        for klass in reversed(cls.__mro__[1:]):
+            parent_index = klass.__dict__.get("_errors")
+            if parent_index is not None and issubclass(klass, ErrorListByMixin):
+                errors.update(parent_index)
+            else:
+                errors.update(_error_codes_in(klass.__dict__))
+        errors.update(_error_codes_in(cls.__dict__))
+        # only keep IDs assigned to this class, not the inherited ones
+        error_ids = _assign_error_ids(cls.__dict__.get("_error_ids", {}), errors)
+        cls._errors_by_id = tuple(errors.get(error_code) for error_code in error_ids)
+        cls._error_ids = error_ids
+        cls._errors = errors
+        cls._sorted_codes = sorted(errors)
+        if record_regeneration is not None:
+            record_regeneration(cls, perf_counter() - start)
 
     @staticmethod
     def error_object(error_code: ErrorCode) -> dict:
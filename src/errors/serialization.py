@@ -0,0 +1,458 @@
+"""JSON and compact binary encoding of ErrorCode and ReturnValueWithStatus.
+
+Two codecs share the same interface:
+
+- ``JsonCodec`` -- JSON text, errors as ``error_object()`` style dicts with
+  their ``error_data``.
+- ``BinaryCodec`` -- compact bytes. Registered errors are referenced by code,
+  or by registry ID with ``use_ids=True``, instead of repeating the
+  description.
+
+Decoding returns the registered ``ErrorCode`` instances of the codec's
+registry. Occurrences with ``error_data`` share the strings of the registered
+error. Errors that are not registered are decoded as new ``ErrorCode``
+instances.
+
+Example::
+
+    codec = BinaryCodec()
+    payload = codec.encode_many(return_values)
+    ...
+    return_values = codec.decode_many(payload)
+
+The binary form of a return value is a format version byte followed by::
+
+    flags        1 byte, bit 0 valid, bit 1 result is None
+    result       varint length + bytes (omitted when the result is None)
+    error count  varint
+    errors       per error a tag byte and
+                 0: varint registry ID
+                 1: varint length + UTF-8 code
+                 2: varint length + UTF-8 code, varint length + UTF-8 description
+                 followed by varint length + JSON error_data (0 when empty)
+
+A batch is the version byte, a varint count, varint length + the list of
+all results encoded at once, followed by flags (bit 0 only) and errors of
+every return value.
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type, Union
+
+from errors.base import ErrorCode
+from errors.data_classes import ReturnValueWithStatus
+from errors.error import ListErrors
+from errors.mixin import ErrorListByMixin
+
+Registry = Union[Type[ListErrors], Type[ErrorListByMixin]]
+
+FORMAT_VERSION = 1
+
+_VALID = 0x01
+_RESULT_IS_NONE = 0x02
+
+_BY_ID = 0
+_BY_CODE = 1
+_FULL = 2
+
+
+def _error_occurrence(
+    registry: Registry, code: str, description: Optional[str], error_data: Any
+) -> ErrorCode:
+    """Return the registered error for *code*, with *error_data* if given.
+
+    Errors are created directly instead of with ``add_error_data()``, as
+    decoding does not create new error occurrences.
+    """
+    registered = registry.get_error(code)
+    if registered is None or (
+        description is not None and description != registered.description
+    ):
+        if description is None:
+            raise KeyError(f"error code {code!r} is not registered")
+        return ErrorCode(code=code, description=description, error_data=error_data)
+    if not error_data:
+        return registered
+    return ErrorCode(
+        code=registered.code,
+        description=registered.description,
+        error_data=error_data,
+    )
+
+
+class JsonCodec:
+    """Encodes errors and return values as JSON text.
+
+    An error is encoded as ``{"error": code, "description": description}``,
+    with an ``"error_data"`` member when it has error data. A return value
+    is encoded as ``{"result": ..., "is_valid": ..., "errors": [...]}``.
+    """
+
+    def __init__(
+        self,
+        registry: Registry = ListErrors,
+        default: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        """Create a codec.
+
+        Args:
+            registry: Registry providing the ErrorCode instances when decoding.
+            default: Passed to ``json.dumps`` for results and error data that
+                are not JSON serializable.
+        """
+        self.registry = registry
+        self.default = default
+
+    def error_to_dict(self, error: ErrorCode) -> dict:
+        """Return *error* as a JSON serializable dict."""
+        error_dict: Dict[str, Any] = {
+            "error": error.code,
+            "description": error.description,
+        }
+        if error.error_data:
+            error_dict["error_data"] = error.error_data
+        return error_dict
+
+    def error_from_dict(self, error_dict: dict) -> ErrorCode:
+        """Return the ErrorCode of a dict created by ``error_to_dict()``.
+
+        Raises:
+            ValueError: If *error_dict* is not an encoded error.
+        """
+        try:
+            code = error_dict["error"]
+            description = error_dict["description"]
+        except (KeyError, TypeError):
+            raise ValueError(f"{error_dict!r} is not an encoded error") from None
+        return _error_occurrence(
+            self.registry, code, description, error_dict.get("error_data")
+        )
+
+    def to_dict(self, return_value: ReturnValueWithStatus) -> dict:
+        """Return *return_value* as a JSON serializable dict."""
+        errors = return_value._errors
+        return {
+            "result": return_value.result,
+            "is_valid": return_value._is_valid,
+            "errors": [self.error_to_dict(error) for error in errors] if errors else [],
+        }
+
+    def from_dict(self, return_value_dict: dict) -> ReturnValueWithStatus:
+        """Return the ReturnValueWithStatus of a dict created by ``to_dict()``.
+
+        Raises:
+            ValueError: If *return_value_dict* is not an encoded return value.
+        """
+        try:
+            result = return_value_dict["result"]
+            is_valid = return_value_dict["is_valid"]
+            error_dicts = return_value_dict["errors"]
+        except (KeyError, TypeError):
+            raise ValueError(
+                f"{return_value_dict!r} is not an encoded return value"
+            ) from None
+        return_value: ReturnValueWithStatus = ReturnValueWithStatus(
+            result=result, _is_valid=is_valid
+        )
+        if error_dicts:
+            return_value._errors = [
+                self.error_from_dict(error_dict) for error_dict in error_dicts
+            ]
+        return return_value
+
+    def encode_error(self, error: ErrorCode) -> str:
+        """Return *error* encoded as JSON."""
+        return json.dumps(self.error_to_dict(error), default=self.default)
+
+    def decode_error(self, text: Union[str, bytes]) -> ErrorCode:
+        """Return the ErrorCode encoded in *text*."""
+        return self.error_from_dict(json.loads(text))
+
+    def encode(self, return_value: ReturnValueWithStatus) -> str:
+        """Return *return_value* encoded as JSON."""
+        return json.dumps(self.to_dict(return_value), default=self.default)
+
+    def decode(self, text: Union[str, bytes]) -> ReturnValueWithStatus:
+        """Return the ReturnValueWithStatus encoded in *text*."""
+        return self.from_dict(json.loads(text))
+
+    def encode_many(self, return_values: Iterable[ReturnValueWithStatus]) -> str:
+        """Return *return_values* encoded as a JSON array."""
+        to_dict = self.to_dict
+        return json.dumps(
+            [to_dict(return_value) for return_value in return_values],
+            default=self.default,
+        )
+
+    def decode_many(self, text: Union[str, bytes]) -> List[ReturnValueWithStatus]:
+        """Return the ReturnValueWithStatus instances encoded in *text*."""
+        from_dict = self.from_dict
+        return [from_dict(return_value) for return_value in json.loads(text)]
+
+
+# json.dumps with arguments creates a new encoder on every call
+_json_encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+_json_decode = json.JSONDecoder().decode
+
+
+def _json_bytes(value: Any) -> bytes:
+    return _json_encode(value).encode("utf-8")
+
+
+def _json_from_bytes(value: bytes) -> Any:
+    return _json_decode(value.decode("utf-8"))
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    if value < 0x80:
+        buffer.append(value)
+        return
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _write_bytes(buffer: bytearray, value: bytes) -> None:
+    _write_varint(buffer, len(value))
+    buffer += value
+
+
+class _Reader:
+    """Reads the fields of the binary form from a bytes-like object."""
+
+    __slots__ = ("data", "position")
+
+    def __init__(self, data: bytes) -> None:
+        self.data = memoryview(data)
+        self.position = 0
+
+    def byte(self) -> int:
+        try:
+            value = self.data[self.position]
+        except IndexError:
+            raise ValueError("truncated data") from None
+        self.position += 1
+        return value
+
+    def varint(self) -> int:
+        value = shift = 0
+        while True:
+            byte = self.byte()
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def bytes(self) -> bytes:
+        length = self.varint()
+        start = self.position
+        self.position += length
+        if self.position > len(self.data):
+            raise ValueError("truncated data")
+        return self.data[start : self.position].tobytes()
+
+    def string(self) -> str:
+        return self.bytes().decode("utf-8")
+
+    def done(self) -> None:
+        if self.position != len(self.data):
+            raise ValueError("unexpected data after the encoded value")
+
+
+class BinaryCodec:
+    """Encodes errors and return values in a compact binary form.
+
+    Errors registered in the codec's registry are referenced by code, or by
+    registry ID with ``use_ids=True``. Only use IDs when encoder and decoder
+    agree on them, see ``ListErrors.export_error_ids()``. Errors that are not
+    registered are encoded with code and description. Results and error
+    data are encoded as JSON unless other result encoders are provided.
+    """
+
+    def __init__(
+        self,
+        registry: Registry = ListErrors,
+        use_ids: bool = False,
+        result_encoder: Callable[[Any], bytes] = _json_bytes,
+        result_decoder: Callable[[bytes], Any] = _json_from_bytes,
+    ) -> None:
+        """Create a codec.
+
+        Args:
+            registry: Registry to reference errors in and to take the
+                ErrorCode instances from when decoding.
+            use_ids: Reference registered errors by registry ID instead of
+                by code.
+            result_encoder: Returns the bytes of a result that is not None.
+                ``encode_many()`` calls it once with the list of all results.
+            result_decoder: Returns the result (or list of results) for the
+                bytes of *result_encoder*.
+        """
+        self.registry = registry
+        self.use_ids = use_ids
+        self.result_encoder = result_encoder
+        self.result_decoder = result_decoder
+
+    def encode_error(self, error: ErrorCode) -> bytes:
+        """Return *error* in binary form."""
+        buffer = bytearray((FORMAT_VERSION,))
+        self._write_error(buffer, error)
+        return bytes(buffer)
+
+    def decode_error(self, data: bytes) -> ErrorCode:
+        """Return the ErrorCode of binary form *data*.
+
+        Raises:
+            ValueError: If *data* is not a valid binary encoded error.
+            KeyError: If *data* references an error that is not registered.
+        """
+        reader = self._reader(data)
+        error = self._read_error(reader)
+        reader.done()
+        return error
+
+    def encode(self, return_value: ReturnValueWithStatus) -> bytes:
+        """Return *return_value* in binary form."""
+        buffer = bytearray((FORMAT_VERSION,))
+        self._write_return_value(buffer, return_value)
+        return bytes(buffer)
+
+    def decode(self, data: bytes) -> ReturnValueWithStatus:
+        """Return the ReturnValueWithStatus of binary form *data*.
+
+        Raises:
+            ValueError: If *data* is not a valid binary encoded return value.
+            KeyError: If *data* references an error that is not registered.
+        """
+        reader = self._reader(data)
+        return_value = self._read_return_value(reader)
+        reader.done()
+        return return_value
+
+    def encode_many(self, return_values: Iterable[ReturnValueWithStatus]) -> bytes:
+        """Return *return_values* in binary form."""
+        return_values = list(return_values)
+        buffer = bytearray((FORMAT_VERSION,))
+        _write_varint(buffer, len(return_values))
+        # one call for all results is much faster than one call per result
+        results = [return_value.result for return_value in return_values]
+        _write_bytes(buffer, self.result_encoder(results))
+        write_status = self._write_status
+        for return_value in return_values:
+            write_status(buffer, return_value)
+        return bytes(buffer)
+
+    def decode_many(self, data: bytes) -> List[ReturnValueWithStatus]:
+        """Return the ReturnValueWithStatus instances of binary form *data*.
+
+        Raises:
+            ValueError: If *data* is not a valid binary encoded batch.
+            KeyError: If *data* references an error that is not registered.
+        """
+        reader = self._reader(data)
+        number_of_values = reader.varint()
+        results = self.result_decoder(reader.bytes())
+        if len(results) != number_of_values:
+            raise ValueError("number of results does not match number of values")
+        read_status = self._read_status
+        return_values = [read_status(reader, result) for result in results]
+        reader.done()
+        return return_values
+
+    def _reader(self, data: bytes) -> _Reader:
+        reader = _Reader(data)
+        version = reader.byte()
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported format version {version}")
+        return reader
+
+    def _write_error(self, buffer: bytearray, error: ErrorCode) -> None:
+        registry = self.registry
+        registered = registry.get_error(error.code)
+        if registered is None or registered.description != error.description:
+            buffer.append(_FULL)
+            _write_bytes(buffer, error.code.encode("utf-8"))
+            _write_bytes(buffer, error.description.encode("utf-8"))
+        else:
+            error_id = registry.get_error_id(error.code) if self.use_ids else None
+            if error_id is None:
+                buffer.append(_BY_CODE)
+                _write_bytes(buffer, error.code.encode("utf-8"))
+            else:
+                buffer.append(_BY_ID)
+                _write_varint(buffer, error_id)
+        if error.error_data:
+            _write_bytes(buffer, _json_bytes(error.error_data))
+        else:
+            buffer.append(0)
+
+    def _read_error(self, reader: _Reader) -> ErrorCode:
+        tag = reader.byte()
+        description: Optional[str] = None
+        if tag == _BY_ID:
+            error_id = reader.varint()
+            registered = self.registry.get_error_by_id(error_id)
+            if registered is None:
+                raise KeyError(f"error ID {error_id} is not registered")
+            code = registered.code
+        elif tag == _BY_CODE:
+            code = reader.string()
+        elif tag == _FULL:
+            code = reader.string()
+            description = reader.string()
+        else:
+            raise ValueError(f"unknown error tag {tag}")
+        raw_error_data = reader.bytes()
+        error_data = _json_from_bytes(raw_error_data) if raw_error_data else None
+        return _error_occurrence(self.registry, code, description, error_data)
+
+    def _write_return_value(
+        self, buffer: bytearray, return_value: ReturnValueWithStatus
+    ) -> None:
+        result = return_value.result
+        flags = _VALID if return_value._is_valid else 0
+        if result is None:
+            buffer.append(flags | _RESULT_IS_NONE)
+        else:
+            buffer.append(flags)
+            _write_bytes(buffer, self.result_encoder(result))
+        self._write_errors(buffer, return_value)
+
+    def _write_status(
+        self, buffer: bytearray, return_value: ReturnValueWithStatus
+    ) -> None:
+        """Write validity and errors of a return value of a batch."""
+        buffer.append(_VALID if return_value._is_valid else 0)
+        self._write_errors(buffer, return_value)
+
+    def _write_errors(
+        self, buffer: bytearray, return_value: ReturnValueWithStatus
+    ) -> None:
+        errors = return_value._errors
+        _write_varint(buffer, len(errors))
+        write_error = self._write_error
+        for error in errors:
+            write_error(buffer, error)
+
+    def _read_return_value(self, reader: _Reader) -> ReturnValueWithStatus:
+        flags = reader.byte()
+        result = None
+        if not flags & _RESULT_IS_NONE:
+            result = self.result_decoder(reader.bytes())
+        return self._read_status(reader, result, flags)
+
+    def _read_status(
+        self, reader: _Reader, result: Any, flags: Optional[int] = None
+    ) -> ReturnValueWithStatus:
+        """Read validity and errors and return the return value for *result*."""
+        if flags is None:
+            flags = reader.byte()
+        return_value: ReturnValueWithStatus = ReturnValueWithStatus(
+            result=result, _is_valid=bool(flags & _VALID)
+        )
+        number_of_errors = reader.varint()
+        if number_of_errors:
+            read_error = self._read_error
+            return_value._errors = [read_error(reader) for _ in range(number_of_errors)]
+        return return_value
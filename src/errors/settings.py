@@ -1,3 +1,39 @@
 """Default settings, constants and exception messages for error-manager."""
 
 EXC_ERROR_NOT_OF_ERROR_CODE_TYPE = "Provided error not of type ErrorCode"
+EXC_ERROR_DATA_IS_IMMUTABLE = "ErrorData is immutable"
+EXC_MEMBER_TABLE_IS_IMMUTABLE = "Enumerator member tables are immutable"
+
+# Maximum number of unknown codes remembered per ErrorListByMixin class
+MIXIN_NEGATIVE_CACHE_SIZE = 1024
+
+# Default number of distinct codes an ErrorAggregator keeps
+AGGREGATOR_MAX_CODES = 1024
+# Default number of error_data samples an ErrorAggregator keeps per code
+AGGREGATOR_SAMPLE_SIZE = 10
+
+# Default maximum number of queued error occurrences of an ErrorSink
+SINK_QUEUE_SIZE = 65536
+# Default maximum number of error occurrences an ErrorSink writes at once
+SINK_BATCH_SIZE = 1024
+# Default maximum time in seconds an ErrorSink keeps occurrences queued
+SINK_FLUSH_INTERVAL = 1.0
+# Default size in bytes at which an ErrorSink rotates its file, 0 to never rotate
+SINK_MAX_BYTES = 64 * 1024 * 1024
+# Default number of rotated files an ErrorSink keeps
+SINK_BACKUP_COUNT = 5
+
+# Upper bounds in seconds of the registry lookup latency histogram buckets of
+# errors.instrumentation, slower lookups are counted in an extra last bucket
+INSTRUMENTATION_LATENCY_BUCKETS = (
+    0.25e-6,
+    0.5e-6,
+    1e-6,
+    2.5e-6,
+    5e-6,
+    10e-6,
+    25e-6,
+    50e-6,
+    100e-6,
+    1e-3,
+)
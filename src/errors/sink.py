@@ -0,0 +1,375 @@
+"""Batched, asynchronous JSON Lines sink for error occurrences.
+
+``ErrorSink.emit()`` queues an error occurrence and returns immediately. A
+background thread writes the queued occurrences in batches to a JSON Lines
+file, one object per occurrence (on a single line) in the format of
+``ListErrors.error_object()`` plus the time of the occurrence and its
+``error_data``::
+
+    {"time": 1718000000.5, "error": "ER_API_00001", "description": "...",
+     "error_data": {"id": 42}}
+
+Values that are not JSON serializable are written as their ``repr()``, as
+are dict keys other than strings, numbers, booleans and None. Occurrences
+that still cannot be encoded are counted as dropped.
+
+The file is rotated when it would grow beyond ``max_bytes``, keeping
+``backup_count`` rotated files named ``<path>.1``, ``<path>.2``, ...
+
+The queue is bounded. When it is full, ``emit()`` either drops the
+occurrence (``policy=DROP``, the default) or waits for the writer to make
+room (``policy=BLOCK``), at most ``block_timeout`` seconds.
+
+``install()`` makes ``ReturnValueWithStatus.add_error`` and
+``ReturnValueWithErrorStatus`` emit every added error. When no sink is
+installed this costs a single ``is not None`` check.
+
+Example::
+
+    from errors.sink import ErrorSink
+
+    sink = ErrorSink("/var/log/service/errors.jsonl")
+    sink.install()
+    ...
+    sink.close()  # writes the queued occurrences, also done at exit
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import IO, Any, Deque, Dict, List, Optional, Tuple
+
+import errors.settings as st
+from errors import data_classes
+from errors.base import ErrorCode
+
+DROP = "drop"
+BLOCK = "block"
+
+# maximum number of codes whose encoded code and description are cached
+MAX_CACHED_PREFIXES = 4096
+
+# types of dict keys the JSON encoder accepts
+_JSON_KEY_TYPES = (str, int, float, bool, type(None))
+
+
+# compact JSON, values JSON does not support are written as their repr
+_ENCODER = json.JSONEncoder(
+    ensure_ascii=False, check_circular=False, separators=(",", ":"), default=repr
+)
+
+
+def _with_string_keys(value: Any) -> Any:
+    """Return *value* with the dict keys JSON does not support as their repr."""
+    if isinstance(value, dict):
+        return {
+            key if isinstance(key, _JSON_KEY_TYPES) else repr(key): (
+                _with_string_keys(item)
+            )
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [_with_string_keys(item) for item in value]
+    return value
+
+
+class ErrorSink:
+    """Queue of error occurrences written to a JSON Lines file by a thread.
+
+    Attributes:
+        path: Path of the JSON Lines file, appended to if it exists.
+        policy: ``DROP`` or ``BLOCK``, what ``emit()`` does when the queue
+            is full.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = st.SINK_MAX_BYTES,
+        backup_count: int = st.SINK_BACKUP_COUNT,
+        queue_size: int = st.SINK_QUEUE_SIZE,
+        policy: str = DROP,
+        block_timeout: Optional[float] = None,
+        batch_size: int = st.SINK_BATCH_SIZE,
+        flush_interval: float = st.SINK_FLUSH_INTERVAL,
+    ) -> None:
+        """Open *path* and start the writer thread.
+
+        Args:
+            path: Path of the JSON Lines file.
+            max_bytes: Size in bytes at which the file is rotated, 0 to
+                never rotate. A single batch is never split, so a file only
+                exceeds this size if one batch does.
+            backup_count: Number of rotated files to keep, 0 to truncate
+                the file instead.
+            queue_size: Maximum number of queued occurrences.
+            policy: ``DROP`` to drop occurrences when the queue is full,
+                ``BLOCK`` to wait for room.
+            block_timeout: Maximum time in seconds ``emit()`` waits with
+                ``BLOCK`` before dropping, no limit when None.
+            batch_size: Maximum number of occurrences written at once, the
+                writer is woken up when this many are queued.
+            flush_interval: Maximum time in seconds occurrences stay queued.
+
+        Raises:
+            ValueError: If *policy* is unknown or a size is not positive.
+        """
+        if policy not in (DROP, BLOCK):
+            raise ValueError(f"unknown policy {policy!r}, use DROP or BLOCK")
+        if queue_size < 1 or batch_size < 1 or max_bytes < 0 or backup_count < 0:
+            raise ValueError(
+                "queue_size and batch_size must be positive, "
+                "max_bytes and backup_count must not be negative"
+            )
+        self.path = path
+        self.policy = policy
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.queue_size = queue_size
+        self.block_timeout = block_timeout
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: Deque[Tuple[float, ErrorCode]] = deque()
+        self._wakeup = threading.Event()
+        # waited on by emit() with BLOCK and flush(), notified whenever the
+        # writer takes a batch from the queue and when it is idle again
+        self._room = threading.Condition()
+        self._lock = threading.Lock()
+        self._closed = False
+        # True while the writer holds occurrences taken from the queue
+        self._writing = False
+        self._dropped = 0
+        self._written = 0
+        self._encode = _ENCODER.encode
+        # code -> (description, encoded keys of the error up to error_data),
+        # only used by the writer thread
+        self._prefixes: Dict[str, Tuple[str, str]] = {}
+
+        self._file: IO[bytes] = open(path, "ab")  # noqa: SIM115
+        self._size = self._file.tell()
+        self._thread = threading.Thread(
+            target=self._run, name=f"ErrorSink({path})", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __enter__(self) -> "ErrorSink":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({self.path!r}, pending={self.pending}, "
+            f"written={self._written}, dropped={self._dropped})"
+        )
+
+    @property
+    def pending(self) -> int:
+        """Return the number of queued occurrences."""
+        return len(self._queue)
+
+    @property
+    def written(self) -> int:
+        """Return the number of occurrences written to the file."""
+        return self._written
+
+    @property
+    def dropped(self) -> int:
+        """Return the number of occurrences dropped or that failed to write."""
+        return self._dropped
+
+    def emit(self, error: ErrorCode) -> bool:
+        """Queue an occurrence of *error* for writing.
+
+        Returns:
+            True if the occurrence was queued, False if it was dropped
+            because the queue is full or the sink is closed.
+        """
+        queue = self._queue
+        if len(queue) >= self.queue_size or self._closed:
+            if self._closed or not self._wait_for_room():
+                self._count_dropped(1)
+                return False
+        queue.append((time.time(), error))
+        if len(queue) >= self.batch_size and not self._wakeup.is_set():
+            self._wakeup.set()
+        return True
+
+    def install(self) -> None:
+        """Emit every error added to a return value to this sink.
+
+        Raises:
+            ValueError: If another sink is installed.
+        """
+        installed = data_classes._emit_error
+        if installed is not None and installed != self.emit:
+            raise ValueError("another ErrorSink is installed")
+        data_classes._emit_error = self.emit
+
+    def uninstall(self) -> None:
+        """Stop emitting added errors to this sink, if installed."""
+        if data_classes._emit_error == self.emit:
+            data_classes._emit_error = None
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the occurrences queued so far are written.
+
+        Returns:
+            True if the queue was emptied within *timeout* seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._room:
+            while (self._queue or self._writing) and self._thread.is_alive():
+                self._wakeup.set()
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._room.wait(remaining)
+        return not self._queue
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Uninstall the sink, write the queued occurrences and close the file.
+
+        Occurrences emitted while closing may be dropped. Calling ``close()``
+        again does nothing.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self.uninstall()
+        atexit.unregister(self.close)
+        self._wakeup.set()
+        self._thread.join(timeout)
+
+    def _wait_for_room(self) -> bool:
+        """Wait for room in the queue with BLOCK, return whether there is."""
+        if self.policy != BLOCK:
+            return False
+        deadline = None
+        if self.block_timeout is not None:
+            deadline = time.monotonic() + self.block_timeout
+        with self._room:
+            while len(self._queue) >= self.queue_size and not self._closed:
+                self._wakeup.set()
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._room.wait(remaining)
+        return not self._closed
+
+    def _count_dropped(self, number: int) -> None:
+        with self._lock:
+            self._dropped += number
+
+    def _run(self) -> None:
+        """Write the queued occurrences until the sink is closed."""
+        queue = self._queue
+        try:
+            while True:
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+                closed = self._closed
+                while queue:
+                    self._writing = True
+                    batch_size = min(len(queue), self.batch_size)
+                    batch = [queue.popleft() for _ in range(batch_size)]
+                    with self._room:
+                        self._room.notify_all()
+                    try:
+                        self._write(batch)
+                    except Exception:
+                        # a single batch must never end the writer thread
+                        self._count_dropped(len(batch))
+                if self._writing:
+                    self._flush_file()
+                    with self._room:
+                        self._writing = False
+                        self._room.notify_all()
+                if closed:
+                    break
+        finally:
+            self._file.close()
+            with self._room:
+                self._writing = False
+                self._room.notify_all()
+
+    def _flush_file(self) -> None:
+        try:
+            self._file.flush()
+        except (OSError, ValueError):
+            pass
+
+    def _write(self, batch: List[Tuple[float, ErrorCode]]) -> None:
+        """Serialize *batch* and append it to the file, rotating it first."""
+        prefixes = self._prefixes
+        lines = []
+        for occurred, error in batch:
+            cached = prefixes.get(error.code)
+            try:
+                if cached is None or cached[0] is not error.description:
+                    cached = (error.description, self._prefix(error))
+                error_data = error.error_data
+                lines.append(
+                    '{"time":%r,%s%s}\n'
+                    % (
+                        occurred,
+                        cached[1],
+                        self._encode_error_data(error_data) if error_data else "{}",
+                    )
+                )
+            except Exception:
+                self._count_dropped(1)
+        if not lines:
+            return
+        data = "".join(lines).encode()
+        try:
+            if (
+                self.max_bytes
+                and self._size
+                and self._size + len(data) > self.max_bytes
+            ):
+                self._rotate()
+            self._file.write(data)
+        except (OSError, ValueError):
+            # ValueError if the file could not be reopened after rotating
+            self._count_dropped(len(lines))
+            return
+        self._size += len(data)
+        self._written += len(lines)
+
+    def _encode_error_data(self, error_data: Dict) -> str:
+        """Encode *error_data*, replacing keys JSON does not support."""
+        try:
+            return self._encode(error_data)
+        except (TypeError, ValueError):
+            return self._encode(_with_string_keys(error_data))
+
+    def _prefix(self, error: ErrorCode) -> str:
+        """Return the encoded code and description of *error* and cache it."""
+        encode = self._encode
+        prefix = (
+            f'"error":{encode(error.code)},'
+            f'"description":{encode(error.description)},"error_data":'
+        )
+        if len(self._prefixes) < MAX_CACHED_PREFIXES:
+            self._prefixes[error.code] = (error.description, prefix)
+        return prefix
+
+    def _rotate(self) -> None:
+        """Rename the file to ``<path>.1`` (shifting older ones) and reopen it."""
+        self._file.close()
+        path = self.path
+        if self.backup_count:
+            for index in range(self.backup_count - 1, 0, -1):
+                if os.path.exists(f"{path}.{index}"):
+                    os.replace(f"{path}.{index}", f"{path}.{index + 1}")
+            os.replace(path, f"{path}.1")
+        self._file = open(path, "wb")  # noqa: SIM115
+        self._size = 0
@@ -0,0 +1,265 @@
+"""Precompiled, memory-mapped snapshots of the ListErrors registry.
+
+Importing hundreds of enumerator modules and registering them dominates the
+start-up time of short-lived processes. A snapshot stores all registered
+error codes in a compact binary file. Loading it memory-maps the file and
+attaches it to ``ListErrors``, so ``error_description()``, ``get_error()``
+and ``lookup_many()`` resolve codes without importing the enumerators.
+
+Build the snapshot once, for example as part of a release::
+
+    import my_project.errors  # registers all enumerators
+    from errors.snapshot import compile_snapshot
+
+    compile_snapshot("errors.snapshot")
+
+And load it at start-up::
+
+    from errors.snapshot import load_snapshot
+
+    if not load_snapshot("errors.snapshot"):
+        import my_project.errors  # snapshot missing or stale
+
+A snapshot is stale when one of the source files of the registered
+enumerators, or of the modules that registered single errors with
+``register_error()``, has changed (size or modification time) since it was
+compiled. Errors registered by a module that has no source file are not
+covered.
+
+File layout (all integers little endian)::
+
+    header   magic (8s), entry count (I), sources length (I)
+    sources  JSON list of [module, path, size, mtime_ns]
+    entries  per error, sorted by code: code offset (I), code length (I),
+             key offset (I), key length (I), description offset (I),
+             description length (I), offsets relative to the strings block
+    strings  UTF-8 encoded codes, keys and descriptions
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+
+from errors.base import ErrorCode
+from errors.error import ListErrors
+
+MAGIC = b"ERRSNAP1"
+HEADER = struct.Struct("<8sII")
+ENTRY = struct.Struct("<IIIIII")
+
+
+def _source_files(
+    registry: Type[ListErrors],
+) -> List[Tuple[str, str, int, int]]:
+    """Return (module, path, size, mtime_ns) of the modules errors came from.
+
+    These are the modules of the registered enumerators and the modules
+    that called ``register_error()``.
+    """
+    sources = {}
+    module_names = [enumerator.__module__ for enumerator in registry._enumerators]
+    for module_name in module_names + list(registry._source_modules):
+        module = sys.modules.get(module_name)
+        path = getattr(module, "__file__", None)
+        if path and module_name not in sources:
+            stat = os.stat(path)
+            sources[module_name] = (
+                module_name,
+                os.path.abspath(path),
+                stat.st_size,
+                stat.st_mtime_ns,
+            )
+    return sorted(sources.values())
+
+
+def compile_snapshot(path: str, registry: Type[ListErrors] = ListErrors) -> int:
+    """Write all errors registered in *registry* to a snapshot file.
+
+    Args:
+        path: Path of the snapshot file, an existing file is replaced.
+        registry: The registry to take the errors from.
+
+    Returns:
+        The number of errors written.
+    """
+    keys = {
+        value.code: key
+        for key, value in vars(registry).items()
+        if isinstance(value, ErrorCode)
+    }
+    # dict() copies in one step, register_error() inserts into the index
+    errors = sorted(dict(registry._errors).values(), key=lambda error: error.code)
+
+    strings = bytearray()
+    entries = bytearray()
+
+    def add_string(value: str) -> Tuple[int, int]:
+        encoded = value.encode("utf-8")
+        offset = len(strings)
+        strings.extend(encoded)
+        return offset, len(encoded)
+
+    for error in errors:
+        entries.extend(
+            ENTRY.pack(
+                *add_string(error.code),
+                *add_string(keys.get(error.code, "")),
+                *add_string(error.description),
+            )
+        )
+
+    sources = json.dumps(_source_files(registry)).encode("utf-8")
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as snapshot_file:
+        snapshot_file.write(HEADER.pack(MAGIC, len(errors), len(sources)))
+        snapshot_file.write(sources)
+        snapshot_file.write(entries)
+        snapshot_file.write(strings)
+    os.replace(temporary_path, path)
+    return len(errors)
+
+
+class RegistrySnapshot:
+    """Read-only view on a memory-mapped snapshot file.
+
+    Codes are found with a binary search over the sorted entry table.
+    ErrorCode instances are created on first lookup and cached.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Memory-map the snapshot at *path*.
+
+        Raises:
+            ValueError: If the file is not a snapshot of a supported version.
+        """
+        with open(path, "rb") as snapshot_file:
+            self._map = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.path = path
+        self._cache: Dict[str, ErrorCode] = {}
+        magic, self._count, sources_length = b"", 0, 0
+        if len(self._map) >= HEADER.size:
+            magic, self._count, sources_length = HEADER.unpack_from(self._map, 0)
+        self._sources_offset = HEADER.size
+        self._entries_offset = self._sources_offset + sources_length
+        self._strings_offset = self._entries_offset + self._count * ENTRY.size
+        if magic != MAGIC or self._strings_offset > len(self._map):
+            self._map.close()
+            raise ValueError(f"{path} is not an error registry snapshot")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over all codes in the snapshot in sorted order."""
+        for position in range(self._count):
+            yield self._string(position, 0).decode("utf-8")
+
+    def __contains__(self, error_code: object) -> bool:
+        return isinstance(error_code, str) and self._find(error_code) is not None
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._map.close()
+
+    @property
+    def sources(self) -> List[Tuple[str, str, int, int]]:
+        """Return (module, path, size, mtime_ns) of the source enumerators."""
+        raw = self._map[self._sources_offset : self._entries_offset]
+        return [tuple(source) for source in json.loads(raw)]  # type: ignore[misc]
+
+    def is_stale(self) -> bool:
+        """Return whether a source file changed since the snapshot was compiled."""
+        for _, path, size, mtime_ns in self.sources:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return True
+            if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+                return True
+        return False
+
+    def get(self, error_code: str) -> Optional[ErrorCode]:
+        """Return the ErrorCode for *error_code*, or None if not in the snapshot."""
+        error = self._cache.get(error_code)
+        if error is None:
+            position = self._find(error_code)
+            if position is None:
+                return None
+            error = ErrorCode(
+                code=error_code,
+                description=self._string(position, 2).decode("utf-8"),
+            )
+            self._cache[error_code] = error
+        return error
+
+    def key(self, error_code: str) -> Optional[str]:
+        """Return the attribute name *error_code* was registered under."""
+        position = self._find(error_code)
+        if position is None:
+            return None
+        return self._string(position, 1).decode("utf-8") or None
+
+    def _string(self, position: int, field: int) -> bytes:
+        """Return string *field* (0 code, 1 key, 2 description) of an entry."""
+        entry = ENTRY.unpack_from(
+            self._map, self._entries_offset + position * ENTRY.size
+        )
+        start = self._strings_offset + entry[field * 2]
+        return self._map[start : start + entry[field * 2 + 1]]
+
+    def _find(self, error_code: str) -> Optional[int]:
+        """Binary search the entry position of *error_code*."""
+        target = error_code.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            code = self._string(middle, 0)
+            if code < target:
+                low = middle + 1
+            elif code > target:
+                high = middle
+            else:
+                return middle
+        return None
+
+
+def is_snapshot_stale(path: str) -> bool:
+    """Return whether the snapshot at *path* is missing, invalid or stale."""
+    try:
+        snapshot = RegistrySnapshot(path)
+    except (OSError, ValueError):
+        return True
+    try:
+        return snapshot.is_stale()
+    finally:
+        snapshot.close()
+
+
+def load_snapshot(
+    path: str,
+    registry: Type[ListErrors] = ListErrors,
+    check_stale: bool = True,
+) -> bool:
+    """Attach the snapshot at *path* to *registry*.
+
+    Args:
+        path: Path of a snapshot written by ``compile_snapshot``.
+        registry: The registry to attach the snapshot to.
+        check_stale: When True (default) a stale snapshot is not attached.
+
+    Returns:
+        True if the snapshot was attached, False if it is missing, invalid
+        or stale. In that case the enumerators should be imported instead.
+    """
+    try:
+        snapshot = RegistrySnapshot(path)
+    except (OSError, ValueError):
+        return False
+    if check_stale and snapshot.is_stale():
+        snapshot.close()
+        return False
+    registry.attach_snapshot(snapshot)
+    return True
@@ -0,0 +1,130 @@
+"""Lazy helpers for streams of ReturnValueWithStatus instances.
+
+All helpers consume their input one item at a time, so memory use does not
+grow with the size of the input stream.
+
+Example::
+
+    from errors.stream import StreamPolicy, count_errors, valid_results
+
+    counts = Counter()
+    records = count_errors((parse(line) for line in big_file), counts)
+    for result in valid_results(records, policy=StreamPolicy.CONTINUE):
+        store(result)
+
+    counts  # Counter({"ER_PARSE_00001": 12, ...})
+"""
+
+from collections import Counter, deque
+from enum import Enum
+from typing import Deque, Generator, Iterable, Iterator, Optional, Tuple, TypeVar
+
+from errors.data_classes import ReturnValueWithStatus
+
+T = TypeVar("T")
+
+
+class StreamPolicy(Enum):
+    """Policy for handling invalid return values in a stream."""
+
+    #: skip invalid return values and keep consuming the stream
+    CONTINUE = "continue"
+    #: stop consuming the stream at the first invalid return value
+    STOP_ON_FIRST_INVALID = "stop_on_first_invalid"
+
+
+def valid_results(
+    return_values: Iterable[ReturnValueWithStatus[T]],
+    policy: StreamPolicy = StreamPolicy.CONTINUE,
+) -> Generator[Optional[T], None, Optional[ReturnValueWithStatus[T]]]:
+    """Yield the results of the valid return values in *return_values*.
+
+    Args:
+        return_values: Iterable of ReturnValueWithStatus instances.
+        policy: ``StreamPolicy.CONTINUE`` (default) skips invalid values,
+            ``StreamPolicy.STOP_ON_FIRST_INVALID`` stops at the first one.
+
+    Returns:
+        The generator returns (as ``StopIteration.value``) the invalid
+        return value it stopped at, or None if the stream was exhausted.
+    """
+    stop_on_invalid = policy is StreamPolicy.STOP_ON_FIRST_INVALID
+    for return_value in return_values:
+        if return_value._is_valid:
+            yield return_value.result
+        elif stop_on_invalid:
+            return return_value
+    return None
+
+
+def invalid_values(
+    return_values: Iterable[ReturnValueWithStatus[T]],
+) -> Iterator[ReturnValueWithStatus[T]]:
+    """Yield the invalid return values in *return_values*."""
+    for return_value in return_values:
+        if not return_value._is_valid:
+            yield return_value
+
+
+def partition(
+    return_values: Iterable[ReturnValueWithStatus[T]],
+) -> Tuple[Iterator[Optional[T]], Iterator[ReturnValueWithStatus[T]]]:
+    """Split *return_values* into a stream of results and a stream of errors.
+
+    The first iterator yields the results of the valid return values, the
+    second one the invalid return values. Both share the input, which is
+    consumed lazily. Items read from the input for the other iterator are
+    buffered until that iterator consumes them, so memory stays flat as long
+    as neither iterator runs far ahead of the other. Use ``valid_results()``
+    or ``invalid_values()`` when only one of the streams is needed.
+
+    Returns:
+        Tuple of (valid results iterator, invalid return values iterator).
+    """
+    source = iter(return_values)
+    valid_buffer: Deque = deque()
+    invalid_buffer: Deque = deque()
+
+    def fill(buffer: Deque) -> bool:
+        """Pull from the input until *buffer* has an item or input is exhausted."""
+        for return_value in source:
+            if return_value._is_valid:
+                valid_buffer.append(return_value.result)
+            else:
+                invalid_buffer.append(return_value)
+            if buffer:
+                return True
+        return False
+
+    def drain(buffer: Deque) -> Iterator:
+        while buffer or fill(buffer):
+            yield buffer.popleft()
+
+    return drain(valid_buffer), drain(invalid_buffer)
+
+
+def count_errors(
+    return_values: Iterable[ReturnValueWithStatus[T]],
+    counts: Optional[Counter] = None,
+) -> Iterator[ReturnValueWithStatus[T]]:
+    """Yield *return_values* unchanged while counting their errors per code.
+
+    Args:
+        return_values: Iterable of ReturnValueWithStatus instances.
+        counts: Counter updated with the number of errors per error code as
+            the values pass. A new Counter is used when not provided.
+    """
+    counts = Counter() if counts is None else counts
+    for return_value in return_values:
+        if return_value._errors:
+            for error in return_value._errors:
+                counts[error.code] += 1
+        yield return_value
+
+
+def error_counts(return_values: Iterable[ReturnValueWithStatus[T]]) -> Counter:
+    """Consume *return_values* and return the number of errors per error code."""
+    counts: Counter = Counter()
+    for _ in count_errors(return_values, counts):
+        pass
+    return counts
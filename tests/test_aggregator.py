@@ -0,0 +1,226 @@
+"""Tests for the bounded ErrorAggregator in errors.aggregator."""
+
+from collections import Counter
+
+import pytest
+
+from errors.aggregator import ErrorAggregator
+from errors.base import ErrorCode, add_error_data
+from errors.data_classes import ReturnValueWithStatus
+from errors.stream import error_counts
+
+ERROR_ONE = ErrorCode(code="AGGREGATE_001", description="first aggregated error")
+ERROR_TWO = ErrorCode(code="AGGREGATE_002", description="second aggregated error")
+
+
+def test_aggregator_collapses_occurrences_by_code():
+    """Ensure occurrences are counted per code and iterated once per code."""
+    aggregator = ErrorAggregator()
+    for row in range(100):
+        aggregator.add_error(add_error_data(ERROR_ONE, {"row": row}))
+    aggregator.add_error(ERROR_TWO)
+
+    assert len(aggregator) == 2
+    assert [error.code for error in aggregator] == ["AGGREGATE_001", "AGGREGATE_002"]
+    assert aggregator.count("AGGREGATE_001") == 100
+    assert aggregator.count("UNKNOWN") == 0
+    assert aggregator.counts() == Counter({"AGGREGATE_001": 100, "AGGREGATE_002": 1})
+    assert aggregator.total == 101
+    assert ERROR_TWO in aggregator
+    assert "AGGREGATE_001" in aggregator
+
+
+def test_aggregator_is_valid():
+    """Ensure is_valid follows the add_error semantics of return values."""
+    aggregator = ErrorAggregator()
+    assert aggregator.is_valid
+    assert not aggregator
+    aggregator.append(ERROR_ONE)
+    aggregator.add_error(ERROR_ONE, keep_current_status=True)
+    assert aggregator.is_valid
+    assert aggregator
+    aggregator.add_error(ERROR_TWO)
+    assert not aggregator.is_valid
+
+
+def test_aggregator_samples_are_bounded():
+    """Ensure at most sample_size error_data samples are kept per code."""
+    aggregator = ErrorAggregator(sample_size=5, seed=1)
+    for row in range(10_000):
+        aggregator.add_error(add_error_data(ERROR_ONE, {"row": row}))
+    aggregator.add_error(ERROR_TWO)
+
+    samples = aggregator.samples("AGGREGATE_001")
+    assert len(samples) == 5
+    assert len({sample["row"] for sample in samples}) == 5
+    assert aggregator.samples("AGGREGATE_002") == []
+    assert aggregator.samples("UNKNOWN") == []
+
+
+def test_aggregator_samples_are_uniform():
+    """Ensure the reservoir keeps late occurrences as likely as early ones."""
+    aggregator = ErrorAggregator(sample_size=100, seed=7)
+    for row in range(10_000):
+        aggregator.add_error(add_error_data(ERROR_ONE, {"row": row}))
+        # occurrences without data are counted, but not sampled
+        aggregator.add_error(ERROR_ONE)
+
+    rows = [sample["row"] for sample in aggregator.samples("AGGREGATE_001")]
+    late = sum(1 for row in rows if row >= 5_000)
+    assert 25 < late < 75
+    assert aggregator.count("AGGREGATE_001") == 20_000
+
+
+def test_aggregator_overflow():
+    """Ensure codes beyond max_codes are only counted as overflow."""
+    aggregator = ErrorAggregator(max_codes=1)
+    aggregator.add_error(ERROR_ONE, keep_current_status=True)
+    aggregator.add_error(ERROR_TWO, keep_current_status=True)
+    aggregator.add_error(ERROR_TWO)
+
+    assert list(aggregator) == [ERROR_ONE]
+    assert aggregator.overflow == 2
+    assert aggregator.total == 3
+    assert aggregator.count("AGGREGATE_002") == 0
+    assert not aggregator.is_valid
+    assert "overflow=2" in repr(aggregator)
+
+
+def test_aggregator_rejects_negative_limits():
+    """Ensure negative limits raise ValueError."""
+    with pytest.raises(ValueError):
+        ErrorAggregator(max_codes=-1)
+    with pytest.raises(ValueError):
+        ErrorAggregator(sample_size=-1)
+
+
+def test_return_value_aggregate_errors():
+    """Ensure a return value can collect its errors in an aggregator."""
+    return_value: ReturnValueWithStatus[None] = ReturnValueWithStatus()
+    return_value.add_error(ERROR_ONE, keep_current_status=True)
+    aggregator = return_value.aggregate_errors()
+    assert return_value.is_valid
+
+    for row in range(1_000):
+        return_value.add_error(add_error_data(ERROR_TWO, {"row": row}))
+
+    assert return_value.aggregate_errors(aggregator) is aggregator
+    assert not return_value.is_valid
+    assert list(return_value.errors) == [
+        ERROR_ONE,
+        add_error_data(ERROR_TWO, {"row": 0}),
+    ]
+    assert aggregator.counts() == Counter({"AGGREGATE_001": 1, "AGGREGATE_002": 1_000})
+    assert error_counts([return_value]) == Counter(
+        {"AGGREGATE_001": 1, "AGGREGATE_002": 1}
+    )
+
+
+def test_return_value_aggregate_errors_with_custom_aggregator():
+    """Ensure a provided aggregator is used with its limits."""
+    return_value: ReturnValueWithStatus[None] = ReturnValueWithStatus()
+    aggregator = return_value.aggregate_errors(ErrorAggregator(max_codes=1))
+    return_value.add_error(ERROR_ONE)
+    return_value.add_error(ERROR_TWO)
+    assert list(return_value.errors) == [ERROR_ONE]
+    assert aggregator.overflow == 1
+
+
+def test_aggregator_copy_is_independent():
+    """Ensure a copy keeps the counts and samples but is independent."""
+    aggregator = ErrorAggregator(max_codes=1, sample_size=3, seed=2)
+    for row in range(10):
+        aggregator.add_error(add_error_data(ERROR_ONE, {"row": row}))
+    aggregator.add_error(ERROR_TWO)
+
+    copied = aggregator.copy()
+    assert (copied.max_codes, copied.sample_size) == (1, 3)
+    assert copied.counts() == aggregator.counts()
+    assert copied.samples("AGGREGATE_001") == aggregator.samples("AGGREGATE_001")
+    assert copied.overflow == 1
+    assert not copied.is_valid
+
+    aggregator.add_error(ERROR_ONE)
+    assert copied.count("AGGREGATE_001") == 10
+
+
+def test_aggregator_merge():
+    """Ensure merging adds counts and overflow and keeps samples bounded."""
+    aggregator = ErrorAggregator(max_codes=1, sample_size=4, seed=3)
+    other = ErrorAggregator(sample_size=4, seed=4)
+    for row in range(100):
+        aggregator.add_error(add_error_data(ERROR_ONE, {"row": row}))
+        other.add_error(add_error_data(ERROR_ONE, {"row": 100 + row}))
+    other.add_error(ERROR_TWO)
+    other.add_error(ERROR_TWO)
+
+    aggregator.merge(other)
+    assert aggregator.count("AGGREGATE_001") == 200
+    assert aggregator.overflow == 2
+    assert aggregator.total == 202
+    samples = aggregator.samples("AGGREGATE_001")
+    assert len(samples) == 4
+    assert len({sample["row"] for sample in samples}) == 4
+    # merging does not change is_valid, nor the merged aggregator
+    assert not aggregator.is_valid
+    assert other.count("AGGREGATE_001") == 100
+
+
+def test_aggregator_merge_keeps_all_samples_that_fit():
+    """Ensure samples are only dropped beyond sample_size."""
+    aggregator = ErrorAggregator(sample_size=4)
+    other = ErrorAggregator(sample_size=4)
+    aggregator.append(add_error_data(ERROR_ONE, {"row": 0}))
+    other.append(add_error_data(ERROR_ONE, {"row": 1}))
+    other.append(ERROR_TWO)
+
+    aggregator.merge(other)
+    assert aggregator.samples("AGGREGATE_001") == [{"row": 0}, {"row": 1}]
+    assert [error.code for error in aggregator] == ["AGGREGATE_001", "AGGREGATE_002"]
+    assert aggregator.is_valid
+
+
+def test_return_value_combinators_copy_the_aggregator():
+    """Ensure values created from an aggregated one get a copy of its aggregator."""
+    return_value: ReturnValueWithStatus[int] = ReturnValueWithStatus(1)
+    aggregator = return_value.aggregate_errors()
+    return_value.add_error(ERROR_ONE, keep_current_status=True)
+
+    mapped = return_value.map(lambda result: result + 1)
+    mapped.add_error(ERROR_TWO)
+    assert mapped.result == 2
+    assert list(mapped.errors) == [ERROR_ONE, ERROR_TWO]
+    assert list(return_value.errors) == [ERROR_ONE]
+    assert aggregator.total == 1
+    assert return_value.is_valid
+
+
+def test_return_value_combinators_merge_aggregators():
+    """Ensure combining aggregated return values keeps counts and samples."""
+    aggregated: ReturnValueWithStatus[int] = ReturnValueWithStatus(1)
+    aggregated.aggregate_errors(ErrorAggregator(sample_size=10))
+    for row in range(5):
+        aggregated.add_error(
+            add_error_data(ERROR_ONE, {"row": row}), keep_current_status=True
+        )
+    listed: ReturnValueWithStatus[int] = ReturnValueWithStatus(2)
+    listed.add_error(add_error_data(ERROR_ONE, {"row": 5}), keep_current_status=True)
+    listed.add_error(ERROR_TWO, keep_current_status=True)
+
+    for combined, total, sampled in (
+        (ReturnValueWithStatus.collect([listed, aggregated, listed]), 9, 7),
+        (listed.merge(aggregated, aggregated), 12, 10),
+    ):
+        aggregator = combined._errors
+        assert isinstance(aggregator, ErrorAggregator)
+        assert combined.is_valid
+        assert aggregator.sample_size == 10
+        assert [error.code for error in combined.errors] == [
+            "AGGREGATE_001",
+            "AGGREGATE_002",
+        ]
+        assert aggregator.total == total
+        assert len(aggregator.samples("AGGREGATE_001")) == sampled
+
+    assert ReturnValueWithStatus.collect([listed, aggregated]).result == [2, 1]
+    assert aggregated._errors.total == 5  # type: ignore[attr-defined]
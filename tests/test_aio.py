@@ -0,0 +1,173 @@
+"""Tests for the asyncio helpers in errors.aio."""
+
+import asyncio
+
+import pytest
+
+from errors.aio import (
+    as_completed_with_status,
+    gather_with_status,
+    returns_status,
+)
+from errors.base import ErrorCode, ErrorsClassErrors
+from errors.data_classes import ReturnValueWithErrorStatus, ReturnValueWithStatus
+
+CUSTOM_ERROR = ErrorCode(code="AIO_001", description="custom async error")
+
+
+async def succeed(value, delay=0.0):
+    await asyncio.sleep(delay)
+    return value
+
+
+async def fail(message="boom", delay=0.0):
+    await asyncio.sleep(delay)
+    raise ValueError(message)
+
+
+def test_returns_status_wraps_result():
+    """Ensure the decorated coroutine returns its result in a return value."""
+    decorated = returns_status(succeed)
+    return_value = asyncio.run(decorated(1))
+    assert return_value == ReturnValueWithStatus(result=1)
+    assert decorated.__name__ == "succeed"
+
+
+def test_returns_status_keeps_return_values():
+    """Ensure a returned ReturnValueWithStatus is not wrapped again."""
+    error_value: ReturnValueWithStatus[None] = ReturnValueWithErrorStatus(CUSTOM_ERROR)
+    return_value = asyncio.run(returns_status(succeed)(error_value))
+    assert return_value is error_value
+
+
+def test_returns_status_converts_exceptions():
+    """Ensure exceptions become an invalid return value with error data."""
+    return_value = asyncio.run(returns_status(error=CUSTOM_ERROR)(fail)("bad input"))
+    assert not return_value.is_valid
+    error = return_value.errors[0]
+    assert error.code == CUSTOM_ERROR.code
+    assert error.error_data == {"exception": "ValueError", "message": "bad input"}
+
+
+def test_returns_status_default_error():
+    """Ensure the built-in unexpected exception error is used by default."""
+    return_value = asyncio.run(returns_status(fail)())
+    assert return_value.errors[0].code == "ER_ASYNC_00002"
+
+
+def test_gather_with_status_keeps_input_order():
+    """Ensure results are returned in input order, failures included."""
+    return_values = asyncio.run(
+        gather_with_status(succeed(1, 0.02), fail(), succeed(3), error=CUSTOM_ERROR)
+    )
+    assert [return_value.result for return_value in return_values] == [1, None, 3]
+    assert [return_value.is_valid for return_value in return_values] == [
+        True,
+        False,
+        True,
+    ]
+    assert return_values[1].errors[0].code == CUSTOM_ERROR.code
+
+
+def test_gather_with_status_maps_timeouts():
+    """Ensure awaitables exceeding the timeout get the timeout error."""
+    return_values = asyncio.run(
+        gather_with_status(succeed(1), succeed(2, 1.0), timeout=0.05)
+    )
+    assert return_values[0].is_valid
+    error = return_values[1].errors[0]
+    assert error.code == ErrorsClassErrors.TASK_TIMED_OUT.value.code
+    assert error.error_data == {"timeout": 0.05}
+
+
+def test_gather_with_status_keeps_timeout_errors_of_awaitables():
+    """Ensure a TimeoutError raised by an awaitable is not reported as timeout."""
+
+    async def time_out():
+        raise TimeoutError("upstream timed out")
+
+    for timeout in (None, 5.0):
+        (return_value,) = asyncio.run(gather_with_status(time_out(), timeout=timeout))
+        error = return_value.errors[0]
+        assert error.code == ErrorsClassErrors.UNEXPECTED_EXCEPTION.value.code
+        assert error.error_data == {
+            "exception": "TimeoutError",
+            "message": "upstream timed out",
+        }
+
+
+def test_gather_with_status_limits_concurrency():
+    """Ensure no more than *limit* awaitables run at the same time."""
+    running = 0
+    max_running = 0
+
+    async def track(value):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return value
+
+    return_values = asyncio.run(
+        gather_with_status(*(track(index) for index in range(20)), limit=3)
+    )
+    assert [return_value.result for return_value in return_values] == list(range(20))
+    assert max_running == 3
+
+
+def test_as_completed_with_status_yields_in_completion_order():
+    """Ensure results are yielded as they complete together with their index."""
+
+    async def collect():
+        awaitables = [succeed("slow", 0.1), fail(delay=0.02), succeed("fast")]
+        return [item async for item in as_completed_with_status(awaitables)]
+
+    completed = asyncio.run(collect())
+    assert [index for index, _ in completed] == [2, 1, 0]
+    assert completed[0][1].result == "fast"
+    assert not completed[1][1].is_valid
+
+
+def test_as_completed_with_status_cancels_pending_tasks():
+    """Ensure tasks are cancelled when iteration stops early."""
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def first():
+        iterator = as_completed_with_status([succeed(1), slow()])
+        async for item in iterator:
+            await iterator.aclose()
+            return item
+
+    index, return_value = asyncio.run(first())
+    assert (index, return_value.result) == (0, 1)
+    assert cancelled == [True]
+
+
+def test_as_completed_with_status_raises_cancellation_of_an_awaitable():
+    """Ensure a cancelled awaitable is raised instead of blocking the iteration."""
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def collect():
+        cancelled_future = asyncio.get_running_loop().create_future()
+        cancelled_future.cancel()
+        awaitables = [succeed(1), cancelled_future, slow()]
+        return [item async for item in as_completed_with_status(awaitables)]
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(asyncio.wait_for(collect(), timeout=5))
+    assert cancelled == [True]
@@ -0,0 +1,115 @@
+"""Tests for the columnar ReturnValueBatch container in errors.batch."""
+
+import pytest
+
+from errors.base import ErrorCode
+from errors.batch import ReturnValueBatch
+from errors.data_classes import ReturnValueWithErrorStatus, ReturnValueWithStatus
+
+ERROR_ONE = ErrorCode(code="BATCH_001", description="first batch error")
+ERROR_TWO = ErrorCode(code="BATCH_002", description="second batch error")
+
+
+@pytest.fixture
+def batch():
+    """Return a batch with five records, two of them invalid."""
+    batch = ReturnValueBatch(["a", "b", "c", "d", "e"])
+    batch.add_error(1, ERROR_ONE)
+    batch.add_error(3, ERROR_ONE)
+    batch.add_error(3, ERROR_TWO)
+    batch.add_error(4, ERROR_TWO, keep_current_status=True)
+    return batch
+
+
+def test_new_batch_is_empty_and_valid():
+    """Ensure a new batch has no records and is valid."""
+    batch: ReturnValueBatch[int] = ReturnValueBatch()
+    assert len(batch) == 0
+    assert batch.is_valid
+
+
+def test_append_and_extend_add_valid_records():
+    """Ensure append and extend add valid records and return their index."""
+    batch: ReturnValueBatch[int] = ReturnValueBatch()
+    assert batch.append(1) == 0
+    batch.extend([2, 3])
+    assert batch.results == [1, 2, 3]
+    assert batch.is_valid
+    assert batch.invalid_indices() == []
+
+
+def test_add_error_invalidates_record(batch):
+    """Ensure add_error makes a record invalid unless the status is kept."""
+    assert not batch.is_valid
+    assert not batch.record_is_valid(1)
+    assert batch.record_is_valid(4)
+    assert batch.record_errors(3) == [ERROR_ONE, ERROR_TWO]
+    assert batch.record_errors(0) == []
+
+
+def test_add_error_rejects_unknown_index(batch):
+    """Ensure errors can only be added to existing records."""
+    with pytest.raises(IndexError):
+        batch.add_error(5, ERROR_ONE)
+
+
+def test_invalid_and_error_indices(batch):
+    """Ensure invalid and error indices are returned in ascending order."""
+    assert batch.invalid_indices() == [1, 3]
+    assert batch.error_indices() == [1, 3, 4]
+
+
+def test_valid_results(batch):
+    """Ensure valid_results only returns results of valid records."""
+    assert batch.valid_results() == ["a", "c", "e"]
+
+
+def test_count_by_error_code(batch):
+    """Ensure error occurrences are counted per error code."""
+    assert batch.count_by_error_code() == {"BATCH_001": 2, "BATCH_002": 2}
+
+
+def test_getitem_returns_return_value_with_status(batch):
+    """Ensure indexing returns an equivalent ReturnValueWithStatus."""
+    return_value = batch[3]
+    assert isinstance(return_value, ReturnValueWithStatus)
+    assert return_value.result == "d"
+    assert not return_value.is_valid
+    assert return_value.errors == [ERROR_ONE, ERROR_TWO]
+    assert batch[-1].result == "e"
+
+
+def test_slice_returns_batch_of_the_selected_records(batch):
+    """Ensure slicing returns a new batch like slicing a list of return values."""
+    for index in (slice(1, 4), slice(None, None, -2), slice(3, None), slice(5, 9)):
+        sliced = batch[index]
+        assert isinstance(sliced, ReturnValueBatch)
+        assert list(sliced) == list(batch)[index]
+
+    sliced = batch[2:]
+    sliced.add_error(0, ERROR_ONE)
+    sliced.add_error(1, ERROR_ONE)
+    assert batch.record_errors(3) == [ERROR_ONE, ERROR_TWO]
+    assert batch.record_is_valid(2)
+
+
+def test_round_trip_with_return_values():
+    """Ensure conversion from and to ReturnValueWithStatus keeps all data."""
+    valid_with_error: ReturnValueWithStatus[str] = ReturnValueWithStatus(result="c")
+    valid_with_error.add_error(ERROR_TWO, keep_current_status=True)
+    return_values = [
+        ReturnValueWithStatus(result="a"),
+        ReturnValueWithErrorStatus(ERROR_ONE),
+        valid_with_error,
+    ]
+    batch = ReturnValueBatch.from_return_values(return_values)
+    assert batch.invalid_indices() == [1]
+    assert batch.to_return_values() == return_values
+    assert list(batch) == return_values
+
+
+def test_converted_return_values_do_not_share_error_lists(batch):
+    """Ensure adding errors to converted return values leaves the batch intact."""
+    return_value = batch.to_return_values()[1]
+    return_value.add_error(ERROR_TWO)
+    assert batch.record_errors(1) == [ERROR_ONE]
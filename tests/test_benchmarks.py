@@ -0,0 +1,82 @@
+"""Tests for the benchmark runner in benchmarks.runner."""
+
+import pytest
+
+from benchmarks.__main__ import main
+from benchmarks.runner import (
+    Benchmark,
+    compare_results,
+    load_benchmarks,
+    load_results,
+    run_benchmark,
+    save_results,
+)
+
+
+def results_with(**durations: float) -> dict:
+    """Return a minimal results dict with the given min_ns per benchmark."""
+    return {
+        "schema": 1,
+        "benchmarks": {name: {"min_ns": ns} for name, ns in durations.items()},
+    }
+
+
+def test_benchmarks_are_registered():
+    """Ensure the benchmark modules register the hot path benchmarks."""
+    names = load_benchmarks()
+    assert "list_errors.register_errors[100k]" in names
+    assert "mixin.error_description.miss" in names
+    assert "return_value.error_status" in names
+
+
+def test_run_benchmark_reports_duration_per_operation():
+    """Ensure run_benchmark divides timings by the number of operations."""
+    bench = Benchmark(name="noop", setup=lambda: lambda: None, number=10, repeat=2)
+    result = run_benchmark(bench)
+    assert result.repeat == 2
+    assert result.min_ns <= result.median_ns
+    assert result.ops_per_sec > 0
+
+
+def test_run_benchmark_keeps_info_of_setup():
+    """Ensure additional numbers returned by the setup end up in the result."""
+    bench = Benchmark(name="info", setup=lambda: (lambda: None, {"bytes": 10}))
+    assert run_benchmark(bench, quick=True).info == {"bytes": 10}
+    assert run_benchmark(Benchmark(name="noop", setup=lambda: lambda: None)).info == {}
+
+
+def test_compare_results_flags_regressions_above_tolerance():
+    """Ensure only benchmarks slower than the tolerance are regressions."""
+    baseline = results_with(fast=100.0, slow=100.0, removed=100.0)
+    current = results_with(fast=105.0, slow=150.0, added=100.0)
+    comparisons = compare_results(current, baseline, tolerance=0.10)
+    assert [comparison.name for comparison in comparisons] == ["fast", "slow"]
+    assert [comparison.regression for comparison in comparisons] == [False, True]
+    assert comparisons[1].ratio == pytest.approx(1.5)
+
+
+def test_results_round_trip_through_json(tmp_path):
+    """Ensure saved results can be loaded as a baseline."""
+    path = str(tmp_path / "results.json")
+    results = results_with(bench=1.0)
+    save_results(results, path)
+    assert load_results(path) == results
+
+
+def test_load_results_rejects_unknown_schema(tmp_path):
+    """Ensure results with another schema version are rejected."""
+    path = str(tmp_path / "results.json")
+    save_results({"schema": 0, "benchmarks": {}}, path)
+    with pytest.raises(ValueError):
+        load_results(path)
+
+
+def test_cli_runs_and_compares_against_baseline(tmp_path):
+    """Ensure the command line interface writes and compares results."""
+    path = str(tmp_path / "results.json")
+    args = ["--quick", "-k", "return_value.construct", "-o", path]
+    assert main(args) == 0
+    assert "return_value.construct.success" in load_results(path)["benchmarks"]
+    assert (
+        main(["--quick", "-k", "return_value.construct", "-c", path, "-t", "10"]) == 0
+    )
@@ -1,8 +1,24 @@
 """Tests for ErrorCode, BaseEnumerator and FunctionalErrorsBaseClass in errors.base."""
 
+import dataclasses
+import os
+import pickle
+import subprocess
+import sys
+from typing import Any
+
 import pytest
 
-from errors.base import BaseEnumerator, ErrorCode, ErrorsClassErrors, add_error_data
+import errors
+from errors.base import (
+    BaseEnumerator,
+    ErrorCode,
+    ErrorData,
+    ErrorsClassErrors,
+    FunctionalErrorsBaseClass,
+    add_error_data,
+)
+from errors.error import ListErrors
 
 
 def test_base_enumerators_class_exists():
@@ -55,3 +71,235 @@ def test_add_error_data():
     error = ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value
     error_data = {"data": "example"}
     assert add_error_data(error, error_data).error_data == error_data
+
+
+def test_add_error_data_equals_constructed_error():
+    """Ensure occurrences built by add_error_data match constructed ErrorCodes."""
+    error = ErrorCode(code="TEST_001", description="TEST")
+    occurrence = add_error_data(error, {"a": 1})
+    constructed = ErrorCode(code="TEST_001", description="TEST", error_data={"a": 1})
+    assert occurrence.__class__ is ErrorCode
+    assert occurrence == constructed
+    assert hash(occurrence) == hash(constructed)
+    assert isinstance(occurrence.error_data, ErrorData)
+    assert add_error_data(error, {}).error_data is error.error_data
+
+
+def test_error_data_is_stored_as_immutable_error_data():
+    """Ensure error_data is converted to an ErrorData that cannot be mutated."""
+    error = ErrorCode(code="TEST_001", description="TEST", error_data={"a": 1})
+    assert isinstance(error.error_data, ErrorData)
+    assert error.error_data == {"a": 1}
+    with pytest.raises(TypeError):
+        error.error_data["b"] = 2  # type: ignore[index]
+    with pytest.raises(TypeError):
+        error.error_data.update({"b": 2})
+
+
+def test_error_data_is_decoupled_from_provided_dict():
+    """Ensure mutating the dict passed as error_data does not change the error."""
+    error_data = {"a": 1}
+    error = add_error_data(
+        ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value, error_data
+    )
+    error_data["a"] = 2
+    assert error.error_data == {"a": 1}
+
+
+def test_error_code_is_hashable():
+    """Ensure equal ErrorCode instances have equal hashes and dedupe in sets."""
+    error = ErrorCode(code="TEST_001", description="TEST", error_data={"a": 1})
+    same_error = ErrorCode(code="TEST_001", description="TEST", error_data={"a": 1})
+    other_error = ErrorCode(code="TEST_001", description="TEST", error_data={"a": 2})
+    assert hash(error) == hash(same_error)
+    assert {error, same_error, other_error} == {error, other_error}
+
+
+def test_error_code_with_unhashable_error_data_is_hashable():
+    """Ensure error_data with unhashable values does not break hashing."""
+    error = ErrorCode(code="TEST_001", description="TEST", error_data={"a": [1]})
+    same_error = ErrorCode(code="TEST_001", description="TEST", error_data={"a": [1]})
+    assert hash(error) == hash(same_error)
+    assert error in {same_error}
+
+
+def test_error_code_hash_is_cached():
+    """Ensure the hash is computed once and stored on the instance."""
+    error = ErrorCode(code="TEST_001", description="TEST")
+    assert error._hash is None
+    error_hash = hash(error)
+    assert error._hash == error_hash
+
+
+def test_error_code_dataclass_fields():
+    """Ensure the cached hash is not one of the dataclass fields."""
+    error = ErrorCode(code="TEST_001", description="TEST", error_data={"a": 1})
+    hash(error)
+    assert [field.name for field in dataclasses.fields(error)] == [
+        "code",
+        "description",
+        "error_data",
+    ]
+    assert dataclasses.asdict(error) == {
+        "code": "TEST_001",
+        "description": "TEST",
+        "error_data": {"a": 1},
+    }
+    assert dataclasses.astuple(error) == ("TEST_001", "TEST", {"a": 1})
+    assert "_hash" not in repr(error)
+
+
+def test_error_code_equality():
+    """Ensure ErrorCode equality compares code, description and error_data."""
+    error = ErrorCode(code="TEST_001", description="TEST")
+    assert error == ErrorCode(code="TEST_001", description="TEST")
+    assert error != ErrorCode(code="TEST_002", description="TEST")
+    assert error != ErrorCode(code="TEST_001", description="OTHER")
+    assert error != ErrorCode(code="TEST_001", description="TEST", error_data={"a": 1})
+    assert error != "TEST_001"
+
+
+def test_pickled_error_code_does_not_carry_cached_hash():
+    """Ensure the cached hash is not pickled as it differs between processes."""
+    error = ErrorCode(code="TEST_001", description="TEST", error_data={"a": 1})
+    hash(error)
+    unpickled_error = pickle.loads(pickle.dumps(error))
+    assert unpickled_error == error
+    assert unpickled_error._hash is None
+    assert isinstance(unpickled_error.error_data, ErrorData)
+
+
+def test_pickled_registered_error_code_is_a_reference():
+    """Ensure registered errors unpickle to the registered instance."""
+    error = ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value
+    assert ListErrors.get_error(error.code) is error
+    assert pickle.loads(pickle.dumps(error)) is error
+
+
+def test_pickled_registered_error_code_carries_error_data():
+    """Ensure occurrences of registered errors share the registered strings."""
+    registered = ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value
+    assert ListErrors.get_error(registered.code) is registered
+    error = add_error_data(registered, {"code": "X_001"})
+    unpickled_error = pickle.loads(pickle.dumps(error))
+    assert unpickled_error == error
+    assert unpickled_error.description is registered.description
+    assert isinstance(unpickled_error.error_data, ErrorData)
+
+
+def test_pickled_occurrences_store_the_description_once():
+    """Ensure occurrences of a registered error reference one description."""
+    registered = ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value
+    assert ListErrors.get_error(registered.code) is registered
+    errors = [add_error_data(registered, {"index": index}) for index in range(10)]
+    pickled = pickle.dumps(errors)
+    assert pickled.count(registered.description.encode()) == 1
+    assert pickle.loads(pickled) == errors
+
+
+def test_pickled_error_code_with_other_description_is_not_a_reference():
+    """Ensure errors differing from the registered one are pickled in full."""
+    registered = ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value
+    error = ErrorCode(code=registered.code, description="other description")
+    unpickled_error = pickle.loads(pickle.dumps(error))
+    assert unpickled_error == error
+    assert unpickled_error is not registered
+
+
+def test_unpickling_unregistered_reference_returns_new_error_code():
+    """Ensure references to errors that are not registered still unpickle."""
+    from errors.base import _registered_error
+
+    error = _registered_error("NOT_REGISTERED_001", "not registered", {"a": 1})
+    assert error == ErrorCode(
+        code="NOT_REGISTERED_001", description="not registered", error_data={"a": 1}
+    )
+    registered = ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value
+    other = _registered_error(registered.code, "other description")
+    assert other == ErrorCode(code=registered.code, description="other description")
+
+
+def test_runtime_registered_error_unpickles_in_a_fresh_process():
+    """Ensure processes that did not register an error can unpickle it."""
+    error = ErrorCode(code="PICKLE_PLUGIN_001", description="plugin error")
+    ListErrors.register_error("PICKLE_PLUGIN_ERROR", error)
+    pickled = pickle.dumps(add_error_data(error, {"id": 1}))
+    source_dir = os.path.dirname(os.path.dirname(os.path.abspath(errors.__file__)))
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import pickle, sys; error = pickle.loads(sys.stdin.buffer.read()); "
+            "print(error.code, error.description, dict(error.error_data))",
+        ],
+        input=pickled,
+        env=dict(os.environ, PYTHONPATH=source_dir),
+        capture_output=True,
+        check=True,
+    ).stdout
+    assert output.decode().strip() == "PICKLE_PLUGIN_001 plugin error {'id': 1}"
+
+
+def test_enumerator_lookup_by_error_code_value():
+    """Ensure enumerator members can be looked up by their ErrorCode value."""
+    error = ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE
+    assert error.value in ErrorsClassErrors._value2member_map_
+    assert ErrorsClassErrors(error.value) is error
+
+
+class TableErrors(FunctionalErrorsBaseClass):
+    TABLE_ONE = ErrorCode(code="TABLE_001", description="first table error")
+    TABLE_TWO = ErrorCode(code="TABLE_002", description="second table error")
+    TABLE_ALIAS = ErrorCode(code="TABLE_001", description="first table error")
+
+
+def test_enumerator_tables_are_built_once():
+    """Ensure keys() and values() return the same tables on every call."""
+    assert TableErrors.keys() == ["TABLE_ONE", "TABLE_TWO", "TABLE_ALIAS"]
+    assert TableErrors.values() == [
+        TableErrors.TABLE_ONE.value,
+        TableErrors.TABLE_TWO.value,
+        TableErrors.TABLE_ONE.value,
+    ]
+    assert TableErrors.keys() is TableErrors.keys()
+    assert TableErrors.values() is TableErrors.values()
+    assert ErrorsClassErrors.keys() == list(ErrorsClassErrors.__members__)
+
+
+def test_enumerator_tables_are_immutable():
+    """Ensure the member tables cannot be changed by callers."""
+    keys = TableErrors.keys()
+    with pytest.raises(TypeError):
+        keys.append("TABLE_THREE")
+    with pytest.raises(TypeError):
+        keys[0] = "TABLE_THREE"
+    with pytest.raises(TypeError):
+        keys += ["TABLE_THREE"]
+    with pytest.raises(TypeError):
+        TableErrors.values().sort()
+    assert pickle.loads(pickle.dumps(keys)) == keys
+    assert keys + ["TABLE_THREE"] == [
+        "TABLE_ONE",
+        "TABLE_TWO",
+        "TABLE_ALIAS",
+        "TABLE_THREE",
+    ]
+
+
+def test_enumerator_member_by_code():
+    """Ensure members can be looked up by the code of their ErrorCode."""
+    assert TableErrors.member_by_code("TABLE_002") is TableErrors.TABLE_TWO
+    assert TableErrors.member_by_code("TABLE_001") is TableErrors.TABLE_ONE
+    assert TableErrors.member_by_code("UNKNOWN") is None
+    assert BaseEnumerator.member_by_code("TABLE_001") is None
+
+
+def test_functional_api_enumerator_tables():
+    """Ensure enumerators created with the functional API get their tables."""
+    error = ErrorCode(code="TABLE_FUNCTIONAL_001", description="functional")
+    enumerator: Any = FunctionalErrorsBaseClass(
+        "FunctionalErrors", {"FUNCTIONAL": error}
+    )  # type: ignore[call-arg]
+    assert enumerator.keys() == ["FUNCTIONAL"]
+    assert enumerator.values() == [error]
+    assert enumerator.member_by_code("TABLE_FUNCTIONAL_001") is enumerator["FUNCTIONAL"]
@@ -1,9 +1,20 @@
 """Tests for the ListErrors singleton registry in errors.error."""
 
+import threading
+from bisect import insort
+
 import pytest
 
-from errors.base import BaseEnumerator, ErrorCode, ErrorsClassErrors, is_error
-from errors.error import ListErrors
+from errors.base import (
+    BaseEnumerator,
+    ErrorCode,
+    ErrorsClassErrors,
+    FunctionalErrorsBaseClass,
+    _errors_with_prefix,
+    is_error,
+)
+from errors.error import ListErrors, RegistrationConflictError
+from errors.mixin import ErrorListByMixin
 
 
 def test_list_errors_class_exists():
@@ -37,6 +48,115 @@ def test_register_invalid_error_class_list_error():
         ListErrors.register_errors(errors=invalid_enumerator_class)  # type: ignore
 
 
+def test_register_errors_is_all_or_nothing():
+    """Ensure no error of an enumerator is registered if one of them is invalid."""
+
+    class MixedErrors(FunctionalErrorsBaseClass):
+        MIXED_VALID = ErrorCode(code="TEST_MIXED_001", description="valid")
+        MIXED_INVALID = "not an error code"
+
+    with pytest.raises(ValueError):
+        ListErrors.register_errors(MixedErrors)
+    assert ListErrors.get_error("TEST_MIXED_001") is None
+    assert not hasattr(ListErrors, "MIXED_VALID")
+
+
+def test_registration_publishes_a_new_index():
+    """Ensure registering several errors replaces the index instead of mutating it."""
+
+    class CopyOnWriteErrors(FunctionalErrorsBaseClass):
+        TEST_COW = ErrorCode(code="TEST_COW_001", description="copy on write")
+        TEST_COW_OTHER = ErrorCode(code="TEST_COW_002", description="copy on write")
+
+    index = ListErrors._errors
+    ListErrors.register_errors(CopyOnWriteErrors)
+    assert ListErrors._errors is not index
+    assert "TEST_COW_001" not in index
+    assert ListErrors.get_error("TEST_COW_001") is CopyOnWriteErrors.TEST_COW.value
+
+
+def test_single_registration_inserts_into_the_index():
+    """Ensure registering a single error does not copy the index."""
+    index = ListErrors._errors
+    error = ErrorCode(code="TEST_INSERT_001", description="inserted")
+    ListErrors.register_error(error_key="TEST_INSERT", error=error)
+    assert ListErrors._errors is index
+    assert index["TEST_INSERT_001"] is error
+    assert ListErrors.TEST_INSERT is error  # type: ignore[attr-defined]
+
+
+def test_single_registration_does_not_change_the_parent_index():
+    """Ensure a subclass without its own index gets a copy on registration."""
+
+    class ChildListErrors(ListErrors): ...
+
+    error = ErrorCode(code="TEST_CHILD_001", description="child")
+    ChildListErrors.register_error(error_key="TEST_CHILD", error=error)
+    assert ChildListErrors.get_error("TEST_CHILD_001") is error
+    assert "TEST_CHILD_001" not in ListErrors._errors
+
+
+def test_concurrent_readers_never_see_partial_registrations():
+    """Stress test registering enumerators while other threads look up codes."""
+    number_of_writers = 4
+    enumerators_per_writer = 25
+    codes_per_enumerator = 50
+    failures: list = []
+    writers_done = threading.Event()
+
+    def make_enumerator(writer: int, number: int):
+        prefix = f"TEST_STRESS_{writer}_{number}"
+        members = {
+            f"{prefix}_{index}": ErrorCode(
+                code=f"{prefix}_{index:03d}", description="x"
+            )
+            for index in range(codes_per_enumerator)
+        }
+        return FunctionalErrorsBaseClass(f"StressErrors{writer}_{number}", members)  # type: ignore[call-arg]
+
+    enumerators = [
+        [make_enumerator(writer, number) for number in range(enumerators_per_writer)]
+        for writer in range(number_of_writers)
+    ]
+    code_ranges = [
+        (f"TEST_STRESS_{writer}_{number}_000", f"TEST_STRESS_{writer}_{number}_049")
+        for writer in range(number_of_writers)
+        for number in range(enumerators_per_writer)
+    ]
+
+    def write(writer: int):
+        for enumerator in enumerators[writer]:
+            ListErrors.register_errors(enumerator)
+
+    def read():
+        try:
+            while not writers_done.is_set():
+                for first_code, last_code in code_ranges:
+                    result = ListErrors.lookup_many([first_code, last_code])
+                    if len(result.found) == 1:
+                        failures.append((first_code, last_code))
+        except Exception as exception:  # pragma: no cover
+            failures.append(exception)
+
+    readers = [threading.Thread(target=read) for _ in range(8)]
+    writers = [
+        threading.Thread(target=write, args=(writer,))
+        for writer in range(number_of_writers)
+    ]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    writers_done.set()
+    for thread in readers:
+        thread.join()
+
+    assert failures == []
+    for first_code, last_code in code_ranges:
+        assert ListErrors.get_error(first_code) is not None
+        assert ListErrors.get_error(last_code) is not None
+
+
 def test_error_description_for_undefined_error_code_raises_exception():
     """Ensure error_description raises KeyError for an unregistered code."""
     non_existing_error_code = "non existing"
@@ -50,6 +170,42 @@ def test_error_description_retrieved_for_existing_error_code():
     assert ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value.description == description
 
 
+def test_registry_indexes_full_error_code_objects():
+    """Ensure the registry maps codes to the registered ErrorCode instances."""
+    error = ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value
+    assert ListErrors._errors["ER_GETERROR_00001"] is error
+
+
+def test_get_error_returns_registered_error_code():
+    """Ensure get_error returns the ErrorCode instance for a registered code."""
+    error = ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value
+    assert ListErrors.get_error("ER_GETERROR_00001") is error
+
+
+def test_get_error_returns_none_for_unknown_code():
+    """Ensure get_error returns None instead of raising for an unknown code."""
+    assert ListErrors.get_error("non existing") is None
+
+
+def test_lookup_many_reports_found_and_missing_codes():
+    """Ensure lookup_many resolves known codes and reports unknown ones once."""
+    error = ErrorCode(code="TEST_LOOKUP_001", description="lookup")
+    ListErrors.register_error(error_key="TEST_LOOKUP", error=error)
+    result = ListErrors.lookup_many(
+        ["TEST_LOOKUP_001", "UNKNOWN_2", "UNKNOWN_1", "UNKNOWN_2", "TEST_LOOKUP_001"]
+    )
+    assert result.found == {"TEST_LOOKUP_001": error}
+    assert result.found["TEST_LOOKUP_001"] is error
+    assert result.missing == ["UNKNOWN_2", "UNKNOWN_1"]
+
+
+def test_lookup_many_accepts_generators():
+    """Ensure lookup_many consumes any iterable of codes."""
+    result = ListErrors.lookup_many(code for code in ["ER_GETERROR_00001"])
+    assert list(result.found) == ["ER_GETERROR_00001"]
+    assert result.missing == []
+
+
 def test_is_error_returns_false():
     """Ensure is_error returns False for a non-ErrorCode object."""
     assert not is_error("1")
@@ -67,3 +223,291 @@ def test_is_error_returns_true_on_error_code_sub_class():
         pass
 
     assert is_error(ErrorCodeSubClass("code", "description"))
+
+
+def make_id_registry():
+    """Return a ListErrors subclass with its own, empty registry and IDs."""
+
+    class IdListErrors(ListErrors):
+        _errors: dict = {}
+        _error_ids: dict = {}
+        _errors_by_id: list = []
+        _sorted_codes: list = []
+
+    return IdListErrors
+
+
+class IdErrors(FunctionalErrorsBaseClass):
+    ID_ONE = ErrorCode(code="TEST_ID_001", description="first id error")
+    ID_TWO = ErrorCode(code="TEST_ID_002", description="second id error")
+
+
+def test_builtin_errors_have_the_first_ids():
+    """Ensure the built-in errors get IDs before any other registered error."""
+    builtin_codes = [member.value.code for member in ErrorsClassErrors]
+    assert ListErrors.export_error_ids()[: len(builtin_codes)] == builtin_codes
+    assert ListErrors.get_error_id("ER_GETERROR_00001") == 0
+    assert (
+        ListErrors.get_error_by_id(0)
+        is ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value
+    )
+
+
+def test_registered_errors_get_dense_ids():
+    """Ensure registered codes get dense IDs in registration order."""
+    registry = make_id_registry()
+    registry.register_errors(IdErrors)
+    registry.register_error("ID_THREE", ErrorCode("TEST_ID_003", "third id error"))
+
+    assert registry.export_error_ids() == ["TEST_ID_001", "TEST_ID_002", "TEST_ID_003"]
+    assert registry.get_error_id("TEST_ID_002") == 1
+    assert registry.get_error_id(IdErrors.ID_TWO.value) == 1
+    assert registry.get_error_id("UNKNOWN") is None
+    assert registry.get_error_by_id(0) is IdErrors.ID_ONE.value
+    assert registry.get_error_by_id(3) is None
+    assert registry.get_error_by_id(-1) is None
+
+
+def test_error_ids_are_stable_when_registering_again():
+    """Ensure re-registering a code keeps its ID and updates the error."""
+    registry = make_id_registry()
+    registry.register_errors(IdErrors)
+    replacement = ErrorCode(code="TEST_ID_001", description="replaced")
+    registry.register_error("ID_ONE", replacement)
+
+    assert registry.get_error_id("TEST_ID_001") == 0
+    assert registry.get_error_by_id(0) is replacement
+    assert len(registry.export_error_ids()) == 2
+
+
+def test_error_ids_are_appended_for_new_codes():
+    """Ensure registering appends IDs instead of rebuilding the ID tables."""
+    registry = make_id_registry()
+    registry.register_errors(IdErrors)
+    error_ids = registry._error_ids
+    errors_by_id = registry._errors_by_id
+    registry.register_error("ID_THREE", ErrorCode("TEST_ID_003", "third id error"))
+
+    assert registry._error_ids is error_ids
+    assert registry._errors_by_id is errors_by_id
+    assert registry.get_error_by_id(2) == ErrorCode("TEST_ID_003", "third id error")
+    assert "TEST_ID_003" not in ListErrors._error_ids
+
+
+def test_import_error_ids():
+    """Ensure imported IDs are used and new codes get the next free IDs."""
+    registry = make_id_registry()
+    registry.register_error("ID_THREE", ErrorCode("TEST_ID_003", "third id error"))
+    registry.register_errors(IdErrors)
+
+    registry.import_error_ids(["TEST_ID_001", "TEST_ID_002", "TEST_ID_UNKNOWN"])
+
+    assert registry.export_error_ids() == [
+        "TEST_ID_001",
+        "TEST_ID_002",
+        "TEST_ID_UNKNOWN",
+        "TEST_ID_003",
+    ]
+    assert registry.get_error_by_id(1) is IdErrors.ID_TWO.value
+    assert registry.get_error_by_id(2) is None
+    assert registry.get_error_by_id(3) == ErrorCode("TEST_ID_003", "third id error")
+
+
+def test_import_error_ids_rejects_duplicate_codes():
+    """Ensure an export with duplicate codes raises ValueError."""
+    registry = make_id_registry()
+    with pytest.raises(ValueError):
+        registry.import_error_ids(["TEST_ID_001", "TEST_ID_001"])
+
+
+class PrefixErrors(FunctionalErrorsBaseClass):
+    API_ONE = ErrorCode(code="ER_API404_00001", description="api not found")
+    API_TWO = ErrorCode(code="ER_API404_00002", description="api gone")
+    API_OTHER = ErrorCode(code="ER_API4040_00001", description="other api")
+    DB_ONE = ErrorCode(code="ER_DB_00001", description="db error")
+
+
+def test_errors_with_prefix():
+    """Ensure prefix queries return the matching errors ordered by code."""
+    registry = make_id_registry()
+    registry.register_errors(PrefixErrors)
+    assert registry.errors_with_prefix("ER_API404") == [
+        PrefixErrors.API_OTHER.value,
+        PrefixErrors.API_ONE.value,
+        PrefixErrors.API_TWO.value,
+    ]
+    assert registry.errors_with_prefix("ER_DB_") == [PrefixErrors.DB_ONE.value]
+    assert registry.errors_with_prefix("ER_X") == []
+    assert registry.errors_with_prefix("ZZ") == []
+    assert len(registry.errors_with_prefix("")) == 4
+
+
+def test_errors_in_namespace():
+    """Ensure namespace queries only match complete namespaces."""
+    registry = make_id_registry()
+    registry.register_errors(PrefixErrors)
+    assert registry.errors_in_namespace("ER_API404") == [
+        PrefixErrors.API_ONE.value,
+        PrefixErrors.API_TWO.value,
+    ]
+    assert registry.errors_in_namespace("ER_API404", separator="0") == [
+        PrefixErrors.API_OTHER.value
+    ]
+
+
+def test_prefix_index_is_updated_on_registration():
+    """Ensure codes registered later are found and replacements are returned."""
+    registry = make_id_registry()
+    registry.register_errors(PrefixErrors)
+    added = ErrorCode(code="ER_API404_00000", description="added later")
+    registry.register_error("API_ZERO", added)
+    replaced = ErrorCode(code="ER_DB_00001", description="replaced")
+    registry.register_error("DB_ONE", replaced)
+
+    assert registry.errors_in_namespace("ER_API404")[0] is added
+    assert registry.errors_in_namespace("ER_DB") == [replaced]
+    assert registry._sorted_codes == sorted(registry._errors)
+
+
+def test_single_registration_inserts_into_the_prefix_index():
+    """Ensure a single new code is inserted instead of copying the sorted codes."""
+    registry = make_id_registry()
+    registry.register_errors(PrefixErrors)
+    sorted_codes = registry._sorted_codes
+    registry.register_error("API_ZERO", ErrorCode("ER_API404_00000", "added later"))
+    assert registry._sorted_codes is sorted_codes
+    assert registry._sorted_codes == sorted(registry._errors)
+
+
+def test_errors_with_prefix_tolerates_concurrent_inserts():
+    """Ensure codes inserted while querying do not repeat or hide matches."""
+
+    class InsertingCodes(list):
+        calls = 0
+
+        def __len__(self):
+            # the first call is made by the binary search, insert before the
+            # first match once the query iterates
+            self.calls += 1
+            if self.calls == 2:
+                insort(self, "ER_API000_00001")
+                insort(self, "ER_API404_00000")
+            return list.__len__(self)
+
+    errors_by_code = {error.code: error for error in PrefixErrors.values()}
+    sorted_codes = InsertingCodes(sorted(errors_by_code))
+    errors = _errors_with_prefix(sorted_codes, errors_by_code, "ER_API404_")
+    assert [error.code for error in errors] == ["ER_API404_00001", "ER_API404_00002"]
+
+
+def test_builtin_errors_in_namespace():
+    """Ensure the built-in errors are found by prefix in the global registry."""
+    assert ListErrors.errors_in_namespace("ER_GETERROR") == [
+        ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value
+    ]
+
+
+class BulkErrors(FunctionalErrorsBaseClass):
+    BULK_ONE = ErrorCode(code="TEST_BULK_001", description="first bulk error")
+    BULK_TWO = ErrorCode(code="TEST_BULK_002", description="second bulk error")
+
+
+class BulkBaseCodes:
+    BULK_THREE = ErrorCode(code="TEST_BULK_003", description="third bulk error")
+
+
+class BulkCodes(BulkBaseCodes):
+    BULK_FOUR = ErrorCode(code="TEST_BULK_004", description="fourth bulk error")
+
+
+class BulkMixinErrors(ErrorListByMixin, BulkCodes):
+    BULK_FIVE = ErrorCode(code="TEST_BULK_005", description="fifth bulk error")
+
+
+def test_register_many_registers_enumerators_and_classes():
+    """Ensure enumerators, plain classes and mixin classes are registered."""
+    registry = make_id_registry()
+    conflicts = registry.register_many([BulkErrors, BulkMixinErrors])
+
+    assert conflicts == []
+    assert registry.BULK_ONE is BulkErrors.BULK_ONE.value  # type: ignore[attr-defined]
+    assert registry.BULK_THREE is BulkBaseCodes.BULK_THREE  # type: ignore[attr-defined]
+    assert registry.get_error("TEST_BULK_005") is BulkMixinErrors.BULK_FIVE
+    assert registry.export_error_ids() == [
+        "TEST_BULK_001",
+        "TEST_BULK_002",
+        "TEST_BULK_003",
+        "TEST_BULK_004",
+        "TEST_BULK_005",
+    ]
+    assert registry._enumerators[-2:] == (BulkErrors, BulkMixinErrors)
+
+
+def test_register_many_accepts_the_same_errors_again():
+    """Ensure registering an error again, even under another name, is allowed."""
+    registry = make_id_registry()
+    registry.register_errors(BulkErrors)
+
+    class Aliases:
+        BULK_ALIAS = BulkErrors.BULK_ONE.value
+
+    assert registry.register_many([BulkErrors, BulkCodes, BulkCodes, Aliases]) == []
+    assert registry.BULK_ALIAS is BulkErrors.BULK_ONE.value  # type: ignore[attr-defined]
+    assert len(registry.export_error_ids()) == 4
+
+
+class CodeClash:
+    BULK_CLASH = ErrorCode(code="TEST_BULK_001", description="same code")
+
+
+class NameClash:
+    BULK_THREE = ErrorCode(code="TEST_BULK_006", description="same name")
+
+
+class ShadowClash:
+    get_error = ErrorCode(code="TEST_BULK_007", description="shadows a method")
+
+
+def test_register_many_strict_reports_all_conflicts():
+    """Ensure all conflicts are reported and nothing is registered."""
+    registry = make_id_registry()
+    with pytest.raises(RegistrationConflictError) as exc_info:
+        registry.register_many(
+            [BulkErrors, BulkCodes, CodeClash, NameClash, ShadowClash]
+        )
+
+    conflicts = exc_info.value.conflicts
+    assert [(c.kind, c.name, c.source) for c in conflicts] == [
+        ("code", "TEST_BULK_001", CodeClash),
+        ("attribute", "BULK_THREE", NameClash),
+        ("attribute", "get_error", ShadowClash),
+    ]
+    assert conflicts[0].existing is BulkErrors.BULK_ONE.value
+    assert conflicts[0].error is CodeClash.BULK_CLASH
+    assert "TEST_BULK_001" in str(exc_info.value)
+    assert isinstance(exc_info.value, ValueError)
+    assert registry.export_error_ids() == []
+    assert registry.get_error("TEST_BULK_002") is None
+
+
+def test_register_many_detects_conflicts_with_registered_errors():
+    """Ensure errors conflicting with earlier registrations are reported."""
+    registry = make_id_registry()
+    registry.register_many([BulkCodes])
+    conflicts = registry.register_many([BulkErrors, CodeClash, NameClash], strict=False)
+
+    assert [conflict.source for conflict in conflicts] == [CodeClash, NameClash]
+    assert registry.BULK_THREE is BulkBaseCodes.BULK_THREE  # type: ignore[attr-defined]
+    assert registry.BULK_ONE is BulkErrors.BULK_ONE.value  # type: ignore[attr-defined]
+    assert registry.get_error("TEST_BULK_006") is None
+    conflicts = registry.register_many([CodeClash], strict=False)
+    assert [conflict.kind for conflict in conflicts] == ["code"]
+    assert registry.get_error("TEST_BULK_001") is BulkErrors.BULK_ONE.value
+
+
+def test_register_many_rejects_non_classes():
+    """Ensure sources that are not classes raise ValueError."""
+    registry = make_id_registry()
+    with pytest.raises(ValueError):
+        registry.register_many([BulkErrors.BULK_ONE])  # type: ignore[list-item]
+    assert registry.export_error_ids() == []
@@ -0,0 +1,151 @@
+"""Tests for the exception type -> ErrorCode mapping in errors.exception_map."""
+
+import asyncio
+
+import pytest
+
+from errors.base import ErrorCode, add_error_data
+from errors.data_classes import ReturnValueWithErrorStatus, ReturnValueWithStatus
+from errors.exception_map import ExceptionMap
+from errors.exceptions import raise_error
+
+LOOKUP_ERROR = ErrorCode(code="EXCMAP_001", description="lookup failed")
+KEY_ERROR = ErrorCode(code="EXCMAP_002", description="key not found")
+DEFAULT_ERROR = ErrorCode(code="EXCMAP_003", description="unexpected")
+RAISED_ERROR = ErrorCode(code="EXCMAP_004", description="raised error code")
+
+
+class MissingKey(KeyError):
+    pass
+
+
+def make_map(**kwargs):
+    return ExceptionMap({LookupError: LOOKUP_ERROR, KeyError: KEY_ERROR}, **kwargs)
+
+
+def test_error_for_resolves_through_the_mro():
+    """Ensure the most specific mapped class of the MRO is used."""
+    exception_map = make_map()
+    assert exception_map.error_for(KeyError) is KEY_ERROR
+    assert exception_map.error_for(MissingKey) is KEY_ERROR
+    assert exception_map.error_for(IndexError) is LOOKUP_ERROR
+    assert exception_map.error_for(ValueError) is None
+    assert make_map(default=DEFAULT_ERROR).error_for(ValueError) is DEFAULT_ERROR
+
+
+def test_error_for_is_cached_per_type():
+    """Ensure resolved types are cached and registrations reset the cache."""
+    exception_map = make_map()
+    exception_map.error_for(MissingKey)
+    exception_map.error_for(ValueError)
+    assert exception_map._cache == {MissingKey: KEY_ERROR, ValueError: None}
+
+    exception_map.register(MissingKey, DEFAULT_ERROR)
+    assert exception_map._cache == {}
+    assert exception_map.error_for(MissingKey) is DEFAULT_ERROR
+
+
+def test_register_rejects_invalid_entries():
+    """Ensure non exception types and non ErrorCode values raise ValueError."""
+    with pytest.raises(ValueError):
+        ExceptionMap({int: LOOKUP_ERROR})  # type: ignore[dict-item]
+    with pytest.raises(ValueError):
+        ExceptionMap({KeyError: "EXCMAP_001"})  # type: ignore[dict-item]
+
+
+def test_to_return_value_adds_exception_data():
+    """Ensure exceptions become invalid return values with error data."""
+    return_value = make_map().to_return_value(MissingKey("name"))
+    assert return_value == ReturnValueWithErrorStatus(
+        add_error_data(KEY_ERROR, {"exception": "MissingKey", "message": "'name'"})
+    )
+    assert make_map().to_return_value(ValueError()) is None
+    without_data = make_map(error_data=None).to_return_value(KeyError())
+    assert without_data is not None
+    assert without_data.errors[0] is KEY_ERROR
+
+
+def test_error_code_exceptions_keep_their_error():
+    """Ensure exceptions of errors.exceptions are returned with their error."""
+    exception_map = ExceptionMap({Exception: DEFAULT_ERROR})
+    error = add_error_data(RAISED_ERROR, {"id": 1})
+
+    @exception_map.returns_status
+    def fail():
+        raise_error(error)
+
+    assert fail().errors == [error]
+
+
+@pytest.fixture
+def exception_map():
+    return make_map()
+
+
+def test_returns_status_function(exception_map):
+    """Ensure functions return results, return values and mapped errors."""
+
+    @exception_map.returns_status
+    def load(value):
+        """Load a value."""
+        if isinstance(value, BaseException):
+            raise value
+        return value
+
+    assert load(1) == ReturnValueWithStatus(result=1)
+    error_value: ReturnValueWithStatus[None] = ReturnValueWithErrorStatus(DEFAULT_ERROR)
+    assert load(error_value) is error_value
+    assert load(KeyError("x")).errors[0].code == "EXCMAP_002"
+    with pytest.raises(ValueError):
+        load(ValueError("not mapped"))
+    assert load.__name__ == "load"
+    assert load.__doc__ == "Load a value."
+
+
+def test_returns_status_generator(exception_map):
+    """Ensure generators yield wrapped items and end with a mapped error."""
+
+    @exception_map.returns_status
+    def rows(fail_with):
+        yield 1
+        yield ReturnValueWithStatus(result=2)
+        raise fail_with
+
+    items = list(rows(IndexError()))
+    assert [item.result for item in items[:2]] == [1, 2]
+    assert items[2].errors[0].code == "EXCMAP_001"
+    assert not items[2].is_valid
+    with pytest.raises(ValueError):
+        list(rows(ValueError()))
+
+
+def test_returns_status_coroutine(exception_map):
+    """Ensure coroutines return wrapped results and mapped errors."""
+
+    @exception_map.returns_status
+    async def fetch(value):
+        await asyncio.sleep(0)
+        if isinstance(value, BaseException):
+            raise value
+        return value
+
+    assert asyncio.run(fetch(1)) == ReturnValueWithStatus(result=1)
+    assert asyncio.run(fetch(KeyError())).errors[0].code == "EXCMAP_002"
+    with pytest.raises(ValueError):
+        asyncio.run(fetch(ValueError()))
+
+
+def test_returns_status_async_generator(exception_map):
+    """Ensure asynchronous generators yield wrapped items and mapped errors."""
+
+    @exception_map.returns_status
+    async def rows():
+        yield 1
+        raise KeyError("row")
+
+    async def collect():
+        return [item async for item in rows()]
+
+    items = asyncio.run(collect())
+    assert items[0] == ReturnValueWithStatus(result=1)
+    assert items[1].errors[0].code == "EXCMAP_002"
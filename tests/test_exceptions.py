@@ -0,0 +1,128 @@
+"""Tests for the ErrorCode exception bridge in errors.exceptions."""
+
+import pickle
+
+import pytest
+
+from errors.base import ErrorCode, FunctionalErrorsBaseClass, add_error_data
+from errors.error import ListErrors
+from errors.exceptions import (
+    ErrorCodeException,
+    error_from_exception,
+    exception_class,
+    raise_error,
+    to_exception,
+)
+
+
+class ExceptionErrors(FunctionalErrorsBaseClass):
+    NOT_FOUND = ErrorCode(code="EXC_404.001", description="record not found")
+    FORBIDDEN = ErrorCode(code="EXC_403.001", description="record forbidden")
+
+
+ListErrors.register_errors(ExceptionErrors)
+
+NOT_FOUND = ExceptionErrors.NOT_FOUND.value
+FORBIDDEN = ExceptionErrors.FORBIDDEN.value
+UNREGISTERED = ErrorCode(code="EXC_UNREGISTERED", description="not registered")
+
+
+def test_exception_class_is_cached_per_code():
+    """Ensure every code gets one exception class, also looked up by code."""
+    exception = exception_class(NOT_FOUND)
+    assert exception is exception_class("EXC_404.001")
+    assert exception is exception_class(add_error_data(NOT_FOUND, {"id": 1}))
+    assert exception is not exception_class(FORBIDDEN)
+    assert issubclass(exception, ErrorCodeException)
+    assert exception.__name__ == "EXC_404_001Error"
+    assert exception.error_code is NOT_FOUND
+
+
+def test_exception_class_of_unregistered_errors():
+    """Ensure unregistered errors get a class, unknown code strings raise."""
+    assert exception_class(UNREGISTERED).error_code is UNREGISTERED
+    with pytest.raises(KeyError):
+        exception_class("EXC_UNKNOWN")
+
+
+def test_raise_error_and_convert_back():
+    """Ensure raised errors are caught by code and converted back."""
+    error = add_error_data(NOT_FOUND, {"id": 42})
+    with pytest.raises(exception_class(NOT_FOUND)) as exc_info:
+        raise_error(error)
+    assert error_from_exception(exc_info.value) is error
+    assert str(exc_info.value) == "EXC_404.001: record not found {'id': 42}"
+    assert error_from_exception(ValueError("other")) is None
+
+    with pytest.raises(ErrorCodeException) as exc_info:
+        raise_error(FORBIDDEN)
+    assert not isinstance(exc_info.value, exception_class(NOT_FOUND))
+    assert str(exc_info.value) == "EXC_403.001: record forbidden"
+
+
+def test_exception_validates_error():
+    """Ensure exceptions default to their error and reject other codes."""
+    exception = exception_class(NOT_FOUND)
+    assert exception().error is NOT_FOUND
+    assert to_exception(FORBIDDEN).error is FORBIDDEN
+    assert ErrorCodeException(UNREGISTERED).error is UNREGISTERED
+    with pytest.raises(ValueError):
+        exception(FORBIDDEN)
+    with pytest.raises(ValueError):
+        ErrorCodeException()
+
+
+def test_fast_raise_reuses_instance_without_old_tracebacks():
+    """Ensure fast raises reuse one instance and drop earlier tracebacks."""
+    caught = []
+    for _ in range(3):
+        try:
+            raise_error(NOT_FOUND, fast=True)
+        except ErrorCodeException as exc:
+            caught.append(exc)
+            depth = 0
+            traceback = exc.__traceback__
+            while traceback is not None:
+                depth += 1
+                traceback = traceback.tb_next
+            assert depth == 2
+    assert caught[0] is caught[1] is caught[2]
+    assert caught[0].error is NOT_FOUND
+    assert caught[0].__suppress_context__
+
+
+def test_fast_raise_does_not_accumulate_notes_and_context():
+    """Ensure state left on the shared instance by earlier raises is cleared."""
+    for _ in range(3):
+        try:
+            try:
+                raise KeyError("handled")
+            except KeyError:
+                raise_error(NOT_FOUND, fast=True)
+        except ErrorCodeException as exc:
+            exc.add_note("handled once")
+            assert exc.__notes__ == ["handled once"]
+            assert isinstance(exc.__context__, KeyError)
+
+    with pytest.raises(ErrorCodeException) as exc_info:
+        raise_error(NOT_FOUND, fast=True)
+    assert not hasattr(exc_info.value, "__notes__")
+    assert exc_info.value.__context__ is None
+
+
+def test_fast_raise_with_error_data_creates_instances():
+    """Ensure fast raises of errors with data keep their error_data."""
+    error = add_error_data(NOT_FOUND, {"id": 1})
+    with pytest.raises(exception_class(NOT_FOUND)) as exc_info:
+        raise_error(error, fast=True)
+    assert exc_info.value.error is error
+    assert exc_info.value is not exception_class(NOT_FOUND)._fast_instance
+
+
+def test_exceptions_are_picklable():
+    """Ensure exceptions unpickle to the cached class with their error."""
+    exception = pickle.loads(
+        pickle.dumps(to_exception(add_error_data(NOT_FOUND, {"id": 1})))
+    )
+    assert type(exception) is exception_class(NOT_FOUND)
+    assert exception.error == add_error_data(NOT_FOUND, {"id": 1})
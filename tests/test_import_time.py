@@ -0,0 +1,91 @@
+"""Import-time regression tests for the errors package.
+
+Each test runs a fresh interpreter, as modules imported by other tests are
+already cached in the test process.
+"""
+
+import os
+import subprocess
+import sys
+
+import errors
+
+# generous budget for ``import errors`` including compiling it to bytecode
+IMPORT_TIME_BUDGET_US = 20_000
+
+SOURCE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(errors.__file__)))
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    """Run a fresh interpreter that imports errors from the tested sources."""
+    environment = dict(os.environ, PYTHONPATH=SOURCE_DIR)
+    return subprocess.run(
+        [sys.executable, *args],
+        env=environment,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def imported_modules(statement: str) -> dict:
+    """Return module name -> cumulative import time (us) for *statement*."""
+    output = run_python("-X", "importtime", "-c", statement).stderr
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def test_import_errors_does_not_import_submodules_or_stdlib_modules():
+    """Ensure importing the package only imports the package module itself."""
+    startup_modules = set(imported_modules("pass"))
+    new_modules = set(imported_modules("import errors")) - startup_modules
+    assert new_modules == {"errors"}
+
+
+def test_import_errors_stays_within_time_budget():
+    """Ensure the cumulative import time of the package stays within budget."""
+    assert imported_modules("import errors")["errors"] < IMPORT_TIME_BUDGET_US
+
+
+def test_error_code_access_does_not_import_registries():
+    """Ensure using ErrorCode only imports the modules it needs."""
+    modules = imported_modules("import errors; errors.ErrorCode")
+    assert "errors.base" in modules
+    assert "errors.error" not in modules
+    assert "errors.mixin" not in modules
+    assert "errors.data_classes" not in modules
+
+
+def test_public_names_resolve_lazily():
+    """Ensure all public names can be accessed and unknown names raise."""
+    for name in errors.__all__:
+        assert getattr(errors, name) is not None
+    assert set(errors.__all__) <= set(dir(errors))
+    assert not hasattr(errors, "DOES_NOT_EXIST")
+
+
+def test_builtin_errors_are_registered_on_first_use():
+    """Ensure built-in errors are not registered on import but on first use."""
+    script = (
+        "from errors.error import ListErrors\n"
+        "assert not ListErrors._builtins_registered\n"
+        "assert ListErrors.error_description('ER_GETERROR_00001')\n"
+        "assert ListErrors._builtins_registered\n"
+    )
+    run_python("-c", script)
+
+
+def test_builtin_errors_are_registered_on_attribute_access():
+    """Ensure built-in errors are accessible as attribute without prior use."""
+    script = (
+        "from errors.error import ListErrors\n"
+        "error = ListErrors.COULD_NOT_FIND_ERROR_CODE\n"
+        "assert error.code == 'ER_GETERROR_00001'\n"
+        "assert not hasattr(ListErrors, 'DOES_NOT_EXIST')\n"
+    )
+    run_python("-c", script)
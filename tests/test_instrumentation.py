@@ -0,0 +1,181 @@
+"""Tests for the opt-in registry lookup instrumentation in errors.instrumentation."""
+
+import gc
+import threading
+import weakref
+
+import pytest
+
+from errors import instrumentation
+from errors.base import ErrorCode, ErrorsClassErrors
+from errors.error import ListErrors
+from errors.mixin import ErrorListByMixin
+
+LIST_ERRORS = "errors.error.ListErrors"
+BUILTIN_CODE = ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value.code
+
+
+class InstrumentedErrors:
+    ERROR_ONE = ErrorCode(code="INSTR_001", description="first instrumented error")
+
+
+class InstrumentedMixinErrors(ErrorListByMixin, InstrumentedErrors): ...
+
+
+MIXIN_ERRORS = f"{__name__}.InstrumentedMixinErrors"
+
+
+@pytest.fixture
+def enabled_instrumentation():
+    """Enable the instrumentation with clean stats, disable it afterwards."""
+    ListErrors.get_error(BUILTIN_CODE)
+    instrumentation.reset()
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def look_up_descriptions():
+    ListErrors.error_description(BUILTIN_CODE)
+    InstrumentedMixinErrors.error_description("INSTR_001")
+    InstrumentedMixinErrors.error_description("INSTR_001")
+    for registry in (ListErrors, InstrumentedMixinErrors):
+        with pytest.raises(KeyError):
+            registry.error_description("INSTR_UNKNOWN")
+
+
+def test_instrumentation_disabled_by_default():
+    """Ensure nothing is recorded while the instrumentation is disabled."""
+    instrumentation.reset()
+    assert not instrumentation.is_enabled()
+    look_up_descriptions()
+    InstrumentedMixinErrors.invalidate_errors_list()
+    assert instrumentation.snapshot() == instrumentation.InstrumentationSnapshot()
+
+
+def test_instrumentation_counts_hits_and_misses(enabled_instrumentation):
+    """Ensure lookups are counted per registry class as hits and misses."""
+    assert instrumentation.is_enabled()
+    look_up_descriptions()
+    registries = instrumentation.snapshot().registries
+    assert set(registries) == {LIST_ERRORS, MIXIN_ERRORS}
+
+    stats = registries[MIXIN_ERRORS]
+    assert (stats.hits, stats.misses, stats.not_found) == (2, 1, 1)
+    assert stats.lookups == 3
+    # the index was built when the class was created, misses do not rebuild it
+    assert stats.regenerations == 0
+
+    stats = registries[LIST_ERRORS]
+    assert (stats.hits, stats.misses, stats.not_found) == (1, 1, 1)
+    assert stats.regenerations == 0
+
+
+def test_instrumentation_latency_histogram(enabled_instrumentation):
+    """Ensure every lookup is counted in one latency bucket."""
+    look_up_descriptions()
+    stats = instrumentation.snapshot().registries[MIXIN_ERRORS]
+    assert len(stats.latency_buckets) == len(instrumentation.LATENCY_BUCKETS) + 1
+    assert sum(stats.latency_buckets) == stats.lookups
+    assert stats.lookup_seconds > 0
+
+
+def test_instrumentation_records_regenerations(enabled_instrumentation):
+    """Ensure index rebuilds are recorded, also for new classes."""
+    InstrumentedMixinErrors.invalidate_errors_list()
+
+    class LateErrors(ErrorListByMixin, InstrumentedErrors): ...
+
+    registries = instrumentation.snapshot().registries
+    assert registries[MIXIN_ERRORS].regenerations == 1
+    assert registries[MIXIN_ERRORS].regeneration_seconds > 0
+    assert registries[MIXIN_ERRORS].lookups == 0
+    assert registries[f"{__name__}.{LateErrors.__qualname__}"].regenerations == 1
+
+
+def test_instrumentation_keeps_lookup_results(enabled_instrumentation):
+    """Ensure instrumented lookups return the same descriptions and errors."""
+    assert InstrumentedMixinErrors.error_description("INSTR_001") == (
+        "first instrumented error"
+    )
+    with pytest.raises(KeyError) as exc_info:
+        ListErrors.error_description("INSTR_UNKNOWN")
+    assert exc_info.value.args[0]["error"] == BUILTIN_CODE
+
+
+def test_instrumentation_snapshot_with_reset(enabled_instrumentation):
+    """Ensure a reset snapshot returns the stats and starts from zero."""
+    look_up_descriptions()
+    assert instrumentation.snapshot(reset=True).registries[LIST_ERRORS].lookups == 2
+    assert instrumentation.snapshot() == instrumentation.InstrumentationSnapshot()
+    ListErrors.error_description(BUILTIN_CODE)
+    assert instrumentation.snapshot().registries[LIST_ERRORS].hits == 1
+
+
+def test_instrumentation_disable_keeps_stats(enabled_instrumentation):
+    """Ensure disabling stops recording but keeps the stats so far."""
+    look_up_descriptions()
+    instrumentation.disable()
+    look_up_descriptions()
+    assert instrumentation.snapshot().registries[LIST_ERRORS].lookups == 2
+
+
+def test_instrumentation_merges_thread_shards(enabled_instrumentation):
+    """Ensure the lookups of all threads, including finished ones, are merged."""
+    number_of_threads = 8
+    lookups_per_thread = 1_000
+    barrier = threading.Barrier(number_of_threads)
+
+    def worker():
+        barrier.wait()
+        for _ in range(lookups_per_thread):
+            ListErrors.error_description(BUILTIN_CODE)
+
+    threads = [threading.Thread(target=worker) for _ in range(number_of_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = instrumentation.snapshot().registries[LIST_ERRORS]
+    assert stats.hits == number_of_threads * lookups_per_thread
+    assert sum(stats.latency_buckets) == stats.hits
+
+
+def test_instrumentation_retires_shards_of_finished_threads(enabled_instrumentation):
+    """Ensure finished threads do not keep shards but keep their stats."""
+    number_of_threads = 200
+
+    def worker():
+        ListErrors.error_description(BUILTIN_CODE)
+
+    for _ in range(number_of_threads):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+    assert instrumentation.snapshot().registries[LIST_ERRORS].hits == number_of_threads
+    assert len(instrumentation._tables.shards) <= 1
+    registries = instrumentation.snapshot(reset=True).registries
+    assert registries[LIST_ERRORS].hits == number_of_threads
+    assert instrumentation.snapshot() == instrumentation.InstrumentationSnapshot()
+
+
+def test_instrumentation_does_not_keep_registry_classes(enabled_instrumentation):
+    """Ensure dynamically created registry classes can be collected."""
+
+    class DynamicErrors(ErrorListByMixin, InstrumentedErrors): ...
+
+    name = f"{__name__}.{DynamicErrors.__qualname__}"
+    DynamicErrors.error_description("INSTR_001")
+    DynamicErrors.error_description("INSTR_001")
+    reference = weakref.ref(DynamicErrors)
+    del DynamicErrors
+    gc.collect()
+
+    assert reference() is None
+    stats = instrumentation.snapshot().registries[name]
+    assert (stats.hits, stats.regenerations) == (2, 1)
+    assert instrumentation.snapshot(reset=True).registries[name].hits == 2
+    assert name not in instrumentation.snapshot().registries
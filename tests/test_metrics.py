@@ -0,0 +1,127 @@
+"""Tests for the opt-in error occurrence counters in errors.metrics."""
+
+import threading
+
+import pytest
+
+from errors import metrics
+from errors.base import ErrorCode, add_error_data
+from errors.data_classes import ReturnValueWithErrorStatus, ReturnValueWithStatus
+
+ERROR_ONE = ErrorCode(code="METRICS_001", description="first metrics error")
+ERROR_TWO = ErrorCode(code="METRICS_002", description="second metrics error")
+
+
+@pytest.fixture
+def enabled_metrics():
+    """Enable the metrics with clean counts, disable them afterwards."""
+    metrics.reset()
+    metrics.enable()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+
+def add_errors():
+    return_value: ReturnValueWithStatus[None] = ReturnValueWithStatus()
+    return_value.add_error(ERROR_ONE)
+    return_value.add_error(ERROR_TWO, keep_current_status=True)
+    ReturnValueWithErrorStatus(ERROR_ONE)
+    add_error_data(ERROR_TWO, {"row": 1})
+
+
+def test_metrics_disabled_by_default():
+    """Ensure nothing is counted while the metrics are disabled."""
+    metrics.reset()
+    assert not metrics.is_enabled()
+    add_errors()
+    assert metrics.snapshot() == metrics.MetricsSnapshot()
+
+
+def test_metrics_count_occurrences_per_code(enabled_metrics):
+    """Ensure added errors and errors with data are counted per code."""
+    assert metrics.is_enabled()
+    add_errors()
+    add_errors()
+    snapshot = metrics.snapshot()
+    assert snapshot.errors == {"METRICS_001": 4, "METRICS_002": 2}
+    assert snapshot.error_data == {"METRICS_002": 2}
+
+
+def test_metrics_snapshot_with_reset(enabled_metrics):
+    """Ensure a reset snapshot returns the counts and starts from zero."""
+    add_errors()
+    assert metrics.snapshot(reset=True).errors == {"METRICS_001": 2, "METRICS_002": 1}
+    assert metrics.snapshot() == metrics.MetricsSnapshot()
+    add_errors()
+    assert metrics.snapshot().errors == {"METRICS_001": 2, "METRICS_002": 1}
+
+
+def test_metrics_disable_keeps_counts(enabled_metrics):
+    """Ensure disabling stops counting but keeps the counts so far."""
+    add_errors()
+    metrics.disable()
+    add_errors()
+    assert metrics.snapshot().error_data == {"METRICS_002": 1}
+
+
+def test_metrics_merge_thread_shards(enabled_metrics):
+    """Ensure counts of all threads, including finished ones, are merged."""
+    number_of_threads = 8
+    errors_per_thread = 1_000
+    barrier = threading.Barrier(number_of_threads)
+
+    def worker():
+        barrier.wait()
+        return_value: ReturnValueWithStatus[None] = ReturnValueWithStatus()
+        for _ in range(errors_per_thread):
+            return_value.add_error(ERROR_ONE)
+
+    threads = [threading.Thread(target=worker) for _ in range(number_of_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    expected = number_of_threads * errors_per_thread
+    assert metrics.snapshot().errors == {"METRICS_001": expected}
+
+
+def test_metrics_reset_while_counting_loses_no_occurrences(enabled_metrics):
+    """Ensure concurrent snapshots with reset add up to the total count."""
+    number_of_errors = 20_000
+    done = threading.Event()
+    totals = []
+
+    def worker():
+        return_value: ReturnValueWithStatus[None] = ReturnValueWithStatus()
+        for _ in range(number_of_errors):
+            return_value.add_error(ERROR_ONE)
+        done.set()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    while not done.is_set():
+        totals.append(metrics.snapshot(reset=True).errors["METRICS_001"])
+    thread.join()
+    totals.append(metrics.snapshot(reset=True).errors["METRICS_001"])
+
+    assert sum(totals) == number_of_errors
+
+
+def test_metrics_retire_shards_of_finished_threads(enabled_metrics):
+    """Ensure finished threads do not keep shards but keep their counts."""
+    number_of_threads = 200
+
+    def worker():
+        ReturnValueWithErrorStatus(ERROR_ONE)
+
+    for _ in range(number_of_threads):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+    assert metrics.snapshot().errors == {"METRICS_001": number_of_threads}
+    assert len(metrics._tables.shards) <= 1
+    assert metrics.snapshot(reset=True).errors == {"METRICS_001": number_of_threads}
+    assert metrics.snapshot() == metrics.MetricsSnapshot()
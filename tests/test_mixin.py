@@ -2,6 +2,7 @@
 
 import pytest
 
+import errors.settings as st
 from errors.base import ErrorCode
 from errors.mixin import ErrorListByMixin
 
@@ -50,7 +51,7 @@ def test_regenerate_errors_list_populates_errors_dict():
     FreshErrors._regenerate_errors_list()
     assert "MOD1_001" in FreshErrors._errors
     assert "MOD1_002" in FreshErrors._errors
-    assert FreshErrors._errors["MOD1_001"] == "First error from mod one"
+    assert FreshErrors._errors["MOD1_001"].description == "First error from mod one"
 
 
 def test_error_description_triggers_regeneration_on_cache_miss():
@@ -75,3 +76,142 @@ def test_error_object_as_static_method():
     error = ErrorCode(code="STATIC_001", description="Static call test")
     result = ErrorListByMixin.error_object(error)
     assert result == {"error": "STATIC_001", "description": "Static call test"}
+
+
+def test_each_subclass_has_its_own_errors_index():
+    """Ensure the errors index is built per subclass at class creation."""
+
+    class OtherErrors(ErrorListByMixin, ModTwoErrors): ...
+
+    assert "_errors" in MyProjectErrors.__dict__
+    assert "_errors" in OtherErrors.__dict__
+    assert "MOD1_001" not in OtherErrors._errors
+    assert MyProjectErrors._errors["MOD1_001"] is ModOneErrors.ERROR_ONE
+    assert ErrorListByMixin._errors == {}
+
+
+def test_errors_index_reuses_parent_mixin_index():
+    """Ensure a subclass of a mixin class extends the index of its parent."""
+
+    class ExtendedErrors(MyProjectErrors):
+        ERROR_FOUR = ErrorCode(code="EXT_001", description="Extended error")
+
+    assert ExtendedErrors.error_description("MOD2_001") == "First error from mod two"
+    assert ExtendedErrors.error_description("EXT_001") == "Extended error"
+    assert "EXT_001" not in MyProjectErrors._errors
+
+
+def test_unknown_code_is_cached_in_negative_cache():
+    """Ensure repeated lookups of an unknown code do not regenerate the index."""
+
+    class FreshErrors(ErrorListByMixin, ModOneErrors): ...
+
+    with pytest.raises(KeyError):
+        FreshErrors.error_description("UNKNOWN_001")
+    index = FreshErrors._errors
+    for _ in range(3):
+        with pytest.raises(KeyError):
+            FreshErrors.error_description("UNKNOWN_001")
+    assert FreshErrors._errors is index
+    assert "UNKNOWN_001" in FreshErrors._missing_codes
+
+
+def test_distinct_unknown_codes_do_not_rescan_the_class(monkeypatch):
+    """Ensure a miss only fills the negative cache instead of rebuilding the index."""
+
+    class FreshErrors(ErrorListByMixin, ModOneErrors): ...
+
+    def fail():
+        raise AssertionError("index rebuilt on a miss")
+
+    monkeypatch.setattr(FreshErrors, "_regenerate_errors_list", fail)
+    for index in range(100):
+        assert FreshErrors.get_error(f"UNKNOWN_{index:03d}") is None
+    assert len(FreshErrors._missing_codes) == 100
+    assert FreshErrors.error_description("MOD1_001") == "First error from mod one"
+
+
+def test_negative_cache_is_bounded(monkeypatch):
+    """Ensure the negative cache evicts the oldest code when it is full."""
+
+    class FreshErrors(ErrorListByMixin, ModOneErrors): ...
+
+    monkeypatch.setattr(st, "MIXIN_NEGATIVE_CACHE_SIZE", 2)
+    for code in ("UNKNOWN_001", "UNKNOWN_002", "UNKNOWN_003"):
+        with pytest.raises(KeyError):
+            FreshErrors.error_description(code)
+    assert list(FreshErrors._missing_codes) == ["UNKNOWN_002", "UNKNOWN_003"]
+
+
+def test_invalidate_errors_list_picks_up_runtime_patched_errors():
+    """Ensure invalidate_errors_list clears the negative cache and reindexes."""
+
+    class FreshErrors(ErrorListByMixin, ModOneErrors): ...
+
+    class FreshSubErrors(FreshErrors): ...
+
+    with pytest.raises(KeyError):
+        FreshErrors.error_description("PATCH_001")
+    FreshErrors.PATCHED = ErrorCode(code="PATCH_001", description="Patched")  # type: ignore[attr-defined]
+    with pytest.raises(KeyError):
+        FreshErrors.error_description("PATCH_001")
+
+    FreshErrors.invalidate_errors_list()
+    assert FreshErrors.error_description("PATCH_001") == "Patched"
+    assert FreshSubErrors.error_description("PATCH_001") == "Patched"
+
+
+def test_mixin_assigns_dense_error_ids():
+    """Ensure every code of a mixin class gets a dense ID."""
+    error_ids = MyProjectErrors.export_error_ids()
+    assert sorted(error_ids) == ["MOD1_001", "MOD1_002", "MOD2_001"]
+    for error_id, error_code in enumerate(error_ids):
+        assert MyProjectErrors.get_error_id(error_code) == error_id
+        error = MyProjectErrors.get_error_by_id(error_id)
+        assert error is not None and error.code == error_code
+    assert MyProjectErrors.get_error_id(ModOneErrors.ERROR_ONE) is not None
+    assert MyProjectErrors.get_error_id("UNKNOWN") is None
+    assert MyProjectErrors.get_error_by_id(len(error_ids)) is None
+
+
+def test_mixin_error_ids_are_stable_after_invalidation():
+    """Ensure IDs are kept when the index is rebuilt and new codes are added."""
+
+    class PatchedErrors(ErrorListByMixin, ModOneErrors): ...
+
+    error_ids = PatchedErrors.export_error_ids()
+    PatchedErrors.PATCHED = ErrorCode(code="PATCH_001", description="patched")  # type: ignore[attr-defined]
+    PatchedErrors.invalidate_errors_list()
+    assert PatchedErrors.export_error_ids() == error_ids + ["PATCH_001"]
+
+
+def test_mixin_import_error_ids():
+    """Ensure imported IDs are used by the mixin class."""
+
+    class ImportedErrors(ErrorListByMixin, ModOneErrors, ModTwoErrors): ...
+
+    ImportedErrors.import_error_ids(["MOD2_001", "MOD1_002"])
+    assert ImportedErrors.export_error_ids() == ["MOD2_001", "MOD1_002", "MOD1_001"]
+    assert ImportedErrors.get_error_by_id(0) is ModTwoErrors.ERROR_THREE
+    with pytest.raises(ValueError):
+        ImportedErrors.import_error_ids(["MOD2_001", "MOD2_001"])
+
+
+def test_mixin_errors_with_prefix_and_namespace():
+    """Ensure prefix and namespace queries on mixin classes."""
+    assert MyProjectErrors.errors_with_prefix("MOD1") == [
+        ModOneErrors.ERROR_ONE,
+        ModOneErrors.ERROR_TWO,
+    ]
+    assert MyProjectErrors.errors_in_namespace("MOD2") == [ModTwoErrors.ERROR_THREE]
+    assert MyProjectErrors.errors_in_namespace("MOD") == []
+
+
+def test_mixin_prefix_index_is_updated_on_invalidation():
+    """Ensure codes patched onto a class are found after invalidation."""
+
+    class PrefixPatchedErrors(ErrorListByMixin, ModOneErrors): ...
+
+    PrefixPatchedErrors.PATCHED = ErrorCode(code="MOD1_000", description="patched")  # type: ignore[attr-defined]
+    PrefixPatchedErrors.invalidate_errors_list()
+    assert PrefixPatchedErrors.errors_in_namespace("MOD1")[0].code == "MOD1_000"
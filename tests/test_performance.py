@@ -0,0 +1,115 @@
+"""Memory benchmarks for the error-manager hot paths.
+
+The benchmarks compare the current implementation with a reference
+implementation mirroring the previous (1.4) layout. Measured figures are
+printed, run pytest with ``-s`` to see them. Construction times are part of
+the benchmark suite, see ``benchmarks/bench_return_value.py``.
+"""
+
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+from errors.base import ErrorCode, add_error_data
+from errors.data_classes import ReturnValueWithStatus
+
+NUMBER_OF_OCCURRENCES = 10_000
+
+
+@dataclass(frozen=True)
+class ReferenceErrorCode:
+    """ErrorCode layout before slots and interning were introduced."""
+
+    code: str
+    description: str
+    error_data: Dict = field(default_factory=dict)
+
+
+def reference_add_error_data(error: ReferenceErrorCode, error_data: dict):
+    """add_error_data as implemented for the reference ErrorCode."""
+    return ReferenceErrorCode(
+        code=error.code, description=error.description, error_data=error_data
+    )
+
+
+@dataclass
+class ReferenceReturnValueWithStatus:
+    """ReturnValueWithStatus layout before slots and lazy error storage."""
+
+    result: Optional[object] = None
+    _is_valid: bool = True
+    _errors: list = field(default_factory=list)
+
+    def add_error(self, error, keep_current_status: bool = False) -> None:
+        self._errors.append(error)
+        if not keep_current_status:
+            self._is_valid = False
+
+
+def bytes_per_item(factory: Callable[[int], object], number: int) -> float:
+    """Return the average number of bytes kept alive per created item."""
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        items = [factory(index) for index in range(number)]
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(items) == number
+    return (end - start) / number
+
+
+def test_memory_per_error_occurrence():
+    """Benchmark bytes per add_error_data occurrence before and after slots."""
+    reference_template = ReferenceErrorCode(code="BENCH_001", description="bench")
+    template = ErrorCode(code="BENCH_001", description="bench")
+
+    before = bytes_per_item(
+        lambda index: reference_add_error_data(reference_template, {"row": index}),
+        NUMBER_OF_OCCURRENCES,
+    )
+    after = bytes_per_item(
+        lambda index: add_error_data(template, {"row": index}), NUMBER_OF_OCCURRENCES
+    )
+    print(f"\nbytes per error occurrence: before={before:.0f} after={after:.0f}")
+    assert not hasattr(template, "__dict__")
+    assert after < before
+
+
+def test_occurrences_share_template_strings():
+    """Ensure occurrences reference the strings of the template error."""
+    template = ErrorCode(code="BENCH_002", description="bench")
+    occurrence = add_error_data(template, {"row": 1})
+    assert occurrence.code is template.code
+    assert occurrence.description is template.description
+
+
+def test_descriptions_are_interned():
+    """Ensure equal descriptions built at runtime share a single string."""
+    description = "".join(["interned ", "description"])
+    error = ErrorCode(code="BENCH_003", description=description)
+    other_error = ErrorCode(code="BENCH_003", description="interned description")
+    assert error.description is other_error.description
+
+
+def test_memory_per_successful_return_value():
+    """Benchmark bytes per successful return value before and after slots."""
+    before = bytes_per_item(
+        lambda index: ReferenceReturnValueWithStatus(result=index),
+        NUMBER_OF_OCCURRENCES,
+    )
+    after = bytes_per_item(
+        lambda index: ReturnValueWithStatus(result=index), NUMBER_OF_OCCURRENCES
+    )
+    print(f"\nbytes per successful return value: before={before:.0f} after={after:.0f}")
+    assert after < before
+
+
+def test_successful_return_value_does_not_allocate_error_storage():
+    """Ensure successful return values share the empty error storage."""
+    return_value = ReturnValueWithStatus(result=1)
+    other_return_value = ReturnValueWithStatus(result=2)
+    assert not hasattr(return_value, "__dict__")
+    assert return_value._errors is other_return_value._errors
+    assert return_value.is_valid
+    assert return_value.errors == []
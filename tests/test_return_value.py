@@ -1,9 +1,13 @@
 """Tests for ReturnValueWithStatus and ReturnValueWithErrorStatus dataclasses."""
 
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
 import pytest
 
-from errors.base import ErrorCode
+from errors.base import ErrorCode, ErrorsClassErrors, add_error_data
 from errors.data_classes import ReturnValueWithErrorStatus, ReturnValueWithStatus
+from errors.error import ListErrors
 
 
 def test_return_value_with_status_class_exists():
@@ -86,3 +90,179 @@ def test_return_value_with_error_status_raises_type_error():
     error = "not an ErrorCode instance"
     with pytest.raises(TypeError):
         ReturnValueWithErrorStatus[str](error)  # type: ignore
+
+
+def test_errors_property_returns_mutable_list_on_new_instance():
+    """Ensure errors returns a list that is stored on first access."""
+    return_value = ReturnValueWithStatus[str]()
+    assert return_value.errors == []
+    assert return_value.errors is return_value.errors
+
+
+def test_add_error_keeps_existing_errors():
+    """Ensure subsequent add_error calls append to the same error list."""
+    error1 = ErrorCode(code="TEST1", description="desc")
+    error2 = ErrorCode(code="TEST2", description="desc")
+    return_value = ReturnValueWithStatus[str]()
+    return_value.add_error(error1)
+    return_value.add_error(error2)
+    assert return_value.errors == [error1, error2]
+
+
+def test_return_values_without_errors_compare_equal():
+    """Ensure the lazily allocated error list does not affect equality."""
+    return_value = ReturnValueWithStatus(result=1)
+    assert return_value.errors == []
+    assert return_value == ReturnValueWithStatus(result=1)
+    assert return_value != ReturnValueWithStatus(result=2)
+
+
+def make_pickle_results(number: int) -> list:
+    """Return *number* return values, every other one invalid (pool worker)."""
+    error = ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value
+    # errors are only pickled as reference once they are registered
+    assert ListErrors.get_error(error.code) is error
+    return_values = []
+    for index in range(number):
+        return_value: ReturnValueWithStatus[int] = ReturnValueWithStatus(result=index)
+        if index % 2:
+            return_value.add_error(add_error_data(error, {"index": index}))
+            return_value.add_error(error, keep_current_status=True)
+        return_values.append(return_value)
+    return return_values
+
+
+def test_pickled_return_values_round_trip():
+    """Ensure return values survive pickling and share the empty errors."""
+    return_values = make_pickle_results(10)
+    unpickled = pickle.loads(pickle.dumps(return_values))
+    assert unpickled == return_values
+    assert unpickled[0]._errors is return_values[0]._errors
+    unpickled[0].add_error(ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value)
+    assert len(unpickled[0].errors) == 1
+    assert not return_values[0].errors
+    assert unpickled[1].errors[1] is ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value
+
+
+def test_return_values_from_process_pool_use_registered_errors():
+    """Ensure errors of results from a process pool are the registered ones."""
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return_values = pool.submit(make_pickle_results, 4).result()
+    assert return_values == make_pickle_results(4)
+    error = ErrorsClassErrors.COULD_NOT_FIND_ERROR_CODE.value
+    assert return_values[1].errors[1] is error
+    assert return_values[1].errors[0].description is error.description
+
+
+WARNING = ErrorCode(code="TEST_WARNING", description="warning")
+FAILURE = ErrorCode(code="TEST_FAILURE", description="failure")
+
+
+def with_warning(result) -> ReturnValueWithStatus:
+    return_value = ReturnValueWithStatus(result=result)
+    return_value.add_error(WARNING, keep_current_status=True)
+    return return_value
+
+
+def not_called(result):
+    raise AssertionError("step called for an invalid value")
+
+
+def test_map_applies_function_to_valid_values():
+    """Ensure map returns a new valid value and shares the error storage."""
+    return_value = with_warning(1)
+    mapped = return_value.map(lambda result: result + 1).map(str)
+    assert mapped.result == "2"
+    assert mapped.is_valid
+    assert mapped._errors is return_value._errors
+    assert mapped.errors == [WARNING]
+
+    successful: ReturnValueWithStatus[int] = ReturnValueWithStatus(result=1)
+    assert successful.map(str)._errors is successful._errors
+
+
+def test_map_short_circuits_invalid_values():
+    """Ensure map does not call the function for invalid values."""
+    invalid: ReturnValueWithStatus[int] = ReturnValueWithErrorStatus(FAILURE)
+    assert invalid.map(not_called) is invalid
+
+
+def test_shared_errors_are_copied_on_change():
+    """Ensure adding errors to a derived value does not change the others."""
+    return_value = with_warning(1)
+    mapped = return_value.map(str)
+    mapped.add_error(FAILURE)
+    return_value.errors.append(FAILURE)
+    other = return_value.map(str)
+
+    assert mapped.errors == [WARNING, FAILURE]
+    assert return_value.errors == [WARNING, FAILURE]
+    assert other.errors == [WARNING, FAILURE]
+    assert mapped.errors is not return_value.errors
+    assert pickle.loads(pickle.dumps(other)) == other
+
+
+def test_and_then_chains_return_values():
+    """Ensure and_then returns the value of the step with all errors."""
+    chained = with_warning(1).and_then(with_warning)
+    assert chained.result == 1
+    assert chained.errors == [WARNING, WARNING]
+
+    step_value = with_warning(2)
+    successful: ReturnValueWithStatus[int] = ReturnValueWithStatus(result=1)
+    assert successful.and_then(lambda result: step_value) is step_value
+
+    failed: ReturnValueWithStatus[int] = with_warning(1).and_then(
+        lambda result: ReturnValueWithErrorStatus(FAILURE)
+    )
+    assert not failed.is_valid
+    assert failed.errors == [WARNING, FAILURE]
+    assert failed.and_then(not_called) is failed
+
+
+def test_collect_combines_results():
+    """Ensure collect returns the list of results and all errors."""
+    collected = ReturnValueWithStatus.collect(
+        [
+            ReturnValueWithStatus(result=1),
+            with_warning(2),
+            ReturnValueWithStatus(result=3),
+        ]
+    )
+    assert collected.result == [1, 2, 3]
+    assert collected.is_valid
+    assert collected.errors == [WARNING]
+    assert ReturnValueWithStatus.collect([]) == ReturnValueWithStatus(result=[])
+
+
+def test_collect_stops_at_the_first_invalid_value():
+    """Ensure collect does not consume values after the first invalid one."""
+    consumed = []
+
+    def return_values():
+        for index in range(5):
+            consumed.append(index)
+            if index == 2:
+                yield ReturnValueWithErrorStatus(FAILURE)
+            else:
+                yield with_warning(index)
+
+    collected = ReturnValueWithStatus.collect(return_values())
+    assert consumed == [0, 1, 2]
+    assert not collected.is_valid
+    assert collected.result is None
+    assert collected.errors == [WARNING, WARNING, FAILURE]
+
+
+def test_merge_combines_errors_and_validity():
+    """Ensure merge keeps the result and combines the errors of all values."""
+    return_value: ReturnValueWithStatus[int] = ReturnValueWithStatus(result=1)
+    assert return_value.merge().is_valid
+    merged = return_value.merge(with_warning(2))
+    assert merged.result == 1
+    assert merged.is_valid
+    assert merged.errors == [WARNING]
+
+    merged = with_warning(1).merge(ReturnValueWithErrorStatus(FAILURE), with_warning(3))
+    assert not merged.is_valid
+    assert merged.errors == [WARNING, FAILURE, WARNING]
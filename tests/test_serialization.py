@@ -0,0 +1,171 @@
+"""Tests for the JSON and binary codecs in errors.serialization."""
+
+import json
+
+import pytest
+
+from errors.base import ErrorCode, FunctionalErrorsBaseClass, add_error_data
+from errors.data_classes import ReturnValueWithErrorStatus, ReturnValueWithStatus
+from errors.error import ListErrors
+from errors.mixin import ErrorListByMixin
+from errors.serialization import BinaryCodec, JsonCodec
+
+
+class SerializedErrors(FunctionalErrorsBaseClass):
+    FIRST = ErrorCode(code="SERIAL_001", description="first serialized error")
+    SECOND = ErrorCode(code="SERIAL_002", description="second serialized error")
+
+
+ListErrors.register_errors(SerializedErrors)
+
+FIRST = SerializedErrors.FIRST.value
+SECOND = SerializedErrors.SECOND.value
+UNREGISTERED = ErrorCode(code="SERIAL_UNREGISTERED", description="not registered")
+
+CODECS = [JsonCodec(), BinaryCodec(), BinaryCodec(use_ids=True)]
+
+
+def make_return_values():
+    """Return a list of return values covering all encoded variations."""
+    with_errors: ReturnValueWithStatus[dict] = ReturnValueWithStatus(
+        result={"rows": [1, 2]}
+    )
+    with_errors.add_error(add_error_data(FIRST, {"row": 1, "field": "name"}))
+    with_errors.add_error(SECOND, keep_current_status=True)
+    with_errors.add_error(UNREGISTERED)
+    kept_valid: ReturnValueWithStatus[str] = ReturnValueWithStatus(result="ok")
+    kept_valid.add_error(SECOND, keep_current_status=True)
+    return [
+        ReturnValueWithStatus(result=1),
+        ReturnValueWithStatus(),
+        ReturnValueWithErrorStatus(FIRST),
+        with_errors,
+        kept_valid,
+    ]
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_error_round_trip(codec):
+    """Ensure errors, with and without data, survive encoding."""
+    for error in (FIRST, add_error_data(SECOND, {"url": "x"}), UNREGISTERED):
+        assert codec.decode_error(codec.encode_error(error)) == error
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_return_value_round_trip(codec):
+    """Ensure return values survive encoding one by one and as batch."""
+    return_values = make_return_values()
+    for return_value in return_values:
+        decoded = codec.decode(codec.encode(return_value))
+        assert decoded == return_value
+        assert decoded.is_valid is return_value.is_valid
+    assert codec.decode_many(codec.encode_many(return_values)) == return_values
+    assert codec.decode_many(codec.encode_many([])) == []
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_decoding_reuses_registered_errors(codec):
+    """Ensure decoded registered errors are the registered instances."""
+    decoded = codec.decode(codec.encode(make_return_values()[3]))
+    with_data, registered, unregistered = decoded.errors
+    assert registered is SECOND
+    assert with_data.code is FIRST.code
+    assert with_data.description is FIRST.description
+    assert with_data.error_data == {"row": 1, "field": "name"}
+    assert unregistered == UNREGISTERED
+
+
+def test_binary_form_does_not_repeat_descriptions():
+    """Ensure registered errors are referenced instead of fully encoded."""
+    return_value: ReturnValueWithStatus[None] = ReturnValueWithErrorStatus(FIRST)
+    by_code = BinaryCodec().encode(return_value)
+    by_id = BinaryCodec(use_ids=True).encode(return_value)
+    assert FIRST.description.encode() not in by_code
+    assert FIRST.code.encode() in by_code
+    assert FIRST.code.encode() not in by_id
+    assert len(by_id) < len(by_code)
+    assert UNREGISTERED.description.encode() in BinaryCodec().encode_error(UNREGISTERED)
+
+
+def test_binary_form_is_smaller_than_json():
+    """Ensure the binary form of a batch is smaller than its JSON form."""
+    return_values = make_return_values() * 100
+    binary = BinaryCodec(use_ids=True).encode_many(return_values)
+    assert len(binary) < len(JsonCodec().encode_many(return_values).encode()) / 2
+
+
+def test_json_form_uses_error_object_format():
+    """Ensure the JSON form of errors matches error_object()."""
+    codec = JsonCodec()
+    assert json.loads(codec.encode_error(FIRST)) == ListErrors.error_object(FIRST)
+    encoded = json.loads(codec.encode(ReturnValueWithErrorStatus(FIRST)))
+    assert encoded == {
+        "result": None,
+        "is_valid": False,
+        "errors": [ListErrors.error_object(FIRST)],
+    }
+
+
+def test_json_codec_default_for_results():
+    """Ensure results that are not JSON serializable use the default hook."""
+    codec = JsonCodec(default=sorted)
+    decoded = codec.decode(codec.encode(ReturnValueWithStatus(result={3, 1, 2})))
+    assert decoded.result == [1, 2, 3]
+
+
+def test_binary_codec_result_encoder():
+    """Ensure custom result encoders are used for results."""
+    codec = BinaryCodec(result_encoder=lambda result: result, result_decoder=bytes)
+    return_value = ReturnValueWithStatus(result=b"\x00\xff")
+    assert codec.decode(codec.encode(return_value)) == return_value
+
+
+def test_codecs_with_mixin_registry():
+    """Ensure ErrorListByMixin classes can be used as registry."""
+
+    class MixinErrors(ErrorListByMixin):
+        MIXIN = ErrorCode(code="SERIAL_MIXIN_001", description="mixin error")
+
+    return_value: ReturnValueWithStatus[None] = ReturnValueWithErrorStatus(
+        MixinErrors.MIXIN
+    )
+    json_codec = JsonCodec(MixinErrors)
+    binary_codec = BinaryCodec(MixinErrors, use_ids=True)
+    for decoded in (
+        json_codec.decode(json_codec.encode(return_value)),
+        binary_codec.decode(binary_codec.encode(return_value)),
+    ):
+        assert decoded.errors[0] is MixinErrors.MIXIN
+
+
+def test_binary_decode_rejects_invalid_data():
+    """Ensure malformed binary data raises ValueError."""
+    codec = BinaryCodec()
+    encoded = codec.encode(make_return_values()[3])
+    with pytest.raises(ValueError):
+        codec.decode(b"\x02" + encoded[1:])
+    with pytest.raises(ValueError):
+        codec.decode(encoded[:-3])
+    with pytest.raises(ValueError):
+        codec.decode(encoded + b"\x00")
+    with pytest.raises(ValueError):
+        codec.decode_error(b"\x01\x09")
+
+
+def test_binary_decode_unknown_references_raise_key_error():
+    """Ensure references to errors that are not registered raise KeyError."""
+    codec = BinaryCodec(use_ids=True)
+    with pytest.raises(KeyError):
+        codec.decode_error(b"\x01\x00\xff\xff\x03\x00")
+    by_code = BinaryCodec().encode_error(FIRST)
+    with pytest.raises(KeyError):
+        BinaryCodec(registry=ErrorListByMixin).decode_error(by_code)
+
+
+def test_json_decode_rejects_invalid_data():
+    """Ensure JSON that is not an encoded value raises ValueError."""
+    codec = JsonCodec()
+    with pytest.raises(ValueError):
+        codec.decode_error('{"code": "X"}')
+    with pytest.raises(ValueError):
+        codec.decode("[1, 2]")
@@ -0,0 +1,229 @@
+"""Tests for the batched JSON Lines error sink in errors.sink."""
+
+import json
+import threading
+
+import pytest
+
+from errors import data_classes
+from errors.base import ErrorCode, add_error_data
+from errors.data_classes import ReturnValueWithErrorStatus, ReturnValueWithStatus
+from errors.sink import BLOCK, ErrorSink
+
+ERROR_ONE = ErrorCode(code="SINK_001", description="first sink error")
+ERROR_TWO = ErrorCode(code="SINK_002", description="second sink error")
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_sink_writes_json_lines(tmp_path):
+    """Ensure emitted errors are written as error objects with error data."""
+    path = tmp_path / "errors.jsonl"
+    with ErrorSink(str(path)) as sink:
+        assert sink.emit(add_error_data(ERROR_ONE, {"id": 1, "value": {1, 2}}))
+        assert sink.emit(ERROR_TWO)
+
+    first, second = read_lines(path)
+    assert first["error"] == "SINK_001"
+    assert first["description"] == "first sink error"
+    assert first["error_data"] == {"id": 1, "value": "{1, 2}"}
+    assert isinstance(first["time"], float)
+    assert second["error_data"] == {}
+    assert sink.written == 2
+    assert sink.dropped == 0
+
+
+def test_sink_writes_error_data_with_unsupported_keys(tmp_path):
+    """Ensure error data JSON cannot encode does not stop the writer."""
+    path = tmp_path / "errors.jsonl"
+    circular: dict = {}
+    circular["self"] = circular
+    with ErrorSink(str(path), flush_interval=60) as sink:
+        sink.emit(add_error_data(ERROR_ONE, {(1, 2): "x", "nested": {(3,): [4]}}))
+        sink.emit(add_error_data(ERROR_ONE, circular))
+        sink.emit(ERROR_TWO)
+        assert sink.flush(timeout=10)
+        assert sink._thread.is_alive()
+        assert sink.emit(ERROR_TWO)
+        assert sink.flush(timeout=10)
+
+    lines = read_lines(path)
+    assert lines[0]["error_data"] == {"(1, 2)": "x", "nested": {"(3,)": [4]}}
+    assert [line["error"] for line in lines] == ["SINK_001", "SINK_002", "SINK_002"]
+    assert sink.written == 3
+    assert sink.dropped == 1
+
+
+def test_sink_writer_survives_failing_batches(tmp_path, monkeypatch):
+    """Ensure an unexpected error writing a batch only drops that batch."""
+    path = tmp_path / "errors.jsonl"
+    with ErrorSink(str(path), flush_interval=60) as sink:
+        write = sink._write
+        calls = []
+
+        def fail_once(batch):
+            calls.append(batch)
+            if len(calls) == 1:
+                raise RuntimeError("unexpected")
+            write(batch)
+
+        monkeypatch.setattr(sink, "_write", fail_once)
+        sink.emit(ERROR_ONE)
+        assert sink.flush(timeout=10)
+        sink.emit(ERROR_TWO)
+        assert sink.flush(timeout=10)
+        assert sink._thread.is_alive()
+
+    assert [line["error"] for line in read_lines(path)] == ["SINK_002"]
+    assert (sink.written, sink.dropped) == (1, 1)
+
+
+def test_sink_writes_errors_sharing_a_code(tmp_path):
+    """Ensure errors with the same code but another description are written."""
+    path = tmp_path / "errors.jsonl"
+    other = ErrorCode(code="SINK_001", description='other "quoted" description é')
+    with ErrorSink(str(path)) as sink:
+        for error in (ERROR_ONE, other, ERROR_ONE):
+            sink.emit(error)
+    assert [line["description"] for line in read_lines(path)] == [
+        "first sink error",
+        'other "quoted" description é',
+        "first sink error",
+    ]
+
+
+def test_sink_flush_writes_queued_errors(tmp_path):
+    """Ensure flush() waits until the queued errors are written."""
+    path = tmp_path / "errors.jsonl"
+    with ErrorSink(str(path), flush_interval=60) as sink:
+        for _ in range(10):
+            sink.emit(ERROR_ONE)
+        assert sink.flush(timeout=10)
+        assert len(read_lines(path)) == 10
+        assert sink.pending == 0
+
+
+def test_sink_appends_to_existing_file(tmp_path):
+    """Ensure an existing file is appended to."""
+    path = tmp_path / "errors.jsonl"
+    for _ in range(2):
+        with ErrorSink(str(path)) as sink:
+            sink.emit(ERROR_ONE)
+    assert len(read_lines(path)) == 2
+
+
+def test_sink_rotates_files_by_size(tmp_path):
+    """Ensure files are rotated before exceeding max_bytes."""
+    path = tmp_path / "errors.jsonl"
+    with ErrorSink(str(path), max_bytes=300, backup_count=2) as sink:
+        for index in range(20):
+            sink.emit(add_error_data(ERROR_ONE, {"index": index}))
+            sink.flush()
+
+    files = sorted(file.name for file in tmp_path.iterdir())
+    assert files == ["errors.jsonl", "errors.jsonl.1", "errors.jsonl.2"]
+    for file in tmp_path.iterdir():
+        assert 0 < file.stat().st_size <= 300
+    indexes = [
+        line["error_data"]["index"]
+        for name in ("errors.jsonl.2", "errors.jsonl.1", "errors.jsonl")
+        for line in read_lines(tmp_path / name)
+    ]
+    assert indexes == list(range(20 - len(indexes), 20))
+
+
+def stall_writer(sink):
+    """Make the writer of *sink* wait before writing until the event is set."""
+    release = threading.Event()
+    write = sink._write
+
+    def stalled_write(batch):
+        release.wait()
+        write(batch)
+
+    sink._write = stalled_write
+    return release
+
+
+def test_sink_drops_when_queue_is_full(tmp_path):
+    """Ensure the drop policy drops occurrences beyond the queue size."""
+    sink = ErrorSink(str(tmp_path / "errors.jsonl"), queue_size=5, flush_interval=60)
+    release = stall_writer(sink)
+    accepted = [sink.emit(ERROR_ONE) for _ in range(8)]
+    release.set()
+    sink.close()
+    assert accepted == [True] * 5 + [False] * 3
+    assert sink.dropped == 3
+    assert sink.written == 5
+    assert not sink.emit(ERROR_ONE)
+
+
+def test_sink_block_policy_loses_nothing(tmp_path):
+    """Ensure the block policy waits for room instead of dropping."""
+    path = tmp_path / "errors.jsonl"
+    number_of_threads = 4
+    errors_per_thread = 500
+
+    with ErrorSink(str(path), queue_size=16, batch_size=8, policy=BLOCK) as sink:
+
+        def worker():
+            for _ in range(errors_per_thread):
+                assert sink.emit(ERROR_ONE)
+
+        threads = [threading.Thread(target=worker) for _ in range(number_of_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert sink.dropped == 0
+    assert len(read_lines(path)) == number_of_threads * errors_per_thread
+
+
+def test_sink_block_timeout_drops(tmp_path):
+    """Ensure the block policy drops after block_timeout."""
+    sink = ErrorSink(
+        str(tmp_path / "errors.jsonl"),
+        queue_size=1,
+        policy=BLOCK,
+        block_timeout=0.2,
+        flush_interval=60,
+    )
+    release = stall_writer(sink)
+    # the writer takes the first error and stalls, the second one fills the queue
+    assert sink.emit(ERROR_ONE)
+    assert sink.emit(ERROR_ONE)
+    assert not sink.emit(ERROR_TWO)
+    release.set()
+    sink.close()
+    assert sink.dropped == 1
+    assert sink.written == 2
+
+
+def test_installed_sink_receives_added_errors(tmp_path):
+    """Ensure add_error and ReturnValueWithErrorStatus feed an installed sink."""
+    path = tmp_path / "errors.jsonl"
+    with ErrorSink(str(path)) as sink:
+        sink.install()
+        assert data_classes._emit_error is not None
+        return_value: ReturnValueWithStatus[None] = ReturnValueWithStatus()
+        return_value.add_error(ERROR_ONE)
+        ReturnValueWithErrorStatus(ERROR_TWO)
+        with pytest.raises(ValueError):
+            ErrorSink(str(tmp_path / "other.jsonl")).install()
+    assert data_classes._emit_error is None
+    ReturnValueWithErrorStatus(ERROR_TWO)
+
+    assert [line["error"] for line in read_lines(path)] == ["SINK_001", "SINK_002"]
+
+
+def test_sink_rejects_invalid_arguments(tmp_path):
+    """Ensure unknown policies and invalid sizes raise ValueError."""
+    path = str(tmp_path / "errors.jsonl")
+    with pytest.raises(ValueError):
+        ErrorSink(path, policy="wait")
+    with pytest.raises(ValueError):
+        ErrorSink(path, queue_size=0)
@@ -0,0 +1,178 @@
+"""Tests for the precompiled registry snapshots in errors.snapshot."""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+from errors.base import ErrorCode
+from errors.error import ListErrors
+from errors.snapshot import (
+    RegistrySnapshot,
+    compile_snapshot,
+    is_snapshot_stale,
+    load_snapshot,
+)
+
+ENUMERATOR_SOURCE = """
+from errors.base import ErrorCode, FunctionalErrorsBaseClass
+
+
+class SnapshotErrors(FunctionalErrorsBaseClass):
+    SNAPSHOT_ONE = ErrorCode(code="SNAP_00001", description="first snapshot error")
+    SNAPSHOT_TWO = ErrorCode(code="SNAP_00002", description="tweede fout, één")
+"""
+
+LOOSE_ERRORS_SOURCE = """
+from errors.base import ErrorCode
+
+
+def register_loose_error(registry):
+    registry.register_error(
+        "LOOSE_ERROR", ErrorCode(code="LOOSE_00002", description="loose")
+    )
+"""
+
+
+def make_registry():
+    """Return a ListErrors subclass with its own, empty registry."""
+
+    class SnapshotListErrors(ListErrors):
+        _errors: dict = {}
+        _enumerators = ()
+        _source_modules = ()
+        _snapshot = None
+
+    return SnapshotListErrors
+
+
+@pytest.fixture
+def enumerator_module(tmp_path, monkeypatch):
+    """Import a module defining an enumerator from a temporary file."""
+    module_path = tmp_path / "snapshot_enumerators.py"
+    module_path.write_text(ENUMERATOR_SOURCE, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module("snapshot_enumerators")
+    yield module
+    sys.modules.pop("snapshot_enumerators", None)
+
+
+@pytest.fixture
+def snapshot_path(tmp_path, enumerator_module):
+    """Compile a snapshot of a registry holding the temporary enumerator."""
+    registry = make_registry()
+    registry.register_errors(enumerator_module.SnapshotErrors)
+    registry.register_error(
+        "LOOSE_ERROR", ErrorCode(code="LOOSE_00001", description="loose")
+    )
+    path = str(tmp_path / "errors.snapshot")
+    assert compile_snapshot(path, registry=registry) == 3
+    return path
+
+
+def test_snapshot_contains_all_registered_errors(snapshot_path):
+    """Ensure the snapshot holds codes, keys and descriptions of all errors."""
+    snapshot = RegistrySnapshot(snapshot_path)
+    assert list(snapshot) == ["LOOSE_00001", "SNAP_00001", "SNAP_00002"]
+    assert len(snapshot) == 3
+    assert "SNAP_00001" in snapshot
+    assert "SNAP_00003" not in snapshot
+    assert snapshot.get("SNAP_00002") == ErrorCode(
+        code="SNAP_00002", description="tweede fout, één"
+    )
+    assert snapshot.key("SNAP_00001") == "SNAPSHOT_ONE"
+    assert snapshot.get("SNAP_00003") is None
+    snapshot.close()
+
+
+def test_snapshot_caches_error_codes(snapshot_path):
+    """Ensure repeated lookups return the same ErrorCode instance."""
+    snapshot = RegistrySnapshot(snapshot_path)
+    assert snapshot.get("SNAP_00001") is snapshot.get("SNAP_00001")
+    snapshot.close()
+
+
+def test_loaded_snapshot_serves_registry_lookups(snapshot_path):
+    """Ensure lookups resolve codes from the snapshot without registration."""
+    registry = make_registry()
+    assert load_snapshot(snapshot_path, registry=registry)
+    assert registry._errors == {}
+    assert registry.error_description("SNAP_00001") == "first snapshot error"
+    assert registry.get_error("LOOSE_00001") == ErrorCode(
+        code="LOOSE_00001", description="loose"
+    )
+    result = registry.lookup_many(["SNAP_00002", "UNKNOWN"])
+    assert list(result.found) == ["SNAP_00002"]
+    assert result.missing == ["UNKNOWN"]
+    with pytest.raises(KeyError):
+        registry.error_description("UNKNOWN")
+
+
+def test_snapshot_becomes_stale_when_source_changes(snapshot_path, enumerator_module):
+    """Ensure a change to an enumerator source file makes the snapshot stale."""
+    assert not is_snapshot_stale(snapshot_path)
+    with open(enumerator_module.__file__, "a", encoding="utf-8") as source:
+        source.write("\n# changed\n")
+    assert is_snapshot_stale(snapshot_path)
+
+    registry = make_registry()
+    assert not load_snapshot(snapshot_path, registry=registry)
+    assert registry._snapshot is None
+    assert load_snapshot(snapshot_path, registry=registry, check_stale=False)
+
+
+def test_snapshot_becomes_stale_when_source_is_removed(
+    snapshot_path, enumerator_module
+):
+    """Ensure a removed enumerator source file makes the snapshot stale."""
+    os.remove(enumerator_module.__file__)
+    assert is_snapshot_stale(snapshot_path)
+
+
+def test_load_snapshot_rejects_missing_and_invalid_files(tmp_path):
+    """Ensure missing or invalid snapshot files are not attached."""
+    registry = make_registry()
+    invalid_path = tmp_path / "invalid.snapshot"
+    invalid_path.write_bytes(b"not a snapshot at all")
+    assert not load_snapshot(str(tmp_path / "missing.snapshot"), registry=registry)
+    assert not load_snapshot(str(invalid_path), registry=registry)
+    assert is_snapshot_stale(str(invalid_path))
+    assert registry._snapshot is None
+
+
+def test_snapshot_becomes_stale_when_module_registering_errors_changes(
+    tmp_path, monkeypatch
+):
+    """Ensure modules calling register_error() are sources of the snapshot."""
+    module_path = tmp_path / "snapshot_loose_errors.py"
+    module_path.write_text(LOOSE_ERRORS_SOURCE, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module("snapshot_loose_errors")
+    try:
+        registry = make_registry()
+        module.register_loose_error(registry)
+        assert registry._source_modules == ("snapshot_loose_errors",)
+        path = str(tmp_path / "loose.snapshot")
+        compile_snapshot(path, registry=registry)
+        assert not is_snapshot_stale(path)
+        with open(module_path, "a", encoding="utf-8") as source:
+            source.write("\n# changed\n")
+        assert is_snapshot_stale(path)
+    finally:
+        sys.modules.pop("snapshot_loose_errors", None)
+
+
+def test_attach_snapshot_closes_the_replaced_snapshot(snapshot_path):
+    """Ensure replacing or detaching a snapshot releases its memory map."""
+    registry = make_registry()
+    first = RegistrySnapshot(snapshot_path)
+    second = RegistrySnapshot(snapshot_path)
+    registry.attach_snapshot(first)
+    registry.attach_snapshot(first)
+    assert not first._map.closed
+    registry.attach_snapshot(second)
+    assert first._map.closed
+    assert registry.get_error("SNAP_00001") is not None
+    registry.attach_snapshot(None)
+    assert second._map.closed
@@ -0,0 +1,109 @@
+"""Tests for the lazy stream helpers in errors.stream."""
+
+import itertools
+from collections import Counter
+
+from errors.base import ErrorCode
+from errors.data_classes import ReturnValueWithErrorStatus, ReturnValueWithStatus
+from errors.stream import (
+    StreamPolicy,
+    count_errors,
+    error_counts,
+    invalid_values,
+    partition,
+    valid_results,
+)
+
+ERROR_ONE = ErrorCode(code="STREAM_001", description="first stream error")
+ERROR_TWO = ErrorCode(code="STREAM_002", description="second stream error")
+
+
+def make_stream():
+    """Return a list of return values with invalid values at index 1 and 3."""
+    kept_valid: ReturnValueWithStatus[int] = ReturnValueWithStatus(result=4)
+    kept_valid.add_error(ERROR_TWO, keep_current_status=True)
+    return [
+        ReturnValueWithStatus(result=0),
+        ReturnValueWithErrorStatus(ERROR_ONE),
+        ReturnValueWithStatus(result=2),
+        ReturnValueWithErrorStatus(ERROR_TWO),
+        kept_valid,
+    ]
+
+
+def endless_stream():
+    """Yield return values forever, every third one being invalid."""
+    for index in itertools.count():
+        if index % 3 == 2:
+            yield ReturnValueWithErrorStatus(ERROR_ONE)
+        else:
+            yield ReturnValueWithStatus(result=index)
+
+
+def test_valid_results_continues_past_invalid_values():
+    """Ensure the default policy yields all valid results."""
+    assert list(valid_results(make_stream())) == [0, 2, 4]
+
+
+def test_valid_results_stops_on_first_invalid_value():
+    """Ensure STOP_ON_FIRST_INVALID stops and returns the invalid value."""
+    stream = make_stream()
+    generator = valid_results(stream, policy=StreamPolicy.STOP_ON_FIRST_INVALID)
+    assert next(generator) == 0
+    try:
+        next(generator)
+    except StopIteration as stop:
+        assert stop.value is stream[1]
+    else:
+        raise AssertionError("generator did not stop on the invalid value")
+
+
+def test_valid_results_is_lazy():
+    """Ensure valid_results works on endless streams."""
+    results = valid_results(endless_stream())
+    assert list(itertools.islice(results, 4)) == [0, 1, 3, 4]
+
+
+def test_invalid_values():
+    """Ensure invalid_values yields only invalid return values."""
+    stream = make_stream()
+    assert list(invalid_values(stream)) == [stream[1], stream[3]]
+
+
+def test_partition_splits_results_and_errors():
+    """Ensure partition yields valid results and invalid values separately."""
+    stream = make_stream()
+    results, errors = partition(stream)
+    assert list(results) == [0, 2, 4]
+    assert list(errors) == [stream[1], stream[3]]
+
+
+def test_partition_consumes_input_lazily():
+    """Ensure partition only buffers what the other iterator has not consumed."""
+    results, errors = partition(endless_stream())
+    for _ in range(1_000):
+        next(results)
+        next(results)
+        next(errors)
+    assert next(results) == 3_000
+
+
+def test_count_errors_passes_values_through():
+    """Ensure count_errors yields all values and counts errors per code."""
+    stream = make_stream()
+    counts: Counter = Counter()
+    assert list(count_errors(stream, counts)) == stream
+    assert counts == {"STREAM_001": 1, "STREAM_002": 2}
+
+
+def test_count_errors_counts_while_streaming():
+    """Ensure counts are updated as the values pass."""
+    counts: Counter = Counter()
+    stream = count_errors(endless_stream(), counts)
+    list(itertools.islice(stream, 9))
+    assert counts == {"STREAM_001": 3}
+
+
+def test_error_counts():
+    """Ensure error_counts consumes the stream and returns the counts."""
+    assert error_counts(make_stream()) == {"STREAM_001": 1, "STREAM_002": 2}